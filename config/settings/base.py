@@ -22,6 +22,7 @@ INSTALLED_APPS = [
 
     # Third-party apps
     'rest_framework',
+    'rest_framework.authtoken',
     'corsheaders',
     'django_summernote',  # Rich text editor (replacing ckeditor)
     'imagekit',  # Image processing
@@ -32,6 +33,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.instrumentation.RequestInstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -40,10 +42,36 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.MaintenanceModeMiddleware',
+]
+
+# Reduced middleware chain for stateless, token-authenticated API requests.
+# config/wsgi.py and config/asgi.py route paths starting with one of
+# API_MIDDLEWARE_PATH_PREFIXES through it (see core/handlers.py); an empty
+# list sends everything through MIDDLEWARE.
+API_MIDDLEWARE_PATH_PREFIXES = ['/api/']
+API_MIDDLEWARE = [
+    'core.instrumentation.RequestInstrumentationMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'core.middleware.MaintenanceModeMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
 
+# Brotli/gzip compression of API JSON responses, in API_MIDDLEWARE only (see
+# core/middleware.py). Responses smaller than API_COMPRESSION_MIN_SIZE bytes
+# are sent as they are.
+API_COMPRESSION_MIN_SIZE = config('API_COMPRESSION_MIN_SIZE', default=1024, cast=int)
+API_COMPRESSION_BROTLI_QUALITY = 5
+API_COMPRESSION_GZIP_LEVEL = 6
+
+# Serve the public read endpoints with ASGI-native views (core/async_views.py).
+# Enable only when running config.asgi under an ASGI server.
+ASYNC_API_VIEWS = config('ASYNC_API_VIEWS', default=False, cast=bool)
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -76,6 +104,80 @@ DATABASES = {
 }
 
 
+# Cache
+# CACHE_BACKEND selects the backend: 'locmem' (per process, default),
+# 'file' (shared by all workers on one host) or 'redis'.
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'niru-default'),
+    'file': ('core.cache_backends.AtomicFileBasedCache', str(BASE_DIR / '.cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+
+# Past MAX_ENTRIES (300 by default) the locmem and file backends drop cached
+# entries, which resets throttle counters and model versions. Keep it above
+# the number of live entries: responses, tokens, two counters per client.
+CACHE_MAX_ENTRIES = config('CACHE_MAX_ENTRIES', default=20000, cast=int)
+
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': config('CACHE_LOCATION', default=CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'KEY_PREFIX': 'niru',
+        # Redis evicts by its own policy and takes no MAX_ENTRIES
+        'OPTIONS': {} if CACHE_BACKEND == 'redis' else {'MAX_ENTRIES': CACHE_MAX_ENTRIES},
+    }
+}
+
+# Cache holding the throttle window counters (see core/throttling.py). It must
+# be shared by all workers (file or redis) for limits to hold across them;
+# staging and production refuse a locmem one.
+THROTTLE_CACHE_ALIAS = 'default'
+
+# Response cache for public read endpoints (see core/cache.py)
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=60 * 60, cast=int)
+
+# Seconds an authenticated token -> user snapshot is cached (see core/authentication.py)
+AUTH_TOKEN_CACHE_TIMEOUT = config('AUTH_TOKEN_CACHE_TIMEOUT', default=60, cast=int)
+
+# How often process-local copies (e.g. SiteSettings) check the shared cache
+# for saves made by other workers, in seconds
+PROCESS_CACHE_RECHECK_INTERVAL = config('PROCESS_CACHE_RECHECK_INTERVAL', default=5, cast=float)
+
+
+# Request instrumentation (see core/instrumentation.py)
+# Send query, serializer and cache numbers in a Server-Timing response header
+REQUEST_SERVER_TIMING = config('REQUEST_SERVER_TIMING', default=False, cast=bool)
+# Requests slower than this are logged at WARNING with their SQL
+REQUEST_SLOW_THRESHOLD_MS = config('REQUEST_SLOW_THRESHOLD_MS', default=500, cast=int)
+# Maximum number of SQL statements kept per request for the slow-request log
+REQUEST_SLOW_LOG_MAX_QUERIES = 50
+
+# Bearer token Prometheus must send to scrape /metrics/ (see core/metrics.py);
+# the endpoint is disabled while this is empty
+METRICS_AUTH_TOKEN = config('METRICS_AUTH_TOKEN', default='')
+
+
+# Background jobs (see core/jobs.py, run with `python manage.py run_jobs`)
+# With BACKGROUND_JOBS_EAGER jobs run in-process right after commit instead.
+BACKGROUND_JOBS_EAGER = config('BACKGROUND_JOBS_EAGER', default=False, cast=bool)
+BACKGROUND_JOBS_MAX_ATTEMPTS = 3
+BACKGROUND_JOBS_RETRY_DELAY = 30  # seconds, doubled after each failed attempt
+BACKGROUND_JOBS_LOCK_TIMEOUT = 600  # seconds before a running job is considered abandoned
+
+# Static JSON export of the public API for nginx (see core/export.py).
+# When enabled, saves queue re-exports of the affected files.
+API_EXPORT_ENABLED = config('API_EXPORT_ENABLED', default=False, cast=bool)
+API_EXPORT_ROOT = config('API_EXPORT_ROOT', default=str(BASE_DIR / 'api-export'))
+# Scheme and host that absolute URLs in exported files point at
+API_EXPORT_BASE_URL = config('API_EXPORT_BASE_URL', default='http://localhost:8000')
+
+# Full-text search (see core/search.py): PostgreSQL text search configuration
+# used for stemming and stop words
+SEARCH_CONFIG = config('SEARCH_CONFIG', default='english')
+
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -104,10 +206,33 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
+STATICFILES_FINDERS = [
+    'django.contrib.staticfiles.finders.FileSystemFinder',
+    'django.contrib.staticfiles.finders.AppDirectoriesFinder',
+    # Builds the OpenAPI schema during collectstatic (see core/openapi.py)
+    'core.openapi.OpenAPISchemaFinder',
+]
+# Where the OpenAPI schema is built before collectstatic copies it
+OPENAPI_SCHEMA_ROOT = BASE_DIR / 'build'
 
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Absolute URL that API responses prefix media file names with, e.g.
+# 'https://cdn.niru.ac.ke/media/'. Empty: MEDIA_URL on the request's host.
+MEDIA_BASE_URL = config('MEDIA_BASE_URL', default='')
+
+
+# Maintenance mode (driven by SiteSettings.maintenance_mode)
+MAINTENANCE_MODE_EXEMPT_PATHS = [
+    '/admin/',
+    '/summernote/',
+    '/api/v1/site-settings/',
+    '/metrics/',
+    STATIC_URL,
+    MEDIA_URL,
+]
+MAINTENANCE_MODE_RETRY_AFTER = 300
 
 
 # Default primary key field type
@@ -117,26 +242,38 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
+        'core.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'core.throttling.AnonCounterRateThrottle',
+        'core.throttling.UserCounterRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
         'user': '1000/hour'
     },
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # orjson-backed JSON (core/renderers.py); use rest_framework.renderers.JSONRenderer
+    # and rest_framework.parsers.JSONParser for the stdlib implementation
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
-# DRF Spectacular Configuration for API documentation
+# DRF Spectacular Configuration for API documentation. The schema is built
+# once per deploy and served statically (see core/openapi.py).
 SPECTACULAR_SETTINGS = {
     'TITLE': 'NIRU API',
     'DESCRIPTION': 'API for National Intelligence and Research University',
@@ -256,6 +393,7 @@ JAZZMIN_SETTINGS = {
         "auth.Group": "fas fa-users",
         "core.sitesettings": "fas fa-cog",
         "core.pagehero": "fas fa-image",
+        "core.backgroundjob": "fas fa-tasks",
     },
 
     # Icons that are used when one is not manually specified
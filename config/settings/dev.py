@@ -57,6 +57,9 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Show per-request query/serializer/cache timings in browser dev tools
+REQUEST_SERVER_TIMING = True
+
 # Logging
 LOGGING = {
     'version': 1,
@@ -4,6 +4,7 @@ Production settings for NIRU Django Backend
 from .base import *
 import os
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 
 
 # SECURITY WARNING: don't run with debug turned on in production!
@@ -31,6 +32,17 @@ DATABASES = {
     }
 }
 
+# Cache
+# Saves invalidate cached responses and the SiteSettings copies of all
+# workers through the cache (core/cache.py), and the throttle counters
+# (core/throttling.py) only limit all workers together in a shared cache
+for alias in (API_CACHE_ALIAS, THROTTLE_CACHE_ALIAS):
+    if CACHES[alias]['BACKEND'] == CACHE_BACKENDS['locmem'][0]:
+        raise ImproperlyConfigured(
+            f"The '{alias}' cache is locmem, which is per process; use CACHE_BACKEND='file' (one host) "
+            "or 'redis' in production"
+        )
+
 # Security settings for production
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
@@ -47,6 +59,17 @@ X_FRAME_OPTIONS = 'DENY'
 STATIC_URL = '/static/'
 STATIC_ROOT = '/var/www/niru/static/'
 
+# collectstatic writes content-hashed names, recompressed images with WebP
+# siblings and .gz/.br variants of text assets (see core/storage.py)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'core.storage.OptimizedManifestStaticFilesStorage',
+    },
+}
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = '/var/www/niru/media/'
@@ -19,6 +19,9 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from core.metrics import metrics_view
+from core.openapi import SchemaSwaggerView
+
 urlpatterns = [
     # Admin
     path('admin/', admin.site.urls),
@@ -28,6 +31,12 @@ urlpatterns = [
 
     # API Routes
     path('api/v1/', include('core.api_urls')),
+
+    # Swagger UI over the prebuilt schema (static/openapi/schema.json)
+    path('api/docs/', SchemaSwaggerView.as_view(), name='api-docs'),
+
+    # Prometheus metrics
+    path('metrics/', metrics_view, name='metrics'),
 ]
 
 # Serve media files during development
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.admin import AdminSite
-from .models import SiteSettings, PageHero
+from .models import SiteSettings, PageHero, BackgroundJob
 
 
 # Update the default admin site's attributes
@@ -36,14 +36,18 @@ class SiteSettingsAdmin(admin.ModelAdmin):
         }),
     )
 
+    def has_add_permission(self, request):
+        # SiteSettings is a singleton
+        return not SiteSettings.objects.exists()
+
 
 @admin.register(PageHero)
 class PageHeroAdmin(admin.ModelAdmin):
-    list_display = ('page_identifier', 'title', 'is_active', 'overlay_opacity', 'updated_at')
-    list_filter = ('is_active', 'page_identifier', 'overlay_opacity')
+    list_display = ('page_identifier', 'title', 'is_active', 'overlay_opacity', 'image_status', 'updated_at')
+    list_filter = ('is_active', 'page_identifier', 'overlay_opacity', 'image_status')
     list_editable = ('is_active', 'overlay_opacity')
     search_fields = ('title', 'subtitle', 'page_identifier')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('image_status', 'image_processed_at', 'image_error', 'created_at', 'updated_at')
 
     fieldsets = (
         ('Page Identification', {
@@ -55,6 +59,10 @@ class PageHeroAdmin(admin.ModelAdmin):
         ('Visual Settings', {
             'fields': ('background_image', 'overlay_opacity')
         }),
+        ('Image Processing', {
+            'fields': ('image_status', 'image_processed_at', 'image_error'),
+            'classes': ('collapse',)
+        }),
         ('Status', {
             'fields': ('is_active',)
         }),
@@ -66,4 +74,22 @@ class PageHeroAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         qs = super().get_queryset(request)
-        return qs.order_by('page_identifier')
\ No newline at end of file
+        return qs.order_by('page_identifier')
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ('task', 'status', 'attempts', 'max_attempts', 'run_after', 'created_at')
+    list_filter = ('status', 'task')
+    search_fields = ('task', 'last_error')
+    readonly_fields = (
+        'task', 'args', 'kwargs', 'attempts', 'locked_at',
+        'last_error', 'created_at', 'updated_at'
+    )
+    fields = (
+        'task', 'args', 'kwargs', 'status', 'attempts', 'max_attempts',
+        'run_after', 'locked_at', 'last_error', 'created_at', 'updated_at'
+    )
+
+    def has_add_permission(self, request):
+        return False
@@ -1,6 +1,17 @@
-from django.urls import path, include
-from . import views
+from django.conf import settings
+from django.urls import path
 
-urlpatterns = [
-    path('page-hero/<str:page_identifier>/', views.page_hero_detail, name='page-hero-detail'),
-]
\ No newline at end of file
+from . import async_views, views
+
+
+def api_patterns(read_views):
+    return [
+        path('page-hero/<str:page_identifier>/', read_views.page_hero_detail, name='page-hero-detail'),
+        path('site-settings/', read_views.site_settings_detail, name='site-settings-detail'),
+        path('search/', views.search, name='search'),
+    ]
+
+
+# The ASGI deployment profile serves the public read endpoints with the
+# ASGI-native views from core/async_views.py
+urlpatterns = api_patterns(async_views if settings.ASYNC_API_VIEWS else views)
@@ -0,0 +1,142 @@
+"""
+ASGI-native versions of the public read views.
+
+Enabled by ASYNC_API_VIEWS (see core/api_urls.py). They mirror the DRF views
+in core/views.py (the configured authentication, permissions and throttles,
+response cache and conditional GET) using Django's async ORM and cache APIs,
+so requests served under ASGI do not hop to a worker thread per view.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from .cache import acache_api_response, aget_site_settings
+from .conditional import aconditional_model_view
+from .models import PageHero
+from .serializers import PageHeroSerializer, SiteSettingsSerializer
+
+
+class AsyncAPIResponse(HttpResponse):
+    """
+    JSON response rendered with the API's JSON renderer (the first of
+    DEFAULT_RENDERER_CLASSES) that keeps the payload in ``data`` so the
+    response cache and conditional GET helpers can use it
+    """
+
+    def __init__(self, data, status=200, **kwargs):
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        kwargs.setdefault('content_type', renderer.media_type)
+        super().__init__(renderer.render(data), status=status, **kwargs)
+        self.data = data
+
+
+async def _aauthenticate(request):
+    """
+    Request._authenticate() without blocking the event loop: authenticators
+    with an ``aauthenticate()`` (CachedTokenAuthentication) are awaited, the
+    others run in a worker thread
+    """
+    for authenticator in request.authenticators:
+        try:
+            if hasattr(authenticator, 'aauthenticate'):
+                user_auth_tuple = await authenticator.aauthenticate(request)
+            else:
+                user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+        except APIException:
+            request._not_authenticated()
+            raise
+        if user_auth_tuple is not None:
+            request._authenticator = authenticator
+            request.user, request.auth = user_auth_tuple
+            return
+    request._not_authenticated()
+
+
+def _check_permissions_and_throttles(view, request):
+    view.check_permissions(request)
+    view.check_throttles(request)
+
+
+def _exception_response(view, exc):
+    """
+    Turn an APIException into the response the DRF view would send
+    """
+    response = view.handle_exception(exc)
+    headers = {name: value for name, value in response.items() if name.lower() != 'content-type'}
+    return AsyncAPIResponse(response.data, status=response.status_code, headers=headers)
+
+
+def async_api_view(view_func):
+    """
+    Async counterpart of @api_view(['GET']).
+
+    Authentication, permissions and throttling use the same policies as a
+    DRF view: the DEFAULT_*_CLASSES settings, or the classes set with DRF's
+    @authentication_classes, @permission_classes and @throttle_classes
+    decorators. Failures get the responses DRF would send.
+    """
+    policies = ('authentication_classes', 'permission_classes', 'throttle_classes')
+    view_class = type(view_func.__name__, (APIView,), {
+        name: getattr(view_func, name, getattr(APIView, name)) for name in policies
+    })
+
+    @wraps(view_func)
+    async def inner(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return AsyncAPIResponse(
+                {'detail': f'Method "{request.method}" not allowed.'},
+                status=405,
+                headers={'Allow': 'GET, HEAD'},
+            )
+
+        view = view_class()
+        view.args, view.kwargs = args, kwargs
+        view.request = drf_request = view.initialize_request(request, *args, **kwargs)
+        view.headers = view.default_response_headers
+        request.version = api_settings.DEFAULT_VERSION
+
+        try:
+            await _aauthenticate(drf_request)
+            # Permissions may query and the throttles use the blocking cache
+            # API, so keep them off the event loop
+            await sync_to_async(_check_permissions_and_throttles)(view, drf_request)
+            return await view_func(request, *args, **kwargs)
+        except APIException as exc:
+            # Failed checks, or e.g. unknown names in ?fields= (SparseFieldsMixin)
+            return _exception_response(view, exc)
+
+    return inner
+
+
+@async_api_view
+@acache_api_response(PageHero, response_class=AsyncAPIResponse)
+@aconditional_model_view(PageHero)
+async def page_hero_detail(request, page_identifier):
+    """
+    Retrieve a specific page hero by page_identifier
+    """
+    try:
+        queryset = PageHeroSerializer.sparse_queryset(PageHero.objects, request, required=['updated_at'])
+        page_hero = await queryset.aget(
+            page_identifier=page_identifier, is_active=True,
+        )
+    except PageHero.DoesNotExist:
+        return AsyncAPIResponse(
+            {'error': f'Page hero for {page_identifier} not found'},
+            status=404,
+        )
+    serializer = PageHeroSerializer(page_hero, context={'request': request})
+    return AsyncAPIResponse(serializer.data)
+
+
+@async_api_view
+async def site_settings_detail(request):
+    """
+    Retrieve the global site settings
+    """
+    serializer = SiteSettingsSerializer(await aget_site_settings(), context={'request': request})
+    return AsyncAPIResponse(serializer.data)
@@ -0,0 +1,103 @@
+"""
+Token authentication backed by a short-lived cache of token -> user snapshots
+"""
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+from .cache import get_api_cache
+from .instrumentation import record_cache_lookup
+
+
+def token_cache_key(key):
+    # Hash the token so raw credentials never appear in the cache
+    return 'auth:token:' + hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def invalidate_token(key):
+    get_api_cache().delete(token_cache_key(key))
+
+
+def user_snapshot_fields():
+    """
+    User fields kept in the token cache: what authentication and permission
+    checks read. The password hash and everything else stay in the database.
+    """
+    user_model = get_user_model()
+    names = {user_model._meta.pk.attname, user_model.USERNAME_FIELD, 'is_active', 'is_staff', 'is_superuser'}
+    # In field order, as Model.from_db() expects
+    return [field.attname for field in user_model._meta.concrete_fields if field.attname in names]
+
+
+def user_snapshot(user):
+    return {name: getattr(user, name) for name in user_snapshot_fields()}
+
+
+def restore_snapshot(token_model, key, snapshot):
+    """
+    Rebuild the (user, token) pair of a cached snapshot without a query.
+
+    Fields missing from the snapshot are deferred: reading one loads it,
+    and save() only writes the fields that are loaded.
+    """
+    user_model = get_user_model()
+    user = user_model.from_db(router.db_for_read(user_model), list(snapshot), list(snapshot.values()))
+    token = token_model.from_db(router.db_for_read(token_model), ['key', 'user_id'], [key, user.pk])
+    token.user = user
+    return user, token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that caches a snapshot of the token's user (see
+    user_snapshot_fields()) for AUTH_TOKEN_CACHE_TIMEOUT seconds, so
+    authenticated requests do not hit the database for the token and user
+    lookup.
+
+    Entries are dropped when the token is deleted or one of the snapshot
+    fields of its user is saved (e.g. deactivated), see core/signals.py; the
+    TTL bounds staleness for changes made without signals, such as
+    queryset.update().
+    """
+
+    def authenticate_credentials(self, key):
+        snapshot = get_api_cache().get(token_cache_key(key))
+        record_cache_lookup('token', snapshot is not None)
+        if snapshot is not None:
+            return restore_snapshot(self.get_model(), key, snapshot)
+        return self.authenticate_uncached(key)
+
+    def authenticate_uncached(self, key):
+        """
+        Look the token up in the database and cache its user's snapshot
+        """
+        user, token = super().authenticate_credentials(key)
+        get_api_cache().set(token_cache_key(key), user_snapshot(user), settings.AUTH_TOKEN_CACHE_TIMEOUT)
+        return user, token
+
+    async def aauthenticate(self, request):
+        """
+        Async equivalent of authenticate() for ASGI-native views.
+
+        Cache hits stay on the event loop; misses run the same database
+        lookup as the sync path in a worker thread. Requests without a
+        well-formed token header never touch the database and go through
+        authenticate() directly.
+        """
+        auth = get_authorization_header(request).split()
+        try:
+            key = auth[1].decode() if len(auth) == 2 and auth[0].lower() == self.keyword.lower().encode() else None
+        except UnicodeError:
+            key = None
+        if key is None:
+            return self.authenticate(request)
+
+        snapshot = await get_api_cache().aget(token_cache_key(key))
+        record_cache_lookup('token', snapshot is not None)
+        if snapshot is not None:
+            return restore_snapshot(self.get_model(), key, snapshot)
+        return await sync_to_async(self.authenticate_uncached)(key)
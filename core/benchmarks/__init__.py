@@ -0,0 +1,54 @@
+"""
+Benchmark suites, run with `python manage.py benchmark`.
+
+A suite is a function registered with @suite that takes the command options
+and returns a list of results from measure().
+"""
+import statistics
+import time
+
+
+SUITES = {}
+
+
+def suite(name):
+    def decorator(func):
+        SUITES[name] = func
+        return func
+    return decorator
+
+
+def summarize(name, samples, extra=None):
+    """
+    Turn a list of per-call durations (seconds) into a result dict in ms
+    """
+    samples = sorted(samples)
+
+    def percentile(p):
+        return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000
+
+    result = {
+        'name': name,
+        'iterations': len(samples),
+        'mean_ms': statistics.fmean(samples) * 1000,
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'ops_per_sec': len(samples) / sum(samples) if sum(samples) else 0.0,
+    }
+    result.update(extra or {})
+    return result
+
+
+def measure(name, func, iterations, warmup=None):
+    """
+    Call ``func`` ``iterations`` times after a warmup and summarize the timings
+    """
+    for _ in range(warmup if warmup is not None else max(1, iterations // 10)):
+        func()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(name, samples)
@@ -0,0 +1,121 @@
+"""
+Concurrent-connection throughput of the WSGI path versus the ASGI profile.
+
+Each benchmark keeps ``--concurrency`` requests in flight: the WSGI handler
+from a thread pool (like a threaded WSGI server), the ASGI handler from one
+event loop, once with the DRF views and once with the ASGI-native views.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import RequestFactory, override_settings
+
+from core.handlers import APIASGIHandler, APIWSGIHandler
+
+from . import suite, summarize
+from .fixtures import BENCHMARK_PAGE, create_benchmark_data
+from .middleware import _call
+
+
+def _timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run_wsgi(handler, environ, requests, concurrency):
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter()
+        samples = list(executor.map(lambda _: _timed(lambda: _call(handler, environ)), range(requests)))
+        return samples, time.perf_counter() - start
+
+
+def _asgi_scope(path, token):
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': [
+            (b'host', b'testserver'),
+            (b'authorization', f'Token {token}'.encode()),
+        ],
+        'client': ('127.0.0.1', 50000),
+        'server': ('testserver', 80),
+    }
+
+
+async def _call_asgi(handler, scope):
+    sent_request = False
+    disconnected = asyncio.get_running_loop().create_future()
+    status = None
+
+    async def receive():
+        nonlocal sent_request
+        if not sent_request:
+            sent_request = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        # Keep the connection open until the handler is done
+        return await disconnected
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    start = time.perf_counter()
+    await handler(dict(scope), receive, send)
+    elapsed = time.perf_counter() - start
+    disconnected.cancel()
+    assert status == 200, status
+    return elapsed
+
+
+async def run_asgi(handler, scope, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded():
+        async with semaphore:
+            return await _call_asgi(handler, scope)
+
+    start = time.perf_counter()
+    samples = await asyncio.gather(*(bounded() for _ in range(requests)))
+    return list(samples), time.perf_counter() - start
+
+
+@suite('asgi')
+def run(options):
+    token = create_benchmark_data()
+    requests = options['iterations']
+    concurrency = options['concurrency']
+    results = []
+
+    def record(name, samples, elapsed):
+        results.append(summarize(
+            f'{name} (c={concurrency})',
+            samples,
+            {'ops_per_sec': len(samples) / elapsed},
+        ))
+
+    with override_settings(ROOT_URLCONF='core.benchmarks.urls'):
+        sync_path = f'/api/v1/sync/page-hero/{BENCHMARK_PAGE}/'
+        async_path = f'/api/v1/async/page-hero/{BENCHMARK_PAGE}/'
+
+        handler = APIWSGIHandler()
+        environ = RequestFactory().get(sync_path, HTTP_AUTHORIZATION=f'Token {token}').environ
+        run_wsgi(handler, environ, max(1, requests // 10), concurrency)
+        record('asgi: WSGI, threads, DRF view', *run_wsgi(handler, environ, requests, concurrency))
+
+        handler = APIASGIHandler()
+        for name, path in [('ASGI, DRF view', sync_path), ('ASGI, async view', async_path)]:
+            scope = _asgi_scope(path, token)
+            asyncio.run(run_asgi(handler, scope, max(1, requests // 10), concurrency))
+            record(f'asgi: {name}', *asyncio.run(run_asgi(handler, scope, requests, concurrency)))
+
+    return results
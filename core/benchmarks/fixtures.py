@@ -0,0 +1,46 @@
+"""
+Data shared by the benchmark suites
+"""
+from django.contrib.auth import get_user_model
+from rest_framework.authtoken.models import Token
+
+from core.models import PageHero, SiteSettings
+
+
+BENCHMARK_PAGE = 'home'
+
+
+def _renditions(page_id):
+    # What process_page_hero_image records for a processed 1920 px source
+    return [
+        {
+            'name': f'heroes/renditions/{page_id}/{page_id}-hero-{width}w.{extension}',
+            'width': width,
+            'type': mime_type,
+        }
+        for mime_type, extension in [('image/avif', 'avif'), ('image/webp', 'webp'), ('image/jpeg', 'jpg')]
+        for width in (480, 768, 1280, 1920)
+    ]
+
+
+def create_benchmark_data():
+    """
+    Create one hero per page, the settings row and an API user; return the token key
+    """
+    SiteSettings.load()
+    PageHero.objects.bulk_create([
+        PageHero(
+            page_identifier=page_id,
+            title=f'{label} title',
+            subtitle=f'{label} subtitle',
+            background_image=f'heroes/{page_id}-hero.jpg',
+            renditions=_renditions(page_id),
+            image_width=1920,
+            image_height=600,
+            dominant_color='#2a3b4c',
+        )
+        for page_id, label in PageHero.PAGE_CHOICES
+    ], ignore_conflicts=True)
+    user, _ = get_user_model().objects.get_or_create(username='benchmark')
+    token, _ = Token.objects.get_or_create(user=user)
+    return token.key
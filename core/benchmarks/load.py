@@ -0,0 +1,99 @@
+"""
+Concurrent load generator: serves the WSGI application on a local port and
+keeps ``--concurrency`` HTTP clients busy until ``--iterations`` requests
+have completed.
+
+The clients share the interpreter with the server, so absolute numbers are
+lower than against gunicorn; they are meant for comparison between runs on
+the same machine.
+"""
+import http.client
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+
+from core.handlers import WSGIMiddlewareRouter
+
+from . import suite, summarize
+from .fixtures import BENCHMARK_PAGE, create_benchmark_data
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class BenchmarkServer(ThreadedWSGIServer):
+    # The default listen backlog drops connections at higher concurrency,
+    # which shows up as 1 s SYN retransmits in the tail latencies
+    request_queue_size = 1024
+
+
+class ServerThread(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.ready = threading.Event()
+        self.httpd = None
+
+    def run(self):
+        # Request threads open their own connections; an in-memory SQLite test
+        # database is shared between them through SQLite's shared cache
+        self.httpd = BenchmarkServer(('127.0.0.1', 0), QuietRequestHandler)
+        self.httpd.set_app(WSGIMiddlewareRouter())
+        self.ready.set()
+        self.httpd.serve_forever(poll_interval=0.05)
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _request(port, path, headers):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        start = time.perf_counter()
+        connection.request('GET', path, headers=headers)
+        response = connection.getresponse()
+        response.read()
+        elapsed = time.perf_counter() - start
+    finally:
+        connection.close()
+    assert response.status == 200, response.status
+    return elapsed
+
+
+def run_load(path, headers, requests, concurrency):
+    """
+    Return per-request latencies and the wall time for ``requests`` GETs of ``path``
+    """
+    server = ServerThread()
+    server.start()
+    server.ready.wait()
+    port = server.httpd.server_address[1]
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(lambda _: _request(port, path, headers), range(concurrency)))
+            start = time.perf_counter()
+            samples = list(executor.map(lambda _: _request(port, path, headers), range(requests)))
+            return samples, time.perf_counter() - start
+    finally:
+        server.stop()
+
+
+@suite('load')
+def run(options):
+    token = create_benchmark_data()
+    concurrency = options['concurrency']
+    samples, elapsed = run_load(
+        f'/api/v1/page-hero/{BENCHMARK_PAGE}/',
+        {'Host': 'testserver', 'Authorization': f'Token {token}'},
+        options['iterations'],
+        concurrency,
+    )
+    return [summarize(
+        f'load: GET page-hero over HTTP (c={concurrency})',
+        samples,
+        {'ops_per_sec': len(samples) / elapsed},
+    )]
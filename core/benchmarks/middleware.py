@@ -0,0 +1,34 @@
+"""
+Per-request latency of the full middleware chain versus API_MIDDLEWARE
+"""
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import RequestFactory
+
+from core.handlers import APIWSGIHandler
+
+from . import measure, suite
+from .fixtures import BENCHMARK_PAGE, create_benchmark_data
+
+
+def _call(handler, environ):
+    def start_response(status, headers):
+        assert status.startswith('200'), status
+
+    response = handler(dict(environ), start_response)
+    b''.join(response)
+    response.close()
+
+
+@suite('middleware')
+def run(options):
+    token = create_benchmark_data()
+    environ = RequestFactory().get(
+        f'/api/v1/page-hero/{BENCHMARK_PAGE}/',
+        HTTP_AUTHORIZATION=f'Token {token}',
+    ).environ
+    iterations = options['iterations']
+
+    results = []
+    for name, handler in [('full MIDDLEWARE', WSGIHandler()), ('API_MIDDLEWARE', APIWSGIHandler())]:
+        results.append(measure(f'middleware: {name}', lambda: _call(handler, environ), iterations))
+    return results
@@ -0,0 +1,54 @@
+"""
+Benchmarks of JSON rendering and parsing: DRF's stdlib JSONRenderer and
+JSONParser against the orjson-backed classes in core/renderers.py, on
+PageHeroSerializer output for one hero and for a large list
+"""
+import io
+import json
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.models import PageHero
+from core.renderers import ORJSONParser, ORJSONRenderer, dumps
+from core.serializers import PageHeroSerializer
+
+from . import measure, suite
+from .fixtures import BENCHMARK_PAGE, create_benchmark_data
+from .serializers import LIST_SIZE, _hero_rows
+
+
+@suite('renderer')
+def run_renderer(options):
+    create_benchmark_data()
+    hero = PageHero.objects.get(page_identifier=BENCHMARK_PAGE)
+    context = {'request': Request(APIRequestFactory().get('/'))}
+    _, rows = _hero_rows(hero, LIST_SIZE)
+    detail = PageHeroSerializer(hero, context=context).data
+    # Paginated list response with the keyset paginator's envelope
+    listing = {'next': 'http://testserver/api/v1/heroes/?cursor=abc', 'previous': None,
+               'results': PageHeroSerializer(rows, many=True, context=context).data}
+    listing_bytes = JSONRenderer().render(listing)
+    iterations = options['iterations']
+    list_iterations = max(1, iterations // 10)
+
+    def parse(parser):
+        return lambda: parser.parse(io.BytesIO(listing_bytes))
+
+    return [
+        measure('render: detail, stdlib json', lambda: JSONRenderer().render(detail), iterations),
+        measure('render: detail, orjson', lambda: ORJSONRenderer().render(detail), iterations),
+        measure(f'render: list of {LIST_SIZE}, stdlib json', lambda: JSONRenderer().render(listing), list_iterations),
+        measure(f'render: list of {LIST_SIZE}, orjson', lambda: ORJSONRenderer().render(listing), list_iterations),
+        measure(
+            'etag payload: detail, stdlib json',
+            lambda: json.dumps(detail, cls=JSONEncoder, sort_keys=True, separators=(',', ':')).encode('utf-8'),
+            iterations,
+        ),
+        measure('etag payload: detail, orjson', lambda: dumps(detail, sort_keys=True), iterations),
+        measure(f'parse: list of {LIST_SIZE}, stdlib json', parse(JSONParser()), list_iterations),
+        measure(f'parse: list of {LIST_SIZE}, orjson', parse(ORJSONParser()), list_iterations),
+    ]
@@ -0,0 +1,91 @@
+"""
+Benchmarks of /api/v1/search/ over a large synthetic index: the ranked
+query on its own and the view through the DRF stack with a cold response
+cache
+"""
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.cache import get_api_cache
+from core.models import PageHero, SearchDocument
+from core.search import search
+from core.views import search as search_view
+
+from . import measure, suite
+
+
+SEARCH_DOCUMENTS = 100_000
+BATCH_SIZE = 5000
+
+# Words by approximate share of documents containing them
+COMMON_WORD = 'research'      # ~1 in 10
+UNCOMMON_WORD = 'scholarship'  # ~1 in 100
+RARE_WORD = 'cryptography'     # ~1 in 10,000
+
+
+def _words(rng, vocabulary, count):
+    return ' '.join(rng.choice(vocabulary) for _ in range(count))
+
+
+def create_search_documents(count=SEARCH_DOCUMENTS):
+    """
+    Index ``count`` documents of filler text with words of known frequency
+    """
+    rng = random.Random(42)
+    vocabulary = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(4, 10))) for _ in range(20000)]
+    content_type = ContentType.objects.get_for_model(PageHero)
+    topics = [(COMMON_WORD, 10), (UNCOMMON_WORD, 100), (RARE_WORD, 10000)]
+
+    for start in range(0, count, BATCH_SIZE):
+        documents = []
+        for i in range(start, min(count, start + BATCH_SIZE)):
+            extra = ' '.join(word for word, every in topics if i % every == 0)
+            documents.append(SearchDocument(
+                content_type=content_type,
+                object_id=str(i),
+                title=f'{_words(rng, vocabulary, 5)} {extra}',
+                keywords=_words(rng, vocabulary, 4),
+                description=_words(rng, vocabulary, 20),
+                body=_words(rng, vocabulary, 80),
+                url=f'/news/{i}/',
+            ))
+        SearchDocument.objects.bulk_create(documents)
+
+
+@suite('search')
+def run_search(options):
+    started = time.perf_counter()
+    create_search_documents()
+    indexed_in = time.perf_counter() - started
+
+    factory = APIRequestFactory()
+    user = get_user_model().objects.create_user('search-benchmark')
+    iterations = max(1, options['iterations'] // 10)
+
+    def query(q, page=1):
+        return lambda: list(search(q)[(page - 1) * 20:page * 20])
+
+    def view(q):
+        def call():
+            get_api_cache().clear()
+            request = factory.get('/api/v1/search/', {'q': q})
+            force_authenticate(request, user=user)
+            search_view(request).render()
+        return call
+
+    results = [
+        measure(f'search: {RARE_WORD!r} (10 matches)', query(RARE_WORD), iterations),
+        measure(f'search: {UNCOMMON_WORD!r} (1k matches)', query(UNCOMMON_WORD), iterations),
+        measure(f'search: {COMMON_WORD!r} (10k matches)', query(COMMON_WORD), iterations),
+        measure(f'search: {COMMON_WORD!r} page 5', query(COMMON_WORD, page=5), iterations),
+        measure('search: two words (1k matches)', query(f'{COMMON_WORD} {UNCOMMON_WORD}'), iterations),
+        measure(f'search view: {UNCOMMON_WORD!r}, cold cache', view(UNCOMMON_WORD), iterations),
+    ]
+    for result in results:
+        result['documents'] = SEARCH_DOCUMENTS
+    results[0]['indexed_in_s'] = round(indexed_in, 1)
+    return results
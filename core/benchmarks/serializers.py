@@ -0,0 +1,97 @@
+"""
+Micro-benchmarks of the page-hero read path: the serializer on its own and
+page_hero_detail through the DRF stack (authentication, throttling, response
+cache, conditional GET and rendering), without the WSGI layer
+"""
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.cache import get_api_cache
+from core.models import PageHero
+from core.serializers import PageHeroSerializer
+from core.views import page_hero_detail
+
+from . import measure, suite
+from .fixtures import BENCHMARK_PAGE, create_benchmark_data
+
+
+# Heroes in the list benchmarks, the size of a large list page
+LIST_SIZE = 200
+
+
+class DRFPageHeroSerializer(PageHeroSerializer):
+    """
+    PageHeroSerializer with DRF's generic field-by-field to_representation()
+    """
+
+    def to_representation(self, instance):
+        return serializers.ModelSerializer.to_representation(self, instance)
+
+
+def _hero_rows(hero, count):
+    """
+    ``count`` unsaved copies of ``hero``, as instances and as .values() rows
+    """
+    fields = [field.attname for field in PageHero._meta.concrete_fields]
+    row = PageHero.objects.filter(pk=hero.pk).values(*fields).get()
+    instances = [PageHero(**row) for _ in range(count)]
+    return instances, [dict(row) for _ in range(count)]
+
+
+@suite('serializer')
+def run_serializer(options):
+    create_benchmark_data()
+    hero = PageHero.objects.get(page_identifier=BENCHMARK_PAGE)
+    request = Request(APIRequestFactory().get('/'))
+    context = {'request': request}
+    instances, rows = _hero_rows(hero, LIST_SIZE)
+    iterations = options['iterations']
+    list_iterations = max(1, iterations // 20)
+
+    return [
+        measure('serializer: detail, DRF fields', lambda: DRFPageHeroSerializer(hero, context=context).data, iterations),
+        measure('serializer: detail, field plan', lambda: PageHeroSerializer(hero, context=context).data, iterations),
+        measure(
+            f'serializer: list of {LIST_SIZE}, DRF fields',
+            lambda: DRFPageHeroSerializer(instances, many=True, context=context).data,
+            list_iterations,
+        ),
+        measure(
+            f'serializer: list of {LIST_SIZE}, field plan',
+            lambda: PageHeroSerializer(instances, many=True, context=context).data,
+            list_iterations,
+        ),
+        measure(
+            f'serializer: list of {LIST_SIZE}, .values() rows',
+            lambda: PageHeroSerializer(rows, many=True, context=context).data,
+            list_iterations,
+        ),
+    ]
+
+
+@suite('view')
+def run_view(options):
+    token = create_benchmark_data()
+    factory = APIRequestFactory()
+    path = f'/api/v1/page-hero/{BENCHMARK_PAGE}/'
+    auth = f'Token {token}'
+
+    def call(expected_status=200, clear_cache=False, **headers):
+        def func():
+            if clear_cache:
+                get_api_cache().clear()
+            response = page_hero_detail(factory.get(path, HTTP_AUTHORIZATION=auth, **headers), page_identifier=BENCHMARK_PAGE)
+            if hasattr(response, 'render'):
+                response.render()
+            assert response.status_code == expected_status, response.status_code
+            return response
+        return func
+
+    etag = call()()['ETag']
+    iterations = options['iterations']
+    return [
+        measure('view: page_hero_detail, cache hit', call(), iterations),
+        measure('view: page_hero_detail, 304', call(304, HTTP_IF_NONE_MATCH=etag), iterations),
+        measure('view: page_hero_detail, cold cache', call(clear_cache=True), iterations),
+    ]
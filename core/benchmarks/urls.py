@@ -0,0 +1,12 @@
+"""
+URLconf for the asgi suite, serving the sync and async hero views side by side
+"""
+from django.urls import path
+
+from core import async_views, views
+
+
+urlpatterns = [
+    path('api/v1/sync/page-hero/<str:page_identifier>/', views.page_hero_detail),
+    path('api/v1/async/page-hero/<str:page_identifier>/', async_views.page_hero_detail),
+]
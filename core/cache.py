@@ -0,0 +1,375 @@
+"""
+Versioned response cache for public read API views.
+
+Every cached model has a version counter in the cache. Response cache keys
+embed the current versions of the models a view depends on, so bumping a
+counter on ``post_save``/``post_delete`` (and again when the transaction
+commits) invalidates exactly the responses built from that model without
+having to track or delete individual keys.
+The same counters let process-local copies of singletons such as
+SiteSettings notice saves made by other workers.
+"""
+import hashlib
+import math
+import time
+from functools import partial, wraps
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from .instrumentation import record_cache_lookup
+
+
+# Responses with these status codes are cached; anything else always hits the view
+CACHEABLE_STATUS_CODES = (200, 404)
+
+# Validator headers stored alongside cached data so 304s work from cache
+CACHED_HEADERS = ('ETag', 'Last-Modified')
+
+# Cached next-publish marker for models with nothing scheduled (None is a miss)
+NOTHING_SCHEDULED = 'none'
+
+_registered_models = set()
+_process_local_objects = []
+
+
+def get_api_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _version_key(model):
+    return f'api-cache:version:{model._meta.label_lower}'
+
+
+def get_model_versions(models):
+    """
+    Return the current cache version of each model, seeding missing counters
+    """
+    cache = get_api_cache()
+    keys = [_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        # Seed from the clock so a counter lost to eviction never reuses a
+        # version that older cached responses were stored under.
+        seed = time.time_ns()
+        for key in missing:
+            cache.add(key, seed, None)
+        versions.update(cache.get_many(missing))
+    return [versions.get(key, 0) for key in keys]
+
+
+async def aget_model_versions(models):
+    """
+    Async version of get_model_versions()
+    """
+    cache = get_api_cache()
+    keys = [_version_key(model) for model in models]
+    versions = await cache.aget_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        seed = time.time_ns()
+        for key in missing:
+            await cache.aadd(key, seed, None)
+        versions.update(await cache.aget_many(missing))
+    return [versions.get(key, 0) for key in keys]
+
+
+def bump_model_version(model):
+    """
+    Invalidate every cached response that depends on ``model``
+    """
+    cache = get_api_cache()
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def _invalidate_model(model):
+    bump_model_version(model)
+    for obj in _process_local_objects:
+        if obj.model_label == model._meta.label:
+            obj.clear()
+
+
+def _invalidate(sender, using=None, **kwargs):
+    _invalidate_model(sender)
+    # Until the writer commits, other connections still read the old row and
+    # may cache it under the version bumped above, so bump again on commit
+    transaction.on_commit(partial(_invalidate_model, sender), using=using)
+
+
+def register_cached_model(model):
+    """
+    Connect save/delete signals of ``model`` to response cache invalidation.
+
+    Call this from an AppConfig.ready() so that every process that writes
+    the model (web workers, job workers, management commands) invalidates.
+    """
+    if model in _registered_models:
+        return
+    uid = f'api-cache:{model._meta.label_lower}'
+    post_save.connect(_invalidate, sender=model, dispatch_uid=uid)
+    post_delete.connect(_invalidate, sender=model, dispatch_uid=uid)
+    _registered_models.add(model)
+
+
+def response_cache_key(request, models):
+    return _response_cache_key(request, get_model_versions(models))
+
+
+async def aresponse_cache_key(request, models):
+    return _response_cache_key(request, await aget_model_versions(models))
+
+
+def _response_cache_key(request, versions):
+    raw = '|'.join([
+        request.get_host(),
+        str(getattr(request, 'version', '') or ''),
+        request.get_full_path(),
+        ','.join(str(version) for version in versions),
+    ])
+    return 'api-cache:response:' + hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def _next_publish_key(model, version):
+    return f'api-cache:next-publish:{model._meta.label_lower}:{version}'
+
+
+def _publishable(models):
+    # PublishableModel subclasses; their default manager knows the schedule
+    return [model for model in models if hasattr(model._default_manager, 'next_publish_date')]
+
+
+def _next_publish_entry(publish_date):
+    if publish_date is None:
+        return NOTHING_SCHEDULED, settings.API_CACHE_TIMEOUT
+    return publish_date, seconds_until(publish_date, settings.API_CACHE_TIMEOUT)
+
+
+def next_publish_date(models):
+    """
+    Return when the next scheduled row of any of ``models`` goes live, or None.
+
+    The answer is cached per model version until that moment, so both a save
+    and the boundary itself make it look again. Models that are not
+    PublishableModel subclasses are ignored without touching the cache.
+    """
+    models = _publishable(models)
+    if not models:
+        return None
+    cache = get_api_cache()
+    keys = {model: _next_publish_key(model, version) for model, version in zip(models, get_model_versions(models))}
+    cached = cache.get_many(list(keys.values()))
+    dates = []
+    for model, key in keys.items():
+        publish_date = cached.get(key)
+        if publish_date is None:
+            publish_date = model._default_manager.next_publish_date()
+            cache.set(key, *_next_publish_entry(publish_date))
+        if publish_date and publish_date != NOTHING_SCHEDULED:
+            dates.append(publish_date)
+    return min(dates, default=None)
+
+
+async def anext_publish_date(models):
+    """
+    Async version of next_publish_date()
+    """
+    models = _publishable(models)
+    if not models:
+        return None
+    cache = get_api_cache()
+    keys = {model: _next_publish_key(model, version) for model, version in zip(models, await aget_model_versions(models))}
+    cached = await cache.aget_many(list(keys.values()))
+    dates = []
+    for model, key in keys.items():
+        publish_date = cached.get(key)
+        if publish_date is None:
+            publish_date = await model._default_manager.anext_publish_date()
+            await cache.aset(key, *_next_publish_entry(publish_date))
+        if publish_date and publish_date != NOTHING_SCHEDULED:
+            dates.append(publish_date)
+    return min(dates, default=None)
+
+
+def seconds_until(moment, timeout=None):
+    """
+    Return a cache timeout ending at ``moment``, capped at ``timeout``
+    """
+    seconds = max(1, math.ceil((moment - timezone.now()).total_seconds()))
+    return seconds if timeout is None else min(timeout, seconds)
+
+
+def _response_timeout(timeout, publish_date):
+    timeout = settings.API_CACHE_TIMEOUT if timeout is None else timeout
+    if publish_date is None or timeout == 0:
+        return timeout
+    return seconds_until(publish_date, timeout)
+
+
+def _cached_response(request, data, status_code, headers, response_class=Response):
+    last_modified = parse_http_date_safe(headers.get('Last-Modified', ''))
+    response = get_conditional_response(request, etag=headers.get('ETag'), last_modified=last_modified)
+    if response is None:
+        response = response_class(data, status=status_code)
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+
+def _cache_entry(response):
+    headers = {
+        header: response[header]
+        for header in CACHED_HEADERS
+        if response.has_header(header)
+    }
+    return (response.data, response.status_code, headers)
+
+
+def _is_cacheable(response):
+    return response.status_code in CACHEABLE_STATUS_CODES and hasattr(response, 'data')
+
+
+def cache_api_response(*models, timeout=None):
+    """
+    Cache the data of a DRF view's GET responses until one of ``models`` changes.
+
+    Apply it below ``@api_view`` (after authentication and throttling) and
+    above ``conditional_model_view`` so cache hits also answer conditional
+    requests without touching the database. Only use it for responses that
+    do not vary per user. ``models`` must be registered with
+    ``register_cached_model``. Responses built from PublishableModel
+    subclasses expire when the next scheduled row goes live.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            cache = get_api_cache()
+            key = response_cache_key(request, models)
+            cached = cache.get(key)
+            record_cache_lookup('response', cached is not None)
+            if cached is not None:
+                return _cached_response(request, *cached)
+
+            response = view_func(request, *args, **kwargs)
+            if _is_cacheable(response):
+                cache.set(key, _cache_entry(response), _response_timeout(timeout, next_publish_date(models)))
+            return response
+
+        return inner
+
+    return decorator
+
+
+def acache_api_response(*models, timeout=None, response_class=Response):
+    """
+    Async version of cache_api_response() for ASGI-native views (see
+    core/async_views.py). Views must return a response with a ``data``
+    attribute; cache hits are rebuilt with ``response_class``.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        async def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await view_func(request, *args, **kwargs)
+
+            cache = get_api_cache()
+            key = await aresponse_cache_key(request, models)
+            cached = await cache.aget(key)
+            record_cache_lookup('response', cached is not None)
+            if cached is not None:
+                return _cached_response(request, *cached, response_class=response_class)
+
+            response = await view_func(request, *args, **kwargs)
+            if _is_cacheable(response):
+                publish_date = await anext_publish_date(models)
+                await cache.aset(key, _cache_entry(response), _response_timeout(timeout, publish_date))
+            return response
+
+        return inner
+
+    return decorator
+
+
+class ProcessLocalObject:
+    """
+    Process-local copy of a rarely changing model instance.
+
+    The copy is revalidated against the model's version counter in the shared
+    cache at most every ``PROCESS_CACHE_RECHECK_INTERVAL`` seconds, so a save
+    in one worker is picked up by the others without each of them querying
+    the database per request. Saves in the same process clear it at once.
+    The model must be registered with ``register_cached_model`` and provide a
+    ``load()`` classmethod. Callers must treat the returned instance as
+    read-only.
+    """
+
+    def __init__(self, model_label):
+        self.model_label = model_label
+        self._value = None
+        self._version = None
+        self._checked_at = 0.0
+        _process_local_objects.append(self)
+
+    def get(self):
+        now = time.monotonic()
+        if self._value is not None and now - self._checked_at < settings.PROCESS_CACHE_RECHECK_INTERVAL:
+            return self._value
+
+        model = apps.get_model(self.model_label)
+        [version] = get_model_versions([model])
+        if self._value is None or version != self._version:
+            self._value = model.load()
+        self._version = version
+        self._checked_at = now
+        return self._value
+
+    async def aget(self):
+        """
+        Async version of get(); the model must also provide ``aload()``
+        """
+        now = time.monotonic()
+        if self._value is not None and now - self._checked_at < settings.PROCESS_CACHE_RECHECK_INTERVAL:
+            return self._value
+
+        model = apps.get_model(self.model_label)
+        [version] = await aget_model_versions([model])
+        if self._value is None or version != self._version:
+            self._value = await model.aload()
+        self._version = version
+        self._checked_at = now
+        return self._value
+
+    def clear(self):
+        self._value = None
+        self._version = None
+
+
+_site_settings = ProcessLocalObject('core.SiteSettings')
+
+
+def get_site_settings():
+    """
+    Return the cached SiteSettings singleton
+    """
+    return _site_settings.get()
+
+
+async def aget_site_settings():
+    """
+    Async version of get_site_settings()
+    """
+    return await _site_settings.aget()
@@ -0,0 +1,53 @@
+"""
+Cache backends
+"""
+import fcntl
+import os
+from contextlib import contextmanager
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+
+
+class AtomicFileBasedCache(FileBasedCache):
+    """
+    FileBasedCache whose add(), incr() and decr() are atomic across the
+    processes of one host, so it can hold shared counters such as throttle
+    windows and cache versions. They serialize on a lock file in the cache
+    directory; get() and set() are unchanged.
+
+    Once the cache holds MAX_ENTRIES files, FileBasedCache deletes a random
+    1/CULL_FREQUENCY of them, live counters included. This backend deletes
+    the expired files first and only culls at random if that is not enough.
+    """
+
+    @contextmanager
+    def _counter_lock(self):
+        os.makedirs(self._dir, exist_ok=True)
+        with open(os.path.join(self._dir, 'counters.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        if len(filelist) < self._max_entries:
+            return
+        for fname in filelist:
+            try:
+                with open(fname, 'rb') as f:
+                    # Deletes the file if it has expired
+                    self._is_expired(f)
+            except FileNotFoundError:
+                pass
+        super()._cull()
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        with self._counter_lock():
+            return super().add(key, value, timeout, version)
+
+    def incr(self, key, delta=1, version=None):
+        with self._counter_lock():
+            return super().incr(key, delta, version)
@@ -0,0 +1,50 @@
+"""
+System checks for models built on the abstract bases in core/models.py
+"""
+from django.apps import apps
+from django.core import checks
+
+from .models import PublishableModel, TimeStampedModel
+
+
+INDEXED_BASES = (TimeStampedModel, PublishableModel)
+
+
+def missing_base_indexes(model):
+    """
+    Yield (base, missing index names) for each abstract base in
+    INDEXED_BASES whose indexes ``model`` does not declare
+    """
+    names = {index.name for index in model._meta.indexes}
+    placeholders = {'app_label': model._meta.app_label.lower(), 'class': model.__name__.lower()}
+    for base in INDEXED_BASES:
+        if issubclass(model, base):
+            expected = [index.name % placeholders for index in base.Meta.indexes]
+            missing = [name for name in expected if name not in names]
+            if missing:
+                yield base, missing
+
+
+@checks.register(checks.Tags.models)
+def check_inherited_indexes(app_configs=None, **kwargs):
+    """
+    Warn about concrete models missing the indexes of an abstract base.
+
+    A model's Meta inherits ``indexes`` from its first base that sets it, so
+    a model built on both TimeStampedModel and PublishableModel silently
+    loses the second one's indexes unless its Meta combines them.
+    """
+    configs = app_configs or apps.get_app_configs()
+    errors = []
+    for model in (model for config in configs for model in config.get_models()):
+        bases = [base for base in INDEXED_BASES if issubclass(model, base)]
+        for base, missing in missing_base_indexes(model):
+            meta_bases = ', '.join(f'{base.__name__}.Meta' for base in bases)
+            indexes = ' + '.join(f'{base.__name__}.Meta.indexes' for base in bases)
+            errors.append(checks.Warning(
+                f'{model._meta.label} is missing the {base.__name__} indexes {", ".join(missing)}.',
+                hint=f'Declare "class Meta({meta_bases}): indexes = {indexes}".',
+                obj=model,
+                id='core.W001',
+            ))
+    return errors
@@ -0,0 +1,141 @@
+"""
+Conditional GET support (ETag / Last-Modified / 304) for model-backed API views
+"""
+import hashlib
+from functools import wraps
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import (
+    _response_timeout, aget_model_versions, anext_publish_date, get_api_cache, get_model_versions,
+    next_publish_date,
+)
+from .instrumentation import record_cache_lookup
+from .renderers import dumps
+
+
+def payload_etag(data):
+    """
+    Return a strong, quoted ETag for a serialized payload
+    """
+    return quote_etag(hashlib.sha256(dumps(data, sort_keys=True)).hexdigest()[:32])
+
+
+def _validators_cache_key(model, version, request):
+    # Host and path are part of the key because the payload contains absolute
+    # URLs and may differ per API version and ?fields=; the model version
+    # drops the entry when any row of the model is saved or deleted.
+    raw = ':'.join([
+        model._meta.label_lower,
+        str(version),
+        request.get_host(),
+        request.get_full_path(),
+    ])
+    return 'conditional:validators:' + hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+
+def _not_modified_or_none(request, etag, last_modified):
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def _set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def _response_validators(response, timestamp_field):
+    """
+    Return the (ETag, Last-Modified) of a full response, or None if it has none
+    """
+    if response.status_code != 200 or not hasattr(response, 'data'):
+        return None
+    instance = getattr(getattr(response.data, 'serializer', None), 'instance', None)
+    if instance is None or timestamp_field in instance.get_deferred_fields():
+        return None
+    updated_at = getattr(instance, timestamp_field)
+    if updated_at is None:
+        return None
+    return payload_etag(response.data), int(updated_at.timestamp())
+
+
+def conditional_model_view(model, timestamp_field='updated_at'):
+    """
+    Decorator adding ETag / Last-Modified validation to a detail view of ``model``.
+
+    The ETag is a hash of the response data and Last-Modified the
+    ``timestamp_field`` of the instance the view serialized
+    (``Response(serializer.data)``), so a miss costs no query besides the
+    view's own; the view must load that field, also under ``?fields=``.
+    Both validators are cached per URL and ``model`` version (see
+    core/cache.py; ``model`` must be registered with
+    ``register_cached_model``), so a revalidating client gets a 304 without
+    the view running, until a row of ``model`` is saved or deleted.
+
+    Apply it below ``@api_view`` so authentication and throttling still run
+    first. It works with any model that has an ``updated_at``-style field:
+
+        @api_view(['GET'])
+        @conditional_model_view(PageHero)
+        def page_hero_detail(request, page_identifier):
+            ...
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+
+            cache = get_api_cache()
+            [version] = get_model_versions([model])
+            cache_key = _validators_cache_key(model, version, request)
+            validators = cache.get(cache_key)
+            record_cache_lookup('etag', validators is not None)
+            if validators is not None:
+                response = _not_modified_or_none(request, *validators)
+                if response is not None:
+                    return _set_validators(response, *validators)
+
+            response = view_func(request, *args, **kwargs)
+            validators = _response_validators(response, timestamp_field)
+            if validators is None:
+                return response
+            cache.set(cache_key, validators, _response_timeout(None, next_publish_date([model])))
+            return _set_validators(_not_modified_or_none(request, *validators) or response, *validators)
+
+        return inner
+
+    return decorator
+
+
+def aconditional_model_view(model, timestamp_field='updated_at'):
+    """
+    Async version of conditional_model_view() for ASGI-native views
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        async def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await view_func(request, *args, **kwargs)
+
+            cache = get_api_cache()
+            [version] = await aget_model_versions([model])
+            cache_key = _validators_cache_key(model, version, request)
+            validators = await cache.aget(cache_key)
+            record_cache_lookup('etag', validators is not None)
+            if validators is not None:
+                response = _not_modified_or_none(request, *validators)
+                if response is not None:
+                    return _set_validators(response, *validators)
+
+            response = await view_func(request, *args, **kwargs)
+            validators = _response_validators(response, timestamp_field)
+            if validators is None:
+                return response
+            await cache.aset(cache_key, validators, _response_timeout(None, await anext_publish_date([model])))
+            return _set_validators(_not_modified_or_none(request, *validators) or response, *validators)
+
+        return inner
+
+    return decorator
@@ -0,0 +1,170 @@
+"""
+Static JSON export of the public read API, for nginx or a CDN to serve.
+
+Responses are rendered with the API's serializers and renderer into files
+that mirror the API paths under API_EXPORT_ROOT:
+
+    v1/page-hero/<page_identifier>.json
+    v1/site-settings.json
+    manifest.json
+
+The manifest records the source row's ``updated_at`` and a content hash of
+each file. A file is only re-rendered when its row changed (or is missing
+from the manifest), and only rewritten when its content changed. Saves and
+deletes queue re-exports through the job queue (see core/signals.py), and
+``python manage.py export_api`` re-renders whatever changed since the last
+export.
+"""
+import fcntl
+import hashlib
+import json
+import os
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.settings import api_settings
+
+from .models import PageHero, SiteSettings
+from .serializers import PageHeroSerializer, SiteSettingsSerializer
+
+
+API_VERSION = 'v1'
+MANIFEST_NAME = 'manifest.json'
+
+
+def page_hero_path(page_identifier):
+    return f'{API_VERSION}/page-hero/{page_identifier}.json'
+
+
+SITE_SETTINGS_PATH = f'{API_VERSION}/site-settings.json'
+
+
+def export_request():
+    """
+    Request the exported responses are rendered for; absolute URLs in them
+    point at API_EXPORT_BASE_URL
+    """
+    url = urlsplit(settings.API_EXPORT_BASE_URL)
+    return RequestFactory().get('/', secure=url.scheme == 'https', HTTP_HOST=url.netloc)
+
+
+def render(data):
+    # The JSON renderer the API itself uses, the first in DEFAULT_RENDERER_CLASSES
+    return api_settings.DEFAULT_RENDERER_CLASSES[0]().render(data)
+
+
+class Exporter:
+    """
+    Writes exported files and keeps the manifest; use as a context manager
+    so concurrent job workers serialize on the manifest
+    """
+
+    def __init__(self, root=None):
+        self.root = str(root or settings.API_EXPORT_ROOT)
+        self.request = export_request()
+        self.written = self.unchanged = self.removed = 0
+
+    def __enter__(self):
+        os.makedirs(self.root, exist_ok=True)
+        self._lock_file = open(os.path.join(self.root, '.export.lock'), 'a')
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+        self.manifest = self._load_manifest()
+        if self.manifest.get('base_url') != settings.API_EXPORT_BASE_URL:
+            # Every file contains absolute URLs; render them all again
+            self.manifest = {'base_url': settings.API_EXPORT_BASE_URL, 'files': {}}
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            if exc_info[0] is None:
+                self.manifest['generated_at'] = timezone.now().isoformat()
+                self._write(MANIFEST_NAME, json.dumps(self.manifest, indent=2, sort_keys=True).encode('utf-8'))
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+
+    def _load_manifest(self):
+        try:
+            with open(os.path.join(self.root, MANIFEST_NAME)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, path, content):
+        full_path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        # Write and rename, so nginx never serves a partial file
+        tmp_path = f'{full_path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, full_path)
+
+    def is_current(self, path, updated_at):
+        entry = self.manifest['files'].get(path)
+        return (
+            entry is not None
+            and entry['updated_at'] == updated_at.isoformat()
+            and os.path.exists(os.path.join(self.root, path))
+        )
+
+    def write(self, path, data, updated_at):
+        content = render(data)
+        digest = hashlib.sha256(content).hexdigest()
+        entry = self.manifest['files'].get(path)
+        if entry is None or entry['sha256'] != digest or not os.path.exists(os.path.join(self.root, path)):
+            self._write(path, content)
+            self.written += 1
+        else:
+            self.unchanged += 1
+        self.manifest['files'][path] = {'sha256': digest, 'updated_at': updated_at.isoformat()}
+
+    def remove(self, path):
+        self.manifest['files'].pop(path, None)
+        try:
+            os.remove(os.path.join(self.root, path))
+        except FileNotFoundError:
+            return
+        self.removed += 1
+
+    def export_page_hero(self, page_identifier, changed_only=False):
+        path = page_hero_path(page_identifier)
+        hero = PageHero.objects.filter(page_identifier=page_identifier, is_active=True).first()
+        if hero is None:
+            # nginx falls through to Django, which answers 404
+            self.remove(path)
+        elif not (changed_only and self.is_current(path, hero.updated_at)):
+            data = PageHeroSerializer(hero, context={'request': self.request}).data
+            self.write(path, data, hero.updated_at)
+        else:
+            self.unchanged += 1
+
+    def export_site_settings(self, changed_only=False):
+        site_settings = SiteSettings.load()
+        if changed_only and self.is_current(SITE_SETTINGS_PATH, site_settings.updated_at):
+            self.unchanged += 1
+            return
+        data = SiteSettingsSerializer(site_settings, context={'request': self.request}).data
+        self.write(SITE_SETTINGS_PATH, data, site_settings.updated_at)
+
+    def export_all(self, changed_only=True):
+        for page_identifier, _ in PageHero.PAGE_CHOICES:
+            self.export_page_hero(page_identifier, changed_only=changed_only)
+        self.export_site_settings(changed_only=changed_only)
+
+
+def export_page_hero(page_identifier):
+    """
+    Background job: re-export one hero after it was saved or deleted
+    """
+    with Exporter() as exporter:
+        exporter.export_page_hero(page_identifier)
+
+
+def export_site_settings():
+    """
+    Background job: re-export the site settings after they were saved
+    """
+    with Exporter() as exporter:
+        exporter.export_site_settings()
@@ -0,0 +1,90 @@
+"""
+WSGI/ASGI entry points that run a reduced middleware chain for API requests.
+
+Token-authenticated JSON API requests do not need sessions, CSRF cookies or
+message storage, so paths under API_MIDDLEWARE_PATH_PREFIXES are handled by
+a second Django handler built from API_MIDDLEWARE. Everything else (admin,
+summernote, media) keeps the full MIDDLEWARE chain.
+
+Without AuthenticationMiddleware, API requests have no ``request.user`` in
+middleware; DRF authenticates the token in the view. MaintenanceModeMiddleware
+therefore blocks staff on API paths too.
+"""
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+
+
+class APIMiddlewareMixin:
+    """
+    Handler building its chain from API_MIDDLEWARE instead of MIDDLEWARE.
+
+    BaseHandler.load_middleware() always reads settings.MIDDLEWARE, so it is
+    pointed at ``get_middleware()`` while the chain is built and restored
+    afterwards, even if loading fails.
+    """
+
+    def get_middleware(self):
+        return settings.API_MIDDLEWARE
+
+    def load_middleware(self, is_async=False):
+        full_chain = settings.MIDDLEWARE
+        settings.MIDDLEWARE = self.get_middleware()
+        try:
+            super().load_middleware(is_async=is_async)
+        finally:
+            settings.MIDDLEWARE = full_chain
+
+
+class APIWSGIHandler(APIMiddlewareMixin, WSGIHandler):
+    pass
+
+
+class APIASGIHandler(APIMiddlewareMixin, ASGIHandler):
+    pass
+
+
+def is_api_path(path):
+    return path.startswith(tuple(settings.API_MIDDLEWARE_PATH_PREFIXES))
+
+
+class WSGIMiddlewareRouter:
+    """
+    WSGI application sending API paths to a handler with API_MIDDLEWARE
+    """
+
+    def __init__(self):
+        self.default_handler = WSGIHandler()
+        self.api_handler = APIWSGIHandler()
+
+    def __call__(self, environ, start_response):
+        handler = self.api_handler if is_api_path(environ.get('PATH_INFO', '')) else self.default_handler
+        return handler(environ, start_response)
+
+
+class ASGIMiddlewareRouter:
+    """
+    ASGI application sending API paths to a handler with API_MIDDLEWARE
+    """
+
+    def __init__(self):
+        self.default_handler = ASGIHandler()
+        self.api_handler = APIASGIHandler()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and is_api_path(scope['path']):
+            handler = self.api_handler
+        else:
+            handler = self.default_handler
+        await handler(scope, receive, send)
+
+
+def get_wsgi_application():
+    django.setup(set_prefix=False)
+    return WSGIMiddlewareRouter()
+
+
+def get_asgi_application():
+    django.setup(set_prefix=False)
+    return ASGIMiddlewareRouter()
@@ -0,0 +1,254 @@
+"""
+Background image processing tasks
+"""
+import base64
+import hashlib
+import io
+import json
+import os
+import posixpath
+import time
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from imagekit import ImageSpec
+from imagekit.processors import ResizeToFit
+from PIL import Image, ImageFilter, features
+
+from .jobs import final_attempt
+from .metrics import IMAGE_PROCESSING
+from .models import PageHero
+
+
+# Bump when a code change alters the generated images (see processing_fingerprint)
+IMAGE_PROCESSING_VERSION = 2
+
+# Maximum size and JPEG quality of the optimized hero image
+HERO_MAX_SIZE = (1920, 600)
+HERO_OPTIMIZED_QUALITY = 85
+
+# Width of the blurred low-quality image placeholder (LQIP)
+PLACEHOLDER_WIDTH = 32
+
+# Widths of the responsive renditions generated for each hero
+HERO_RENDITION_WIDTHS = (480, 768, 1280, 1920)
+
+# Rendition formats, most efficient first: (PIL format, MIME type, extension, save options)
+HERO_RENDITION_FORMATS = (
+    ('AVIF', 'image/avif', 'avif', {'quality': 50}),
+    ('WEBP', 'image/webp', 'webp', {'quality': 80, 'method': 6}),
+    ('JPEG', 'image/jpeg', 'jpg', {'quality': 85, 'optimize': True, 'progressive': True}),
+)
+
+
+class HeroRendition(ImageSpec):
+    """
+    imagekit spec scaling a hero image down to ``width`` in the given format
+    """
+
+    def __init__(self, source, width, format, options):
+        self.processors = [ResizeToFit(width=width, upscale=False)]
+        self.format = format
+        self.options = options
+        super().__init__(source=source)
+
+
+def file_hash(field_file):
+    """
+    Return the SHA-256 hex digest of a stored file's content
+    """
+    digest = hashlib.sha256()
+    with field_file.open('rb') as f:
+        for chunk in f.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def processing_fingerprint():
+    """
+    Fingerprint of every parameter that affects the generated images.
+
+    A hero is only reprocessed when its source content hash or this
+    fingerprint changes, so bump IMAGE_PROCESSING_VERSION when the
+    processing code itself changes in a way that affects the output.
+    """
+    params = {
+        'version': IMAGE_PROCESSING_VERSION,
+        'max_size': HERO_MAX_SIZE,
+        'quality': HERO_OPTIMIZED_QUALITY,
+        'widths': HERO_RENDITION_WIDTHS,
+        'placeholder_width': PLACEHOLDER_WIDTH,
+        'formats': [(pil_format, options) for pil_format, _, _, options in rendition_formats()],
+    }
+    encoded = json.dumps(params, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _replace(name, content):
+    # Derived files keep stable names so a rerun overwrites instead of piling up
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, ContentFile(content))
+
+
+def generate_optimized_image(hero):
+    """
+    Write a copy of the hero image fitted to HERO_MAX_SIZE to a separate file
+    and delete the previous copy if it had another name. The uploaded
+    original is never re-encoded.
+    """
+    with hero.background_image.open('rb') as f, Image.open(f) as img:
+        img.thumbnail(HERO_MAX_SIZE, Image.Resampling.LANCZOS)
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        output = io.BytesIO()
+        img.save(output, 'JPEG', optimize=True, quality=HERO_OPTIMIZED_QUALITY)
+
+    stem = os.path.splitext(os.path.basename(hero.background_image.name))[0]
+    name = _replace(posixpath.join('heroes', 'optimized', str(hero.pk), f'{stem}.jpg'), output.getvalue())
+
+    # A replaced upload with another file name would orphan the old copy
+    previous = hero.optimized_image.name
+    if previous and previous != name and default_storage.exists(previous):
+        default_storage.delete(previous)
+    return name
+
+
+def dominant_color(img):
+    """
+    Return the most common colour of an image as a hex string
+    """
+    sample = img.convert('RGB').resize((64, 64), Image.Resampling.BILINEAR)
+    palette_img = sample.quantize(colors=5)
+    _, index = max(palette_img.getcolors())
+    palette = palette_img.getpalette()
+    r, g, b = palette[index * 3:index * 3 + 3]
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def placeholder_data_uri(img):
+    """
+    Return a tiny blurred JPEG preview of an image as a base64 data URI
+    """
+    height = max(1, round(img.height * PLACEHOLDER_WIDTH / img.width))
+    thumb = img.convert('RGB').resize((PLACEHOLDER_WIDTH, height), Image.Resampling.LANCZOS)
+    thumb = thumb.filter(ImageFilter.GaussianBlur(1))
+    output = io.BytesIO()
+    thumb.save(output, 'JPEG', quality=40, optimize=True)
+    return 'data:image/jpeg;base64,' + base64.b64encode(output.getvalue()).decode('ascii')
+
+
+def image_metadata(field_file):
+    """
+    Return the width, height, dominant colour and placeholder of an image
+    """
+    with field_file.open('rb') as f, Image.open(f) as img:
+        img.load()
+        return {
+            'image_width': img.width,
+            'image_height': img.height,
+            'dominant_color': dominant_color(img),
+            'placeholder': placeholder_data_uri(img),
+        }
+
+
+def rendition_formats():
+    """
+    Return the rendition formats supported by the installed Pillow build
+    """
+    return [
+        spec for spec in HERO_RENDITION_FORMATS
+        if spec[0] != 'AVIF' or features.check('avif')
+    ]
+
+
+def generate_hero_renditions(hero):
+    """
+    Generate the responsive renditions of a hero's background image.
+
+    Returns the rendition list stored in ``PageHero.renditions`` and deletes
+    files from a previous run that are no longer part of it.
+    """
+    with hero.background_image.open('rb') as f, Image.open(f) as img:
+        source_width = img.width
+
+    # Never upscale: drop widths larger than the source, but always keep one
+    widths = [width for width in HERO_RENDITION_WIDTHS if width <= source_width] or [source_width]
+    stem = os.path.splitext(os.path.basename(hero.background_image.name))[0]
+    directory = posixpath.join('heroes', 'renditions', str(hero.pk))
+
+    renditions = []
+    for width in widths:
+        for pil_format, mime_type, extension, options in rendition_formats():
+            spec = HeroRendition(hero.background_image, width, pil_format, options)
+            content = spec.generate().read()
+            name = _replace(posixpath.join(directory, f'{stem}-{width}w.{extension}'), content)
+            with Image.open(io.BytesIO(content)) as rendered:
+                size = rendered.size
+            renditions.append({
+                'width': size[0],
+                'height': size[1],
+                'type': mime_type,
+                'name': name,
+            })
+
+    current = {rendition['name'] for rendition in renditions}
+    for rendition in hero.renditions or []:
+        if rendition.get('name') not in current and default_storage.exists(rendition['name']):
+            default_storage.delete(rendition['name'])
+
+    return renditions
+
+
+def process_page_hero_image(pk):
+    """
+    Generate the optimized image, layout metadata and renditions of a
+    PageHero and record the outcome on the hero. Does nothing when neither
+    the source content nor the processing parameters changed since the last
+    successful run. A failure leaves the hero pending while the job still
+    has retries left, and marks it failed after the last one.
+    """
+    hero = PageHero.objects.filter(pk=pk).first()
+    if hero is None or not hero.background_image:
+        return
+
+    if not default_storage.exists(hero.background_image.name):
+        hero.image_status = PageHero.IMAGE_FAILED
+        hero.image_error = f'Image file {hero.background_image.name} not found'
+        hero.save(update_fields=['image_status', 'image_error'])
+        return
+
+    start = time.perf_counter()
+    PageHero.objects.filter(pk=pk).update(image_status=PageHero.IMAGE_PROCESSING)
+    try:
+        content_hash = file_hash(hero.background_image)
+        fingerprint = processing_fingerprint()
+        unchanged = (
+            content_hash == hero.image_hash
+            and fingerprint == hero.image_fingerprint
+            and hero.optimized_image
+        )
+        if not unchanged:
+            hero.optimized_image.name = generate_optimized_image(hero)
+            for field, value in image_metadata(hero.optimized_image).items():
+                setattr(hero, field, value)
+            hero.renditions = generate_hero_renditions(hero)
+            hero.image_hash = content_hash
+            hero.image_fingerprint = fingerprint
+            hero.image_processed_at = timezone.now()
+    except Exception as exc:
+        hero.image_status = PageHero.IMAGE_FAILED if final_attempt() else PageHero.IMAGE_PENDING
+        hero.image_error = str(exc)
+        hero.save(update_fields=['image_status', 'image_error'])
+        IMAGE_PROCESSING.labels('failed').observe(time.perf_counter() - start)
+        raise
+
+    hero.image_status = PageHero.IMAGE_DONE
+    hero.image_error = ''
+    hero.save(update_fields=[
+        'image_status', 'image_processed_at', 'image_error', 'optimized_image',
+        'image_width', 'image_height', 'dominant_color', 'placeholder',
+        'renditions', 'image_hash', 'image_fingerprint',
+    ])
+    IMAGE_PROCESSING.labels('skipped' if unchanged else 'processed').observe(time.perf_counter() - start)
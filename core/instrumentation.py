@@ -0,0 +1,186 @@
+"""
+Per-request cost accounting: SQL queries, serializer time and cache lookups.
+
+RequestInstrumentationMiddleware starts a RequestMetrics for each request in
+a context variable. Code that does measurable work reports into it with the
+helpers below, which are no-ops outside a request. Queries are recorded by a
+database execute wrapper installed on every new connection (see
+core/signals.py), so nothing needs DEBUG=True.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from . import metrics as prometheus_metrics
+
+
+logger = logging.getLogger('core.requests')
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    __slots__ = ('started', 'queries', 'db_time', 'serializer_time', 'cache_hits', 'cache_misses', 'statements')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        # (sql, seconds) pairs; params are not kept, so this stays cheap
+        self.statements = []
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def current_metrics():
+    return _current.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper counting queries and their duration
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+        metrics.queries += 1
+        metrics.db_time += duration
+        if len(metrics.statements) < settings.REQUEST_SLOW_LOG_MAX_QUERIES:
+            metrics.statements.append((sql, duration))
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    connection_created receiver adding record_query to the new connection
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def record_cache_lookup(cache, hit):
+    """
+    Count a lookup in ``cache`` (response, etag, token) for the request and Prometheus
+    """
+    prometheus_metrics.CACHE_LOOKUPS.labels(cache, 'hit' if hit else 'miss').inc()
+    metrics = _current.get()
+    if metrics is not None:
+        if hit:
+            metrics.cache_hits += 1
+        else:
+            metrics.cache_misses += 1
+
+
+@contextmanager
+def serializer_timer():
+    metrics = _current.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if metrics is not None:
+            metrics.serializer_time += time.perf_counter() - start
+
+
+class TimedSerializerMixin:
+    """
+    Serializer mixin adding the time spent building ``.data`` to the request metrics
+    """
+
+    @property
+    def data(self):
+        with serializer_timer():
+            return super().data
+
+
+def server_timing(metrics, total):
+    return ', '.join([
+        f'db;dur={metrics.db_time * 1000:.2f};desc="{metrics.queries} queries"',
+        f'serializer;dur={metrics.serializer_time * 1000:.2f}',
+        f'cache;desc="hit={metrics.cache_hits} miss={metrics.cache_misses}"',
+        f'total;dur={total * 1000:.2f}',
+    ])
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Log query count, DB time, serializer time and cache hits per request.
+
+    Every request is logged at DEBUG on the ``core.requests`` logger, with the
+    numbers as structured ``extra`` fields. Requests slower than
+    REQUEST_SLOW_THRESHOLD_MS are logged at WARNING with their SQL. With
+    REQUEST_SERVER_TIMING the numbers are also sent in a ``Server-Timing``
+    header for browser dev tools. Latency, response size and query counts also
+    go to the Prometheus metrics in core/metrics.py. Place it first in the
+    middleware chain.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def finish(self, request, response, metrics):
+        total = metrics.elapsed()
+        prometheus_metrics.observe_request(request, response, total, metrics.queries)
+        if settings.REQUEST_SERVER_TIMING:
+            response['Server-Timing'] = server_timing(metrics, total)
+
+        slow = total * 1000 >= settings.REQUEST_SLOW_THRESHOLD_MS
+        level = logging.WARNING if slow else logging.DEBUG
+        if not logger.isEnabledFor(level):
+            return response
+
+        fields = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(total * 1000, 2),
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'serializer_ms': round(metrics.serializer_time * 1000, 2),
+            'cache_hits': metrics.cache_hits,
+            'cache_misses': metrics.cache_misses,
+        }
+        message = '%s %s %s ' + ' '.join(f'{name}=%s' for name in list(fields)[3:])
+        args = list(fields.values())
+        if slow:
+            message = 'Slow request: ' + message + '\n%s'
+            args.append('\n'.join(f'  {duration * 1000:.2f} ms  {sql}' for sql, duration in metrics.statements))
+            fields['sql'] = [sql for sql, _ in metrics.statements]
+        logger.log(level, message, *args, extra=fields)
+        return response
@@ -0,0 +1,145 @@
+"""
+Lightweight database-backed job queue.
+
+Jobs are rows in BackgroundJob, so a job enqueued inside a transaction only
+becomes visible to workers once that transaction commits. Workers
+(``python manage.py run_jobs``) claim jobs with a conditional UPDATE, which
+is safe with any number of concurrent workers, and retry failed jobs with
+exponential backoff.
+"""
+import logging
+import traceback
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import BackgroundJob
+
+
+logger = logging.getLogger(__name__)
+
+# Job being executed in this context, for final_attempt()
+_current_job = ContextVar('current_job', default=None)
+
+
+def enqueue(task, *args, delay=0, max_attempts=None, **kwargs):
+    """
+    Queue ``task`` (dotted path of a function) to run with JSON-serializable
+    ``args`` and ``kwargs``.
+
+    With BACKGROUND_JOBS_EAGER the job runs in this process right after the
+    surrounding transaction commits instead of waiting for a worker.
+    """
+    job = BackgroundJob.objects.create(
+        task=task,
+        args=list(args),
+        kwargs=kwargs,
+        max_attempts=max_attempts or settings.BACKGROUND_JOBS_MAX_ATTEMPTS,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+    if settings.BACKGROUND_JOBS_EAGER:
+        transaction.on_commit(lambda: run_job(job.pk))
+    return job
+
+
+def _claim(pk, now):
+    claimed = BackgroundJob.objects.filter(pk=pk, status=BackgroundJob.STATUS_PENDING).update(
+        status=BackgroundJob.STATUS_RUNNING,
+        locked_at=now,
+        attempts=F('attempts') + 1,
+    )
+    return BackgroundJob.objects.get(pk=pk) if claimed else None
+
+
+def requeue_stale_jobs():
+    """
+    Return jobs whose worker died mid-run to the queue
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.BACKGROUND_JOBS_LOCK_TIMEOUT)
+    return BackgroundJob.objects.filter(
+        status=BackgroundJob.STATUS_RUNNING, locked_at__lt=cutoff,
+    ).update(status=BackgroundJob.STATUS_PENDING, locked_at=None)
+
+
+def claim_next_job():
+    """
+    Claim the oldest runnable job, or return None if the queue is empty
+    """
+    now = timezone.now()
+    candidates = (
+        BackgroundJob.objects
+        .filter(status=BackgroundJob.STATUS_PENDING, run_after__lte=now)
+        .order_by('run_after', 'pk')
+        .values_list('pk', flat=True)[:10]
+    )
+    for pk in candidates:
+        job = _claim(pk, now)
+        if job is not None:
+            return job
+    return None
+
+
+def final_attempt():
+    """
+    Whether a failure of the running task is final: True on the job's last
+    attempt, and when the task is called directly rather than by a worker
+    """
+    job = _current_job.get()
+    return job is None or job.attempts >= job.max_attempts
+
+
+def execute(job):
+    """
+    Run a claimed job and record the outcome, scheduling a retry on failure
+    """
+    token = _current_job.set(job)
+    try:
+        import_string(job.task)(*job.args, **job.kwargs)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = BackgroundJob.STATUS_FAILED
+            logger.exception('Job %s (%s) failed permanently', job.pk, job.task)
+        else:
+            delay = settings.BACKGROUND_JOBS_RETRY_DELAY * 2 ** (job.attempts - 1)
+            job.status = BackgroundJob.STATUS_PENDING
+            job.run_after = timezone.now() + timedelta(seconds=delay)
+            logger.warning('Job %s (%s) failed, retrying in %ss', job.pk, job.task, delay)
+    else:
+        job.status = BackgroundJob.STATUS_DONE
+        job.last_error = ''
+    finally:
+        _current_job.reset(token)
+    job.locked_at = None
+    job.save(update_fields=['status', 'run_after', 'locked_at', 'last_error', 'updated_at'])
+    return job
+
+
+def run_job(pk):
+    """
+    Run a specific job now if it is still pending
+    """
+    job = _claim(pk, timezone.now())
+    if job is not None:
+        execute(job)
+    return job
+
+
+def run_pending(limit=None):
+    """
+    Run runnable jobs until the queue is empty or ``limit`` jobs have run
+    """
+    requeue_stale_jobs()
+    count = 0
+    while limit is None or count < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        execute(job)
+        count += 1
+    return count
@@ -0,0 +1,157 @@
+import json
+import logging
+import platform
+from importlib import import_module
+from unittest import mock
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.throttling import SimpleRateThrottle
+
+from core.benchmarks import SUITES
+
+
+# Throttle rates used while benchmarking, so suites measure request handling
+# rather than 429 responses. A one-second window keeps throttle history small.
+BENCHMARK_THROTTLE_RATES = {'anon': '1000000000/s', 'user': '1000000000/s'}
+
+# Modules registering benchmark suites
+SUITE_MODULES = [
+    'core.benchmarks.middleware',
+    'core.benchmarks.serializers',
+    'core.benchmarks.renderers',
+    'core.benchmarks.load',
+    'core.benchmarks.asgi',
+    'core.benchmarks.search',
+]
+
+# Benchmarks compared against a baseline fail when their p50 grows by more than this
+DEFAULT_TOLERANCE = 0.25
+
+
+class Command(BaseCommand):
+    help = 'Run API benchmark suites against a throwaway test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'suites',
+            nargs='*',
+            help='Suites to run (default: all)',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=2000,
+            help='Timed iterations per benchmark (default: 2000)',
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=50,
+            help='Requests in flight for concurrent benchmarks (default: 50)',
+        )
+        parser.add_argument(
+            '--save-baseline',
+            metavar='PATH',
+            help='Write the results to PATH as JSON',
+        )
+        parser.add_argument(
+            '--compare',
+            metavar='PATH',
+            help='Compare with a saved baseline and fail on p50 regressions',
+        )
+        parser.add_argument(
+            '--tolerance',
+            type=float,
+            default=DEFAULT_TOLERANCE,
+            help=f'Allowed p50 slowdown against the baseline (default: {DEFAULT_TOLERANCE})',
+        )
+
+    def handle(self, *args, **options):
+        for module in SUITE_MODULES:
+            import_module(module)
+
+        names = options['suites'] or list(SUITES)
+        unknown = set(names) - set(SUITES)
+        if unknown:
+            raise CommandError(f"Unknown suite(s): {', '.join(sorted(unknown))}. Available: {', '.join(SUITES)}")
+
+        # Per-request logging would dominate the cheaper benchmarks
+        logging.disable(logging.WARNING)
+        setup_test_environment(debug=False)
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = []
+            with mock.patch.dict(SimpleRateThrottle.THROTTLE_RATES, BENCHMARK_THROTTLE_RATES):
+                for name in names:
+                    self.stdout.write(f'Running {name}...')
+                    results.extend(SUITES[name](options))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+            logging.disable(logging.NOTSET)
+
+        self.write_table(results)
+        if options['save_baseline']:
+            self.save_baseline(options['save_baseline'], results, options)
+        if options['compare']:
+            self.compare(options['compare'], results, options['tolerance'])
+
+    def save_baseline(self, path, results, options):
+        baseline = {
+            'machine': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'database': connection.vendor,
+            },
+            'options': {'iterations': options['iterations'], 'concurrency': options['concurrency']},
+            'results': {result['name']: result for result in results},
+        }
+        with open(path, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        self.stdout.write(f'Baseline written to {path}')
+
+    def compare(self, path, results, tolerance):
+        try:
+            with open(path) as f:
+                baseline = json.load(f)['results']
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f'Could not read baseline {path}: {exc}')
+
+        header = f"{'benchmark':<48} {'base p50':>9} {'p50':>9} {'change':>8}"
+        self.stdout.write('')
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        regressions = []
+        for result in results:
+            base = baseline.get(result['name'])
+            if base is None or not base['p50_ms']:
+                continue
+            change = result['p50_ms'] / base['p50_ms'] - 1
+            flag = ''
+            if change > tolerance:
+                regressions.append(result['name'])
+                flag = '  REGRESSION'
+            self.stdout.write(
+                f"{result['name']:<48} {base['p50_ms']:>9.3f} {result['p50_ms']:>9.3f} {change:>+8.1%}{flag}"
+            )
+
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} benchmark(s) slower than the baseline by more than {tolerance:.0%}: "
+                + ', '.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
+
+    def write_table(self, results):
+        header = f"{'benchmark':<48} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'ops/s':>10}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for result in results:
+            self.stdout.write(
+                f"{result['name']:<48} {result['mean_ms']:>9.3f} {result['p50_ms']:>9.3f} "
+                f"{result['p95_ms']:>9.3f} {result['p99_ms']:>9.3f} {result['ops_per_sec']:>10.1f}"
+            )
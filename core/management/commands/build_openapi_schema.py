@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.openapi import build_schema
+
+
+class Command(BaseCommand):
+    help = 'Build the static OpenAPI schema file (collectstatic also builds it)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            help='Directory to write openapi/schema.json under (default: OPENAPI_SCHEMA_ROOT)',
+        )
+
+    def handle(self, *args, **options):
+        path, changed = build_schema(options['output'])
+        self.stdout.write(self.style.SUCCESS(f"{'Wrote' if changed else 'Unchanged'}: {path}"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core.export import Exporter
+
+
+class Command(BaseCommand):
+    help = 'Export public API responses to static JSON files for nginx'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Re-render every file, not only those whose rows changed since the last export',
+        )
+        parser.add_argument(
+            '--output',
+            help='Export directory (default: API_EXPORT_ROOT)',
+        )
+
+    def handle(self, *args, **options):
+        with Exporter(options['output']) as exporter:
+            exporter.export_all(changed_only=not options['all'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported to {exporter.root}: {exporter.written} written, '
+            f'{exporter.unchanged} unchanged, {exporter.removed} removed'
+        ))
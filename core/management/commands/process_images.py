@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from core.images import processing_fingerprint
+from core.jobs import enqueue
+from core.models import PageHero
+
+
+class Command(BaseCommand):
+    help = 'Queue image processing for heroes whose images are missing or outdated'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Queue every hero, even if its images are up to date',
+        )
+
+    def handle(self, *args, **options):
+        heroes = PageHero.objects.exclude(background_image='')
+        if not options['force']:
+            heroes = heroes.exclude(
+                image_status=PageHero.IMAGE_DONE,
+                image_fingerprint=processing_fingerprint(),
+            )
+
+        count = 0
+        for pk in heroes.values_list('pk', flat=True):
+            if options['force']:
+                # Clearing the hash makes the job regenerate instead of skipping
+                PageHero.objects.filter(pk=pk).update(image_hash='')
+            enqueue('core.images.process_page_hero_image', pk)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Queued image processing for {count} hero(es)'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.apps import apps
+
+from core.search import rebuild_index, search_models
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index from the searchable models'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models',
+            nargs='*',
+            help='Models to re-index as app_label.ModelName (default: all searchable models)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Documents written per query (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        models = []
+        for label in options['models']:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError):
+                model = None
+            if model not in search_models():
+                raise CommandError(f'{label} is not a searchable model')
+            models.append(model)
+
+        count = rebuild_index(models or None, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} document(s)'))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.jobs import run_pending
+from core.publishing import schedule_all
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (image processing, scheduled publishing and other deferred work)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run all currently runnable jobs and exit instead of polling',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between polls when the queue is empty (default: 2)',
+        )
+
+    def handle(self, *args, **options):
+        # Re-queue publish-date jobs in case they were lost
+        schedule_all()
+
+        if options['once']:
+            count = run_pending()
+            self.stdout.write(self.style.SUCCESS(f'Ran {count} job(s)'))
+            return
+
+        self.stdout.write('Worker started, waiting for jobs...')
+        try:
+            while True:
+                if not run_pending():
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            self.stdout.write('Worker stopped.')
@@ -1,7 +1,8 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
 from core.models import SiteSettings, PageHero
-import os
+from core.seeding import generate_hero_images, generate_users
+import time
 
 
 class Command(BaseCommand):
@@ -13,22 +14,50 @@ class Command(BaseCommand):
             action='store_true',
             help='Force creation even if data already exists',
         )
+        parser.add_argument(
+            '--scale',
+            type=int,
+            default=0,
+            metavar='N',
+            help='Also create N load-test API users with tokens',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Rows per bulk insert with --scale (default: 5000)',
+        )
+        parser.add_argument(
+            '--images',
+            action='store_true',
+            help='Render placeholder background images for the heroes',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Processes rendering placeholder images (default: CPU count)',
+        )
 
     def handle(self, *args, **options):
         self.stdout.write('Seeding initial data...')
         
         # Create SiteSettings if it doesn't exist
         if not SiteSettings.objects.exists() or options['force']:
-            site_settings = SiteSettings.objects.create(
-                university_name="National Intelligence and Research University",
-                short_name="NIRU",
-                tagline="Premier Science and Research-Intensive African University",
-                address="P.O. Box 47446 - 00100, Nairobi, Kenya",
-                phone_numbers=["+254 798 471845", "+254 742 093140"],
-                email="admin@niru.ac.ke",
-                copyright_text="Copyright 2025. National Intelligence and Research University. All Rights Reserved.",
-                charter_date=None,  # Will be set later when available
-                charter_by="H.E. William Samoei Ruto, President and Commander in Chief of the Kenya Defence Forces"
+            # SiteSettings is a singleton, so --force updates the existing row
+            site_settings, _ = SiteSettings.objects.update_or_create(
+                pk=SiteSettings.SINGLETON_PK,
+                defaults=dict(
+                    university_name="National Intelligence and Research University",
+                    short_name="NIRU",
+                    tagline="Premier Science and Research-Intensive African University",
+                    address="P.O. Box 47446 - 00100, Nairobi, Kenya",
+                    phone_numbers=["+254 798 471845", "+254 742 093140"],
+                    email="admin@niru.ac.ke",
+                    copyright_text="Copyright 2025. National Intelligence and Research University. All Rights Reserved.",
+                    charter_date=None,  # Will be set later when available
+                    charter_by="H.E. William Samoei Ruto, President and Commander in Chief of the Kenya Defence Forces"
+                ),
             )
             self.stdout.write(
                 self.style.SUCCESS(f'Successfully created SiteSettings: {site_settings.university_name}')
@@ -145,7 +174,46 @@ class Command(BaseCommand):
             )
         else:
             self.stdout.write('Superuser already exists.')
-        
+
+        if options['scale']:
+            self.seed_scale(options)
+
+        if options['images']:
+            self.seed_images(options)
+
         self.stdout.write(
             self.style.SUCCESS('Database seeding completed successfully!')
-        )
\ No newline at end of file
+        )
+
+    def progress(self, label, started):
+        def report(done, total):
+            elapsed = time.perf_counter() - started
+            rate = done / elapsed if elapsed else 0
+            self.stdout.write(f'  {label}: {done}/{total} ({elapsed:.1f}s, {rate:.0f}/s)')
+            self.stdout.flush()
+        return report
+
+    def seed_scale(self, options):
+        self.stdout.write(f"Creating {options['scale']} load-test users with tokens...")
+        started = time.perf_counter()
+        created = generate_users(
+            options['scale'],
+            batch_size=options['batch_size'],
+            progress=self.progress('users', started),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Created {created} users in {time.perf_counter() - started:.1f}s')
+        )
+
+    def seed_images(self, options):
+        heroes = PageHero.objects.order_by('page_identifier')
+        self.stdout.write('Rendering placeholder hero images...')
+        started = time.perf_counter()
+        generate_hero_images(
+            heroes,
+            workers=options['workers'],
+            progress=self.progress('images', started),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'Rendered hero images in {time.perf_counter() - started:.1f}s')
+        )
@@ -0,0 +1,89 @@
+"""
+Prometheus metrics, served in text format by metrics_view.
+
+Under gunicorn, set PROMETHEUS_MULTIPROC_DIR to an empty directory before
+starting (see gunicorn.conf.py): every worker then writes its samples to
+files there and the endpoint aggregates them, whichever worker answers the
+scrape. Without it, each process only reports its own samples.
+"""
+import hmac
+import os
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest,
+)
+from prometheus_client import multiprocess
+
+
+REQUEST_LATENCY = Histogram(
+    'niru_request_duration_seconds',
+    'Request latency by URL name',
+    ['url_name', 'method', 'status'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+RESPONSE_SIZE = Histogram(
+    'niru_response_size_bytes',
+    'Response body size by URL name',
+    ['url_name'],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576),
+)
+REQUEST_QUERIES = Histogram(
+    'niru_request_db_queries',
+    'SQL queries per request by URL name',
+    ['url_name'],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+CACHE_LOOKUPS = Counter(
+    'niru_cache_lookups_total',
+    'Cache lookups by cache and result (hit/miss)',
+    ['cache', 'result'],
+)
+THROTTLED_REQUESTS = Counter(
+    'niru_throttled_requests_total',
+    'Requests rejected by throttling (429) by URL name',
+    ['url_name'],
+)
+IMAGE_PROCESSING = Histogram(
+    'niru_image_processing_duration_seconds',
+    'Hero image processing time by outcome (processed/skipped/failed)',
+    ['outcome'],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+
+
+def url_name(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None and match.view_name else 'unmatched'
+
+
+def observe_request(request, response, duration, queries):
+    name = url_name(request)
+    REQUEST_LATENCY.labels(name, request.method, response.status_code).observe(duration)
+    REQUEST_QUERIES.labels(name).observe(queries)
+    if not response.streaming:
+        RESPONSE_SIZE.labels(name).observe(len(response.content))
+    if response.status_code == 429:
+        THROTTLED_REQUESTS.labels(name).inc()
+
+
+def _registry():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_view(request):
+    """
+    Serve metrics to scrapers sending ``Authorization: Bearer <METRICS_AUTH_TOKEN>``.
+    The endpoint does not exist while METRICS_AUTH_TOKEN is empty.
+    """
+    if not settings.METRICS_AUTH_TOKEN:
+        raise Http404
+    expected = f'Bearer {settings.METRICS_AUTH_TOKEN}'
+    if not hmac.compare_digest(request.headers.get('Authorization', ''), expected):
+        return HttpResponse('Unauthorized', status=401, content_type='text/plain')
+    return HttpResponse(generate_latest(_registry()), content_type=CONTENT_TYPE_LATEST)
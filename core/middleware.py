@@ -0,0 +1,161 @@
+import gzip
+from functools import lru_cache
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+
+from .cache import aget_site_settings, get_site_settings
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; responses are gzipped without it
+    brotli = None
+
+
+class MaintenanceModeMiddleware:
+    """
+    Answer public requests with 503 while SiteSettings.maintenance_mode is on.
+
+    The flag is read from the process-local SiteSettings cache, so this adds
+    no database query per request. Staff users and the paths listed in
+    MAINTENANCE_MODE_EXEMPT_PATHS (admin, site settings, static and media)
+    are let through. The staff check needs ``request.user`` from
+    AuthenticationMiddleware, so it does not apply in API_MIDDLEWARE, where
+    staff get the 503 too. Works natively under both WSGI and ASGI.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if self.is_blocked(request, get_site_settings()):
+            return self.maintenance_response()
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if self.is_blocked(request, await aget_site_settings()):
+            return self.maintenance_response()
+        return await self.get_response(request)
+
+    def is_blocked(self, request, site_settings):
+        if not site_settings.maintenance_mode:
+            return False
+        if request.path.startswith(tuple(settings.MAINTENANCE_MODE_EXEMPT_PATHS)):
+            return False
+        user = getattr(request, 'user', None)
+        return not (user is not None and user.is_staff)
+
+    def maintenance_response(self):
+        return JsonResponse(
+            {'error': 'The site is undergoing maintenance. Please try again later.'},
+            status=503,
+            headers={'Retry-After': str(settings.MAINTENANCE_MODE_RETRY_AFTER)},
+        )
+
+
+@lru_cache(maxsize=128)
+def encode(content, encoding, level):
+    """
+    Compress ``content``. Response cache hits send the same bodies over and
+    over, so the most recent encodings are kept rather than redone.
+    """
+    if encoding == 'br':
+        return brotli.compress(content, quality=level)
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Compress JSON responses with Brotli or gzip, whichever the client
+    prefers in Accept-Encoding (Brotli on a tie).
+
+    Only responses of at least API_COMPRESSION_MIN_SIZE bytes are compressed;
+    below that the headers cost more than the bytes saved. Streaming and
+    already encoded responses pass through. Like Django's GZipMiddleware it
+    adds ``Vary: Accept-Encoding`` and weakens strong ETags, which
+    conditional requests still match. Brotli is used only when the optional
+    Brotli package is installed.
+
+    It belongs in API_MIDDLEWARE only, right after the instrumentation
+    middleware so every other middleware sees the uncompressed response.
+    Token-authenticated JSON carries no cookie-bound secrets; HTML pages
+    with CSRF tokens are left to GZipMiddleware's BREACH mitigation or the
+    web server.
+    """
+    sync_capable = True
+    async_capable = True
+
+    compressible_types = ('application/json',)
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        if not self.is_compressible(response):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = self.negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        if encoding == 'br':
+            content = encode(response.content, encoding, settings.API_COMPRESSION_BROTLI_QUALITY)
+        else:
+            content = encode(response.content, encoding, settings.API_COMPRESSION_GZIP_LEVEL)
+        if len(content) >= len(response.content):
+            return response
+
+        response.content = content
+        response['Content-Length'] = str(len(content))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+    def is_compressible(self, response):
+        return (
+            not response.streaming
+            and response.status_code not in (204, 206, 304)
+            and not response.has_header('Content-Encoding')
+            and len(response.content) >= settings.API_COMPRESSION_MIN_SIZE
+            and response.get('Content-Type', '').startswith(self.compressible_types)
+        )
+
+    @staticmethod
+    def negotiate(accept_encoding):
+        """
+        Return 'br', 'gzip' or None for an Accept-Encoding header
+        """
+        qualities = {}
+        for item in accept_encoding.lower().split(','):
+            coding, _, params = item.strip().partition(';')
+            quality = 1.0
+            if params.strip().startswith('q='):
+                try:
+                    quality = float(params.strip()[2:])
+                except ValueError:
+                    quality = 0.0
+            qualities[coding.strip()] = quality
+        wildcard = qualities.get('*', 0.0)
+        candidates = (['br'] if brotli is not None else []) + ['gzip']
+        best = max(candidates, key=lambda coding: qualities.get(coding, wildcard))
+        return best if qualities.get(best, wildcard) > 0 else None
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-18 06:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_background_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pagehero',
+            name='renditions',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
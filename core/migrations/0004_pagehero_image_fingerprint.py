@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-18 06:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_pagehero_renditions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pagehero',
+            name='image_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='pagehero',
+            name='image_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='pagehero',
+            name='optimized_image',
+            field=models.ImageField(blank=True, editable=False, upload_to='heroes/optimized/'),
+        ),
+    ]
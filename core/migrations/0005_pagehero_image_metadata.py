@@ -0,0 +1,33 @@
+# Generated by Django 6.0.1 on 2026-10-18 06:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_pagehero_image_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pagehero',
+            name='dominant_color',
+            field=models.CharField(blank=True, editable=False, help_text='Hex colour, e.g. #1a2a4e', max_length=7),
+        ),
+        migrations.AddField(
+            model_name='pagehero',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='pagehero',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='pagehero',
+            name='placeholder',
+            field=models.TextField(blank=True, editable=False, help_text='Tiny blurred preview as a data URI'),
+        ),
+    ]
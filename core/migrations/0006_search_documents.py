@@ -0,0 +1,94 @@
+# Generated by Django 6.0.1 on 2026-10-18 07:17
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# The full-text index depends on the database: a GIN index over the weighted
+# tsvector on PostgreSQL, an external-content FTS5 table kept in sync by
+# triggers on SQLite (see core/search.py)
+SEARCH_INDEX_SQL = {
+    'postgresql': (
+        [
+            'CREATE INDEX core_searchdocument_vector ON core_searchdocument USING gin (search_vector)',
+        ],
+        [
+            'DROP INDEX IF EXISTS core_searchdocument_vector',
+        ],
+    ),
+    'sqlite': (
+        [
+            "CREATE VIRTUAL TABLE core_searchdocument_fts USING fts5("
+            "title, keywords, description, body, "
+            "content='core_searchdocument', content_rowid='id', "
+            "tokenize='porter unicode61 remove_diacritics 2')",
+            "CREATE TRIGGER core_searchdocument_fts_insert AFTER INSERT ON core_searchdocument BEGIN "
+            "INSERT INTO core_searchdocument_fts(rowid, title, keywords, description, body) "
+            "VALUES (new.id, new.title, new.keywords, new.description, new.body); END",
+            "CREATE TRIGGER core_searchdocument_fts_delete AFTER DELETE ON core_searchdocument BEGIN "
+            "INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, title, keywords, description, body) "
+            "VALUES ('delete', old.id, old.title, old.keywords, old.description, old.body); END",
+            "CREATE TRIGGER core_searchdocument_fts_update "
+            "AFTER UPDATE OF title, keywords, description, body ON core_searchdocument BEGIN "
+            "INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, title, keywords, description, body) "
+            "VALUES ('delete', old.id, old.title, old.keywords, old.description, old.body); "
+            "INSERT INTO core_searchdocument_fts(rowid, title, keywords, description, body) "
+            "VALUES (new.id, new.title, new.keywords, new.description, new.body); END",
+        ],
+        [
+            'DROP TRIGGER IF EXISTS core_searchdocument_fts_update',
+            'DROP TRIGGER IF EXISTS core_searchdocument_fts_delete',
+            'DROP TRIGGER IF EXISTS core_searchdocument_fts_insert',
+            'DROP TABLE IF EXISTS core_searchdocument_fts',
+        ],
+    ),
+}
+
+
+def create_search_index(apps, schema_editor):
+    forward, _ = SEARCH_INDEX_SQL.get(schema_editor.connection.vendor, ([], []))
+    for sql in forward:
+        schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    _, reverse = SEARCH_INDEX_SQL.get(schema_editor.connection.vendor, ([], []))
+    for sql in reverse:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('core', '0005_pagehero_image_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_published', models.BooleanField(default=True, help_text='Whether this content is published')),
+                ('publish_date', models.DateTimeField(blank=True, help_text='Date to publish this content', null=True)),
+                ('object_id', models.CharField(max_length=64)),
+                ('title', models.CharField(max_length=300)),
+                ('keywords', models.TextField(blank=True)),
+                ('description', models.TextField(blank=True)),
+                ('body', models.TextField(blank=True)),
+                ('url', models.CharField(blank=True, max_length=500)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Search Document',
+                'verbose_name_plural': 'Search Documents',
+                'abstract': False,
+                'indexes': [models.Index(condition=models.Q(('is_published', True)), fields=['publish_date', 'id'], name='core_searchdocument_pid'), models.Index(fields=['is_published', 'publish_date'], name='core_searchdocument_ipd')],
+                'constraints': [models.UniqueConstraint(fields=('content_type', 'object_id'), name='core_searchdocument_object_uniq')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
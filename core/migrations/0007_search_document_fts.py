@@ -0,0 +1,25 @@
+# Generated by Django 6.0.1 on 2026-10-18 08:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_search_documents'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocumentFTS',
+            fields=[
+                ('document', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='fts', serialize=False, to='core.searchdocument')),
+                ('table', models.TextField(db_column='core_searchdocument_fts')),
+            ],
+            options={
+                'db_table': 'core_searchdocument_fts',
+                'managed': False,
+            },
+        ),
+    ]
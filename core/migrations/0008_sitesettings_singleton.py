@@ -0,0 +1,29 @@
+# Generated by Django 6.0.1 on 2026-10-18 08:16
+
+from django.db import migrations, models
+
+
+def move_settings_to_singleton_pk(apps, schema_editor):
+    # load() used to read the lowest pk, so that row is the live one
+    SiteSettings = apps.get_model('core', 'SiteSettings')
+    live = SiteSettings.objects.order_by('pk').values_list('pk', flat=True).first()
+    if live is None:
+        return
+    SiteSettings.objects.exclude(pk=live).delete()
+    if live != 1:
+        SiteSettings.objects.filter(pk=live).update(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_search_document_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_settings_to_singleton_pk, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='sitesettings',
+            constraint=models.CheckConstraint(condition=models.Q(('pk', 1)), name='core_sitesettings_singleton'),
+        ),
+    ]
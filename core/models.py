@@ -1,8 +1,10 @@
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models.functions import Now
+from django.utils import timezone
 from django.utils.text import slugify
 from django_summernote.fields import SummernoteTextField
-from PIL import Image
-import os
 
 
 class TimeStampedModel(models.Model):
@@ -14,6 +16,14 @@ class TimeStampedModel(models.Model):
 
     class Meta:
         abstract = True
+        # Keyset pagination range index (core.pagination). Index names are
+        # limited to 30 characters (models.E034), so the app label and model
+        # name of a subclass may use 25 between them. Subclasses that also
+        # inherit PublishableModel must combine both bases' indexes in their
+        # Meta (core.W001, see the README).
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='%(app_label)s_%(class)s_cid'),
+        ]
 
 
 class SEOModel(models.Model):
@@ -28,6 +38,40 @@ class SEOModel(models.Model):
         abstract = True
 
 
+class PublishableQuerySet(models.QuerySet):
+    """
+    QuerySet for PublishableModel subclasses
+    """
+
+    def published(self, now=None):
+        """
+        Rows that are live: published, with no publish date or one in the past.
+
+        Without ``now`` the database clock is used when the query runs, so a
+        queryset built once (e.g. at import time) never goes stale.
+        """
+        now = now or Now()
+        return self.filter(models.Q(publish_date__isnull=True) | models.Q(publish_date__lte=now), is_published=True)
+
+    def scheduled(self, now=None):
+        """
+        Rows that are published but wait for a future publish date
+        """
+        return self.filter(is_published=True, publish_date__gt=now or Now())
+
+    def next_publish_date(self, now=None):
+        """
+        Return when the next scheduled row goes live, or None
+        """
+        return self.scheduled(now).order_by('publish_date').values_list('publish_date', flat=True).first()
+
+    async def anext_publish_date(self, now=None):
+        return await self.scheduled(now).order_by('publish_date').values_list('publish_date', flat=True).afirst()
+
+
+PublishableManager = models.Manager.from_queryset(PublishableQuerySet)
+
+
 class PublishableModel(models.Model):
     """
     Abstract model to add publishing functionality
@@ -35,8 +79,21 @@ class PublishableModel(models.Model):
     is_published = models.BooleanField(default=True, help_text="Whether this content is published")
     publish_date = models.DateTimeField(null=True, blank=True, help_text="Date to publish this content")
 
+    objects = PublishableManager()
+
     class Meta:
         abstract = True
+        # Names are limited like TimeStampedModel's
+        indexes = [
+            # Live and scheduled rows (published(), scheduled(), keyset
+            # pagination over publish_date); drafts are left out
+            models.Index(
+                fields=['publish_date', 'id'],
+                condition=models.Q(is_published=True),
+                name='%(app_label)s_%(class)s_pid',
+            ),
+            models.Index(fields=['is_published', 'publish_date'], name='%(app_label)s_%(class)s_ipd'),
+        ]
 
 
 class SiteSettings(models.Model):
@@ -79,9 +136,37 @@ class SiteSettings(models.Model):
     def __str__(self):
         return f"{self.university_name} Settings"
 
+    # The one settings row always has this primary key
+    SINGLETON_PK = 1
+
+    def save(self, *args, **kwargs):
+        if self.pk is None:
+            # Insert rather than update, so a second instance fails loudly
+            # instead of overwriting the existing row
+            self.pk = self.SINGLETON_PK
+            kwargs['force_insert'] = True
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def load(cls):
+        """
+        Return the settings row, creating it with defaults if needed.
+        Use core.cache.get_site_settings() on hot paths instead.
+        """
+        obj, _ = cls.objects.get_or_create(pk=cls.SINGLETON_PK)
+        return obj
+
+    @classmethod
+    async def aload(cls):
+        obj, _ = await cls.objects.aget_or_create(pk=cls.SINGLETON_PK)
+        return obj
+
     class Meta:
         verbose_name = "Site Setting"
         verbose_name_plural = "Site Settings"
+        constraints = [
+            models.CheckConstraint(condition=models.Q(pk=1), name='%(app_label)s_%(class)s_singleton'),
+        ]
 
 
 class PageHero(models.Model):
@@ -129,6 +214,46 @@ class PageHero(models.Model):
     # Status
     is_active = models.BooleanField(default=True, help_text="Whether this hero is active")
 
+    # Background image processing state
+    IMAGE_PENDING = 'pending'
+    IMAGE_PROCESSING = 'processing'
+    IMAGE_DONE = 'done'
+    IMAGE_FAILED = 'failed'
+    IMAGE_STATUS_CHOICES = [
+        (IMAGE_PENDING, 'Pending'),
+        (IMAGE_PROCESSING, 'Processing'),
+        (IMAGE_DONE, 'Processed'),
+        (IMAGE_FAILED, 'Failed'),
+    ]
+
+    image_status = models.CharField(
+        max_length=20,
+        choices=IMAGE_STATUS_CHOICES,
+        default=IMAGE_PENDING,
+        editable=False,
+        help_text="Status of background image optimization"
+    )
+    image_processed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    image_error = models.TextField(blank=True, editable=False)
+
+    # Content hash of the processed source and fingerprint of the processing
+    # parameters; processing is skipped when neither changed
+    image_hash = models.CharField(max_length=64, blank=True, editable=False)
+    image_fingerprint = models.CharField(max_length=64, blank=True, editable=False)
+
+    # Copy of background_image fitted to 1920x600; the upload itself is never re-encoded
+    optimized_image = models.ImageField(upload_to='heroes/optimized/', blank=True, editable=False)
+
+    # Layout metadata of optimized_image, so clients never need the image to lay out the page
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    dominant_color = models.CharField(max_length=7, blank=True, editable=False, help_text="Hex colour, e.g. #1a2a4e")
+    placeholder = models.TextField(blank=True, editable=False, help_text="Tiny blurred preview as a data URI")
+
+    # Responsive renditions generated by the worker, e.g.
+    # [{"width": 480, "height": 150, "type": "image/webp", "name": "heroes/renditions/..."}]
+    renditions = models.JSONField(default=list, blank=True, editable=False)
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -136,23 +261,132 @@ class PageHero(models.Model):
     def __str__(self):
         return f"{self.get_page_identifier_display()} Hero"
 
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored image so saves that do not replace it are not reprocessed
+        instance._loaded_image_name = instance.__dict__.get('background_image')
+        return instance
 
-        # Optimize the image after saving
-        if self.background_image:
-            img_path = self.background_image.path
-            if os.path.exists(img_path):
-                img = Image.open(img_path)
+    def image_needs_processing(self):
+        if not self.background_image:
+            return False
+        loaded_name = getattr(self, '_loaded_image_name', None)
+        return self.background_image.name != loaded_name or not self.image_hash
 
-                # Resize if too large (max 1920x600 for hero images)
-                if img.width > 1920 or img.height > 600:
-                    img.thumbnail((1920, 600), Image.Resampling.LANCZOS)
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        process_image = (
+            (update_fields is None or 'background_image' in update_fields)
+            and self.image_needs_processing()
+        )
+        if process_image:
+            self.image_status = self.IMAGE_PENDING
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'image_status'}
+
+        super().save(*args, **kwargs)
+        self._loaded_image_name = self.background_image.name
 
-                # Save the optimized image
-                img.save(img_path, optimize=True, quality=85)
+        # Image optimization runs in the background worker, see core/images.py
+        if process_image:
+            from .jobs import enqueue
+            enqueue('core.images.process_page_hero_image', self.pk)
 
     class Meta:
         verbose_name = "Page Hero"
         verbose_name_plural = "Page Heroes"
         ordering = ['page_identifier']
+
+
+class BackgroundJob(models.Model):
+    """
+    Model for tasks queued for the background worker (see core/jobs.py)
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    task = models.CharField(max_length=200, help_text="Dotted path of the task function")
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now, help_text="Do not run before this time")
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.task} ({self.get_status_display()})"
+
+    class Meta:
+        verbose_name = "Background Job"
+        verbose_name_plural = "Background Jobs"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='core_job_status_run_after_idx'),
+        ]
+
+
+class SearchDocument(PublishableModel):
+    """
+    Search index entry for one instance of a searchable model (see core/search.py)
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.CharField(max_length=64)
+
+    # Weighted inputs, from most to least important
+    title = models.CharField(max_length=300)
+    keywords = models.TextField(blank=True)
+    description = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+
+    url = models.CharField(max_length=500, blank=True)
+
+    # Weighted tsvector of the text fields on PostgreSQL (GIN indexed). SQLite
+    # leaves it empty and indexes the text in the core_searchdocument_fts FTS5
+    # table instead, which triggers keep in sync. The field is declared on
+    # every backend so the migrations are the same; its module does not
+    # import psycopg, and other databases accept the "tsvector" column type.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.title
+
+    class Meta(PublishableModel.Meta):
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+        constraints = [
+            models.UniqueConstraint(fields=['content_type', 'object_id'], name='core_searchdocument_object_uniq'),
+        ]
+
+
+class SearchDocumentFTS(models.Model):
+    """
+    Read-only mapping of the SQLite FTS5 table over SearchDocument (created
+    by migration 0006, absent on other databases), so searches can join it in
+    """
+    document = models.OneToOneField(
+        SearchDocument, primary_key=True, db_column='rowid', related_name='fts', on_delete=models.DO_NOTHING,
+    )
+    # FTS5's hidden column named after the table: the left side of MATCH and
+    # the first argument of bm25()
+    table = models.TextField(db_column='core_searchdocument_fts')
+
+    class Meta:
+        managed = False
+        db_table = 'core_searchdocument_fts'
@@ -0,0 +1,105 @@
+"""
+Prebuilt OpenAPI schema, served as a static file.
+
+Generating the schema introspects every view and serializer, so it is not
+done per request. OpenAPISchemaFinder builds it while collectstatic runs, and
+the file then ships like any other static asset:
+
+    openapi/schema.json
+
+nginx serves it from STATIC_ROOT with an ETag, under both its plain name and
+the content-hashed one from the manifest, with the usual ``.gz``/``.br``
+variants. The Swagger UI at /api/docs/ loads the hashed name.
+``python manage.py build_openapi_schema`` rebuilds it without collectstatic,
+e.g. to check the schema in CI.
+"""
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import BaseFinder
+from django.core.files.storage import FileSystemStorage
+from django.templatetags.static import static
+from django.urls import include, path
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.views import SpectacularSwaggerView
+
+from .renderers import dumps
+
+
+SCHEMA_NAME = 'openapi/schema.json'
+
+
+def generate_schema():
+    """
+    Return the OpenAPI schema of the API as a dict
+    """
+    from . import views
+    from .api_urls import api_patterns
+
+    # Always documents the DRF views: the ASGI-native ones in async_views
+    # answer the same way but cannot be introspected
+    patterns = [path('api/v1/', include(api_patterns(views)))]
+    return SchemaGenerator(patterns=patterns).get_schema(request=None, public=True)
+
+
+def build_schema(root=None):
+    """
+    Write the schema to SCHEMA_NAME under ``root`` (default
+    OPENAPI_SCHEMA_ROOT). Returns the path and whether the file changed.
+
+    An unchanged schema is not rewritten, so its modification time, and the
+    ETag nginx derives from it, stay the same across deploys.
+    """
+    full_path = Path(root or settings.OPENAPI_SCHEMA_ROOT) / SCHEMA_NAME
+    content = dumps(generate_schema())
+    try:
+        if full_path.read_bytes() == content:
+            return full_path, False
+    except FileNotFoundError:
+        pass
+
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = full_path.with_name(full_path.name + '.tmp')
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, full_path)
+    return full_path, True
+
+
+class OpenAPISchemaFinder(BaseFinder):
+    """
+    Staticfiles finder for the prebuilt schema.
+
+    collectstatic lists every finder's files, so it rebuilds the schema on
+    each run and a deploy always ships the schema of the code deployed.
+    ``find()`` (the development static view, findstatic) only builds a
+    missing file.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.storage = FileSystemStorage(location=str(settings.OPENAPI_SCHEMA_ROOT))
+
+    def check(self, **kwargs):
+        return []
+
+    def find(self, path, find_all=False):
+        if path != SCHEMA_NAME:
+            return []
+        if not self.storage.exists(path):
+            build_schema()
+        full_path = self.storage.path(path)
+        return [full_path] if find_all else full_path
+
+    def list(self, ignore_patterns):
+        build_schema()
+        yield SCHEMA_NAME, self.storage
+
+
+class SchemaSwaggerView(SpectacularSwaggerView):
+    """
+    Swagger UI loading the prebuilt static schema
+    """
+
+    def _get_schema_url(self, request):
+        return static(SCHEMA_NAME)
@@ -0,0 +1,330 @@
+"""
+Pagination for list endpoints: keyset (cursor) pagination by default,
+page numbers for ranked results
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# Tried in order when neither the view nor the paginator names a sort field
+DEFAULT_KEYSET_FIELDS = ('publish_date', 'created_at')
+
+
+def estimate_count(queryset, limit):
+    """
+    Return ``(count, is_estimate)`` for ``queryset`` without a full COUNT(*).
+
+    PostgreSQL reports the planner's row estimate for the query. Other
+    databases count at most ``limit`` rows.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows']), True
+
+    count = queryset.order_by()[:limit + 1].count()
+    return min(count, limit), count > limit
+
+
+class PageSizeMixin:
+    """
+    ``?page_size=`` support, capped at ``max_page_size``
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query_params[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size,
+                )
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+
+class KeysetPagination(PageSizeMixin, BasePagination):
+    """
+    Paginate by the position of the last row seen instead of by OFFSET.
+
+    Rows are ordered by ``(field, pk)``, newest first, and the opaque
+    ``cursor`` query parameter holds the sort value and primary key of the
+    row at the edge of the current page. The next page is then a
+    ``WHERE (field, pk) < (value, pk)`` range read from a composite index
+    on ``(field, id)`` (see ``TimeStampedModel`` and ``PublishableModel``),
+    so deep pages cost the same as the first one and no COUNT(*) runs.
+
+    The sort field comes from the view's ``keyset_field`` attribute, or the
+    first of ``publish_date``/``created_at`` the model has. NULLs sort as if
+    they were larger than any value, which matches PostgreSQL's default
+    index order. Clients that need a total ask for it with ``?count=approximate``.
+    """
+
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    count_query_value = 'approximate'
+    # Row limit for the approximate count on databases without planner estimates
+    approximate_count_limit = 10000
+    keyset_field = None
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.field = self.get_keyset_field(queryset, view)
+        self.count = None
+        if request.query_params.get(self.count_query_param) == self.count_query_value:
+            self.count, self.count_is_estimate = estimate_count(queryset, self.approximate_count_limit)
+
+        cursor = self.decode_cursor(request, queryset.model)
+        reverse = cursor is not None and cursor[2]
+        if cursor is not None:
+            queryset = queryset.filter(self._after(cursor[0], cursor[1], descending=not reverse))
+        queryset = queryset.order_by(*self._ordering(descending=not reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Paging back from a cursor always leaves a next page, and vice versa
+        self.has_next = has_more if not reverse else cursor is not None
+        self.has_previous = cursor is not None if not reverse else has_more
+        self.first = rows[0] if rows else None
+        self.last = rows[-1] if rows else None
+        return rows
+
+    def get_keyset_field(self, queryset, view):
+        field = getattr(view, 'keyset_field', None) or self.keyset_field
+        if field:
+            return field
+        names = {f.name for f in queryset.model._meta.concrete_fields}
+        for field in DEFAULT_KEYSET_FIELDS:
+            if field in names:
+                return field
+        return 'pk'
+
+    def _ordering(self, descending):
+        if self.field == 'pk':
+            return ['-pk' if descending else 'pk']
+        if descending:
+            return [F(self.field).desc(nulls_first=True), '-pk']
+        return [F(self.field).asc(nulls_last=True), 'pk']
+
+    def _after(self, value, pk, descending):
+        """
+        Return the filter for rows that come after ``(value, pk)``
+        """
+        if self.field == 'pk':
+            return Q(pk__lt=pk) if descending else Q(pk__gt=pk)
+
+        field = self.field
+        if descending:
+            if value is None:
+                return Q(**{f'{field}__isnull': True, 'pk__lt': pk}) | Q(**{f'{field}__isnull': False})
+            return Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': pk})
+
+        if value is None:
+            return Q(**{f'{field}__isnull': True, 'pk__gt': pk})
+        return (
+            Q(**{f'{field}__gt': value})
+            | Q(**{field: value, 'pk__gt': pk})
+            | Q(**{f'{field}__isnull': True})
+        )
+
+    def _position(self, row):
+        if isinstance(row, dict):
+            pk = row.get('pk', row.get('id'))
+            value = row.get(self.field) if self.field != 'pk' else pk
+        else:
+            pk = row.pk
+            value = getattr(row, self.field) if self.field != 'pk' else pk
+        return value, pk
+
+    def encode_cursor(self, row, reverse):
+        value, pk = self._position(row)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        raw = json.dumps([value, pk, int(reverse)], separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request, model):
+        """
+        Return ``(value, pk, reverse)`` from the request, or None on the first page
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            value, pk, reverse = json.loads(raw)
+            pk = model._meta.pk.to_python(pk)
+            if self.field != 'pk' and value is not None:
+                value = model._meta.get_field(self.field).to_python(value)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk, bool(reverse)
+
+    def get_next_link(self):
+        if not self.has_next or self.last is None:
+            return None
+        return self.encode_cursor(self.last, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first is None:
+            # Paged past the end: go back to the start
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.first, reverse=True)
+
+    def get_paginated_response(self, data):
+        payload = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+        ])
+        if self.count is not None:
+            payload['count'] = self.count
+            payload['count_is_estimate'] = self.count_is_estimate
+        payload['results'] = data
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {
+                    'type': 'integer',
+                    'description': f'Only with ?{self.count_query_param}={self.count_query_value}',
+                },
+                'count_is_estimate': {'type': 'boolean'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.count_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Set to "approximate" to include an estimated total.',
+                'schema': {'type': 'string', 'enum': [self.count_query_value]},
+            },
+        ]
+
+
+class RankedPagination(PageSizeMixin, BasePagination):
+    """
+    Page-number pagination for relevance-ranked results such as search.
+
+    Ranks are computed per query, so there is no stored key to page by and
+    pages use OFFSET. No COUNT(*) runs: one extra row is fetched to tell
+    whether another page follows. Clients rarely go past the first few
+    pages of search results, so depth is capped at ``max_page``.
+    """
+
+    page_query_param = 'page'
+    max_page = 50
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        try:
+            self.page = _positive_int(request.query_params.get(self.page_query_param, 1), strict=True)
+        except ValueError:
+            raise NotFound('Invalid page')
+        if self.page > self.max_page:
+            raise NotFound(f'Results are limited to {self.max_page} pages')
+
+        offset = (self.page - 1) * self.page_size
+        rows = list(queryset[offset:offset + self.page_size + 1])
+        self.has_next = len(rows) > self.page_size and self.page < self.max_page
+        return rows[:self.page_size]
+
+    def page_link(self, page):
+        if page == 1:
+            return remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(self.base_url, self.page_query_param, page)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.page_link(self.page + 1) if self.has_next else None),
+            ('previous', self.page_link(self.page - 1) if self.page > 1 else None),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.page_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Page number, up to {self.max_page}.',
+                'schema': {'type': 'integer'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
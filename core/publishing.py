@@ -0,0 +1,69 @@
+"""
+Scheduled publishing for PublishableModel subclasses.
+
+A row with a future ``publish_date`` goes live without anything being written
+to the database. Cached responses for publishable models already expire at
+the next publish date (see ``core.cache.next_publish_date``). In addition,
+the scheduler queues a background job for each upcoming publish date that
+bumps the model's cache version when it fires, so everything keyed on that
+version turns over as the row goes live, even entries cached without a
+timeout.
+"""
+import logging
+
+from django.apps import apps
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .cache import bump_model_version
+from .jobs import enqueue
+from .models import BackgroundJob, PublishableModel
+
+
+logger = logging.getLogger(__name__)
+
+GO_LIVE_TASK = 'core.publishing.go_live'
+
+
+def publishable_models():
+    return [model for model in apps.get_models() if issubclass(model, PublishableModel)]
+
+
+def schedule_next_publish(model):
+    """
+    Queue a go_live job for the next scheduled row of ``model``.
+
+    Returns the publish date, or None when nothing is scheduled. A job that
+    is already pending for the same model and date is not queued twice.
+    """
+    publish_date = model._default_manager.next_publish_date()
+    if publish_date is None:
+        return None
+
+    args = [model._meta.label, publish_date.isoformat()]
+    pending = BackgroundJob.objects.filter(task=GO_LIVE_TASK, status=BackgroundJob.STATUS_PENDING)
+    if args not in pending.values_list('args', flat=True):
+        enqueue(GO_LIVE_TASK, *args, delay=max(0, (publish_date - timezone.now()).total_seconds()))
+    return publish_date
+
+
+def schedule_all():
+    """
+    Schedule every publishable model, e.g. when a worker starts
+    """
+    return {model._meta.label: schedule_next_publish(model) for model in publishable_models()}
+
+
+def go_live(model_label, publish_date):
+    """
+    Background job: invalidate ``model_label``'s caches at ``publish_date``
+    and schedule the following publish date
+    """
+    if timezone.now() < parse_datetime(publish_date):
+        # Run early by BACKGROUND_JOBS_EAGER; cached responses still expire
+        # on time through their timeouts
+        return
+    model = apps.get_model(model_label)
+    bump_model_version(model)
+    logger.info('Scheduled %s content went live at %s', model_label, publish_date)
+    schedule_next_publish(model)
@@ -0,0 +1,100 @@
+"""
+orjson-backed JSON renderer and parser for DRF.
+
+orjson serializes dicts, lists, strings, numbers, datetimes and UUIDs in C,
+several times faster than the stdlib ``json`` module behind DRF's
+JSONRenderer. Values it does not know (Decimals, lazy translation strings,
+querysets, ...) go through DRF's JSONEncoder, so the output is the same JSON
+apart from datetimes that reach the renderer unserialized: orjson keeps
+their microseconds, DRF cuts them to milliseconds. Without orjson installed
+both classes behave exactly like their DRF parents.
+
+Select them in REST_FRAMEWORK (config/settings/base.py):
+
+    'DEFAULT_RENDERER_CLASSES': ['core.renderers.ORJSONRenderer', ...],
+    'DEFAULT_PARSER_CLASSES': ['core.renderers.ORJSONParser', ...],
+"""
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; DRF's stdlib renderer and parser are used without it
+    orjson = None
+
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    return _encoder.default(obj)
+
+
+def dumps(data, sort_keys=False):
+    """
+    Compact UTF-8 JSON bytes for ``data``, with orjson when it is installed
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(data, default=_default, option=option)
+        except orjson.JSONEncodeError:
+            # e.g. integers beyond 64 bits; the stdlib handles them
+            pass
+    return json.dumps(
+        data, cls=JSONEncoder, sort_keys=sort_keys, separators=(',', ':'), ensure_ascii=False,
+    ).encode('utf-8')
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer using orjson for compact UTF-8 output.
+
+    Requests for indented output (``Accept: application/json; indent=4``)
+    and settings that orjson cannot honour (``UNICODE_JSON``/``COMPACT_JSON``
+    off) use DRF's renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (
+            orjson is None
+            or not api_settings.UNICODE_JSON
+            or not api_settings.COMPACT_JSON
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser using orjson
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            content = stream.read() if stream is not None else b''
+            if codecs.lookup(encoding).name != 'utf-8':
+                content = content.decode(encoding).encode('utf-8')
+            return orjson.loads(content)
+        except (ValueError, LookupError) as exc:
+            # orjson.JSONDecodeError and UnicodeDecodeError are ValueErrors
+            raise ParseError(f'JSON parse error - {exc}')
@@ -0,0 +1,248 @@
+"""
+Full-text search across content models.
+
+Every instance of a registered model has one SearchDocument row holding its
+SEO fields and body text, refreshed on save and removed on delete. The
+full-text index depends on the database (see migration 0006):
+
+- PostgreSQL: ``search_vector`` is a weighted tsvector (meta_title A,
+  meta_keywords B, meta_description C, body D) updated in the same save,
+  with a GIN index; queries use ``websearch_to_tsquery`` and ``ts_rank``.
+- SQLite (development and tests): an external-content FTS5 table that
+  triggers keep in sync; queries use ``MATCH`` and ``bm25()`` with matching
+  column weights.
+
+Register models from signals.py, like register_cached_model():
+
+    register_search_model(NewsArticle, body_fields=['summary', 'content'])
+"""
+import re
+from collections import defaultdict
+from functools import reduce
+from operator import add
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, FloatField, Func, Lookup, Q, Value
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .cache import bump_model_version
+from .models import PublishableModel, SearchDocument, SearchDocumentFTS
+
+
+# SearchDocument field, PostgreSQL weight and FTS5 bm25() weight
+WEIGHTS = (
+    ('title', 'A', 10.0),
+    ('keywords', 'B', 4.0),
+    ('description', 'C', 2.0),
+    ('body', 'D', 1.0),
+)
+TEXT_FIELDS = [field for field, _, _ in WEIGHTS]
+DOCUMENT_FIELDS = TEXT_FIELDS + ['url', 'is_published', 'publish_date', 'updated_at']
+
+_search_models = {}
+
+
+class SearchConfig:
+    """
+    How instances of a model become SearchDocuments.
+
+    The SEOModel fields are the weighted inputs; models without them (or
+    with them left blank) fall back to ``title_field``/``str()`` for the
+    title. ``body_fields`` are joined as the lowest-weighted text, with HTML
+    stripped. ``url`` is a callable returning the public URL of an instance,
+    defaulting to ``get_absolute_url()`` when the model has one.
+    """
+
+    def __init__(self, model, body_fields=(), title_field=None, url=None):
+        self.model = model
+        self.body_fields = tuple(body_fields)
+        self.title_field = title_field
+        self.url = url
+
+    def get_title(self, instance):
+        title = getattr(instance, 'meta_title', '')
+        if not title and self.title_field:
+            title = getattr(instance, self.title_field)
+        return str(title or instance)[:300]
+
+    def get_url(self, instance):
+        if self.url is not None:
+            return self.url(instance) or ''
+        if hasattr(instance, 'get_absolute_url'):
+            return instance.get_absolute_url()
+        return ''
+
+    def document(self, instance):
+        """
+        Return an unsaved SearchDocument for ``instance``
+        """
+        body = ' '.join(strip_tags(str(getattr(instance, field) or '')) for field in self.body_fields)
+        is_publishable = isinstance(instance, PublishableModel)
+        return SearchDocument(
+            content_type=ContentType.objects.get_for_model(self.model),
+            object_id=str(instance.pk),
+            title=self.get_title(instance),
+            keywords=getattr(instance, 'meta_keywords', ''),
+            description=getattr(instance, 'meta_description', ''),
+            body=body,
+            url=self.get_url(instance)[:500],
+            is_published=instance.is_published if is_publishable else True,
+            publish_date=instance.publish_date if is_publishable else None,
+        )
+
+
+def search_vector():
+    """
+    Weighted tsvector expression over the SearchDocument text fields
+    """
+    return reduce(add, [
+        SearchVector(field, weight=weight, config=settings.SEARCH_CONFIG)
+        for field, weight, _ in WEIGHTS
+    ])
+
+
+def save_documents(documents):
+    """
+    Insert or update SearchDocuments, matching on (content_type, object_id)
+    """
+    if not documents:
+        return
+    SearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=['content_type', 'object_id'],
+        update_fields=DOCUMENT_FIELDS,
+    )
+    if connection.vendor == 'postgresql':
+        # The vector is built from the stored columns, so it needs its own UPDATE
+        object_ids = defaultdict(list)
+        for document in documents:
+            object_ids[document.content_type_id].append(document.object_id)
+        for content_type_id, ids in object_ids.items():
+            SearchDocument.objects.filter(content_type_id=content_type_id, object_id__in=ids).update(
+                search_vector=search_vector(),
+            )
+    # Bulk writes send no post_save, so cached search responses are invalidated here
+    bump_model_version(SearchDocument)
+
+
+def index_object(sender, instance, **kwargs):
+    save_documents([_search_models[sender].document(instance)])
+
+
+def remove_object(sender, instance, **kwargs):
+    SearchDocument.objects.filter(
+        content_type=ContentType.objects.get_for_model(sender),
+        object_id=str(instance.pk),
+    ).delete()
+
+
+def register_search_model(model, body_fields=(), title_field=None, url=None):
+    """
+    Keep SearchDocuments of ``model`` in sync on save and delete.
+
+    Call this from an AppConfig.ready() (signals.py) so that every process
+    that writes the model updates the index. See SearchConfig for the
+    arguments.
+    """
+    if model in _search_models:
+        return
+    _search_models[model] = SearchConfig(model, body_fields, title_field, url)
+    uid = f'search:{model._meta.label_lower}'
+    post_save.connect(index_object, sender=model, dispatch_uid=uid)
+    post_delete.connect(remove_object, sender=model, dispatch_uid=uid)
+
+
+def search_models():
+    return list(_search_models)
+
+
+def rebuild_index(models=None, batch_size=1000):
+    """
+    Re-index every instance of ``models`` (default: all registered ones) and
+    drop documents of instances that no longer exist. Returns the number of
+    documents written.
+    """
+    started = timezone.now()
+    count = 0
+    for model in models or search_models():
+        config = _search_models[model]
+        batch = []
+        for instance in model._default_manager.order_by('pk').iterator(chunk_size=batch_size):
+            batch.append(config.document(instance))
+            if len(batch) >= batch_size:
+                save_documents(batch)
+                count += len(batch)
+                batch = []
+        save_documents(batch)
+        count += len(batch)
+        # Every current instance was just saved, so older documents are orphans
+        SearchDocument.objects.filter(
+            content_type=ContentType.objects.get_for_model(model), updated_at__lt=started,
+        ).delete()
+    return count
+
+
+class FTSMatch(Lookup):
+    """
+    ``fts__table__match=query``: the FTS5 MATCH operator
+    """
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+SearchDocumentFTS._meta.get_field('table').register_lookup(FTSMatch)
+
+
+def fts_query(query):
+    """
+    Turn free text into an FTS5 query matching all of its words
+    """
+    return ' '.join(f'"{word}"' for word in re.findall(r'\w+', query))
+
+
+def search(query, models=None):
+    """
+    Return published SearchDocuments matching ``query``, best first.
+
+    Each document has a ``rank`` (higher is better). ``models`` limits the
+    results to documents of those models.
+    """
+    documents = SearchDocument.objects.published().defer('body', 'search_vector')
+    if models:
+        documents = documents.filter(content_type__in=ContentType.objects.get_for_models(*models).values())
+
+    if connection.vendor == 'postgresql':
+        search_query = SearchQuery(query, search_type='websearch', config=settings.SEARCH_CONFIG)
+        return (
+            documents.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', '-pk')
+        )
+
+    if connection.vendor == 'sqlite':
+        match = fts_query(query)
+        if not match:
+            return documents.none()
+        # bm25() is lower for better matches and only exists in a MATCH
+        # query, so the FTS table is joined in rather than subqueried
+        rank = Func(
+            F('fts__table'), *(Value(weight) for _, _, weight in WEIGHTS),
+            function='bm25', template='-%(function)s(%(expressions)s)', output_field=FloatField(),
+        )
+        return documents.filter(fts__table__match=match).annotate(rank=rank).order_by('-rank', '-pk')
+
+    # Other databases: unranked substring matching
+    lookup = Q()
+    for field in TEXT_FIELDS:
+        lookup |= Q(**{f'{field}__icontains': query})
+    return documents.filter(lookup).annotate(rank=Value(0.0)).order_by('-pk')
@@ -0,0 +1,144 @@
+"""
+Synthetic data for load testing, used by `seed_data --scale` and `--images`
+"""
+import io
+import itertools
+import random
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import IntegerField, Max
+from django.db.models.functions import Cast, Substr
+from django.utils import timezone
+from PIL import Image, ImageDraw
+from rest_framework.authtoken.models import Token
+
+
+LOADTEST_USER_PREFIX = 'loadtest-'
+
+PLACEHOLDER_IMAGE_SIZE = (1920, 600)
+
+FIRST_NAMES = [
+    'Amina', 'Brian', 'Cynthia', 'David', 'Esther', 'Faith', 'George', 'Halima',
+    'Ian', 'Joyce', 'Kevin', 'Lilian', 'Mercy', 'Njeri', 'Otieno', 'Peter',
+    'Wanjiru', 'Samuel', 'Tabitha', 'Victor',
+]
+LAST_NAMES = [
+    'Achieng', 'Barasa', 'Chebet', 'Kamau', 'Kariuki', 'Kiprop', 'Mutua',
+    'Mwangi', 'Njoroge', 'Ochieng', 'Odhiambo', 'Omondi', 'Wafula', 'Wambui',
+]
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def next_user_number():
+    """
+    Return the number after the highest load-test username suffix. Counting
+    the users instead would reuse a taken number once any has been deleted.
+    """
+    numbered = get_user_model().objects.filter(username__regex=rf'^{re.escape(LOADTEST_USER_PREFIX)}[0-9]+$')
+    suffix = Cast(Substr('username', len(LOADTEST_USER_PREFIX) + 1), IntegerField())
+    highest = numbered.aggregate(highest=Max(suffix))['highest']
+    return 0 if highest is None else highest + 1
+
+
+def generate_users(count, batch_size=5000, progress=None, seed=0):
+    """
+    Create ``count`` API users with tokens using bulk_create in batches of
+    ``batch_size``. Users are numbered after the existing load-test users, so
+    repeated runs add more. ``progress(created, count)`` is called per batch.
+    """
+    User = get_user_model()
+    rng = random.Random(seed)
+    start = next_user_number()
+    # Hashing is deliberately slow; every load-test user shares one hash
+    password = make_password('loadtest')
+    now = timezone.now()
+
+    def build(n):
+        first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        username = f'{LOADTEST_USER_PREFIX}{n}'
+        return User(
+            username=username,
+            first_name=first_name,
+            last_name=last_name,
+            email=f'{first_name}.{last_name}.{n}@example.org'.lower(),
+            password=password,
+            date_joined=now - timedelta(minutes=rng.randrange(2 * 365 * 24 * 60)),
+        )
+
+    created = 0
+    for batch in batched(range(start, start + count), batch_size):
+        users = User.objects.bulk_create([build(n) for n in batch])
+        if any(user.pk is None for user in users):
+            # Backends that cannot return ids from a bulk insert
+            ids = dict(User.objects.filter(username__in=[user.username for user in users]).values_list('username', 'pk'))
+            for user in users:
+                user.pk = ids[user.username]
+        Token.objects.bulk_create([Token(key=Token.generate_key(), user_id=user.pk) for user in users])
+        created += len(users)
+        if progress:
+            progress(created, count)
+    return created
+
+
+def placeholder_image(label, seed, size=PLACEHOLDER_IMAGE_SIZE, quality=85):
+    """
+    Return JPEG bytes of a noisy gradient with ``label``, similar in size and
+    compressibility to a photo. Module-level so it can run in a process pool.
+    """
+    rng = random.Random(seed)
+    width, height = size
+    start = [rng.randrange(256) for _ in range(3)]
+    end = [rng.randrange(256) for _ in range(3)]
+    gradient = Image.linear_gradient('L').rotate(90).resize(size)
+    image = Image.composite(Image.new('RGB', size, tuple(end)), Image.new('RGB', size, tuple(start)), gradient)
+    noise = Image.effect_noise(size, 48).convert('RGB')
+    image = Image.blend(image, noise, 0.25)
+    ImageDraw.Draw(image).text((width // 20, height // 2), label, fill=(255, 255, 255))
+
+    output = io.BytesIO()
+    image.save(output, 'JPEG', quality=quality)
+    return output.getvalue()
+
+
+def generate_placeholder_images(names, labels, workers=None, progress=None):
+    """
+    Render one placeholder JPEG per storage name in a process pool and save it
+    to default storage. Returns the names the storage actually used.
+    """
+    saved = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Rendering runs in the workers; storage writes stay in this process
+        images = executor.map(placeholder_image, labels, range(len(names)), chunksize=8)
+        for name, data in zip(names, images):
+            saved.append(default_storage.save(name, ContentFile(data)))
+            if progress:
+                progress(len(saved), len(names))
+    return saved
+
+
+def generate_hero_images(heroes, workers=None, progress=None):
+    """
+    Attach placeholder background images to ``heroes``. Saving each hero
+    queues its image processing job.
+    """
+    heroes = list(heroes)
+    names = generate_placeholder_images(
+        [f'heroes/placeholder-{hero.page_identifier}.jpg' for hero in heroes],
+        [hero.get_page_identifier_display() for hero in heroes],
+        workers=workers,
+        progress=progress,
+    )
+    for hero, name in zip(heroes, names):
+        hero.background_image.name = name
+        hero.save()
@@ -1,30 +1,388 @@
-from rest_framework import serializers
-from .models import PageHero
+from functools import lru_cache
 
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.utils import timezone
+from django.utils.encoding import filepath_to_uri
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import PKOnlyObject
+from rest_framework.settings import api_settings
+from .instrumentation import TimedSerializerMixin
+from .models import PageHero, SearchDocument, SiteSettings
 
-class PageHeroSerializer(serializers.ModelSerializer):
+
+def absolute_media_url(request, url):
+    """
+    Return an absolute URL for a media file URL
+    """
+    if request:
+        try:
+            return request.build_absolute_uri(url)
+        except Exception:
+            # Fallback if request host is not properly configured
+            return f"{settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'http://localhost:8000'}{url}"
+    # Fallback to MEDIA_URL if request is not available
+    return f"http://localhost:8000{url}"
+
+
+def media_base_url(request):
+    """
+    Absolute URL that media file names are appended to: MEDIA_BASE_URL when
+    configured (e.g. a CDN), otherwise MEDIA_URL on the request's host
+    """
+    if settings.MEDIA_BASE_URL:
+        return settings.MEDIA_BASE_URL
+    return absolute_media_url(request, settings.MEDIA_URL)
+
+
+# Hero image names repeat across requests; quoting them is a hot spot in lists
+@lru_cache(maxsize=4096)
+def _quoted_path(name):
+    return filepath_to_uri(name)
+
+
+# DRF fields whose to_representation() returns the model value as it is
+PLAIN_FIELDS = (
+    serializers.CharField, serializers.IntegerField, serializers.FloatField,
+    serializers.BooleanField, serializers.JSONField, serializers.ReadOnlyField,
+)
+
+# DRF fields that convert the model value with their to_representation()
+CONVERTED_FIELDS = (
+    serializers.DateTimeField, serializers.DateField, serializers.TimeField,
+    serializers.DecimalField, serializers.UUIDField, serializers.ChoiceField,
+)
+
+
+class FieldPlanMixin:
+    """
+    Fast read-only to_representation() for ModelSerializers.
+
+    The first call builds a plan for the class from its fields: plain values
+    (PLAIN_FIELDS) are copied, dates and similar fields keep their DRF
+    conversion, file fields become media URLs (see media_url()) and
+    SerializerMethodFields call their method. Only fields reading a single
+    attribute take these shortcuts; related fields, nested serializers,
+    dotted or ``'*'`` sources and any other field type are rendered by the
+    DRF field. Later calls follow the plan instead of binding and walking
+    DRF fields per object. Rows can be model instances or ``.values()``
+    dicts; method fields should read them with value().
+    """
+
+    def to_representation(self, instance):
+        is_row = isinstance(instance, dict)
+        ret = {}
+        for name, kind, source, convert in self.active_field_plan():
+            if kind == 'method':
+                ret[name] = getattr(self, source)(instance)
+                continue
+            if kind == 'field':
+                ret[name] = self.field_representation(self.fields[name], instance)
+                continue
+            value = instance.get(source) if is_row else getattr(instance, source)
+            if value is None:
+                ret[name] = None
+            elif kind == 'file':
+                ret[name] = self.media_url(value if is_row else value.name)
+            elif kind == 'datetime' and timezone.is_aware(value):
+                ret[name] = self.iso_datetime(value)
+            else:
+                ret[name] = convert(value) if convert else value
+        return ret
+
+    @staticmethod
+    def field_representation(field, instance):
+        """
+        What Serializer.to_representation() renders for one field
+        """
+        attribute = field.get_attribute(instance)
+        check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+        return None if check_for_none is None else field.to_representation(attribute)
+
+    def iso_datetime(self, value):
+        """
+        DateTimeField.to_representation() for aware values in ISO 8601, with
+        the current time zone looked up once per serializer
+        """
+        tz = self.__dict__.get('_timezone')
+        if tz is None:
+            tz = self._timezone = timezone.get_current_timezone()
+        value = value.astimezone(tz).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    def active_field_plan(self):
+        """
+        The part of the plan this serializer renders (see SparseFieldsMixin)
+        """
+        return self.field_plan()
+
+    @classmethod
+    def field_plan(cls):
+        plan = cls.__dict__.get('_field_plan')
+        if plan is None:
+            plan = []
+            for name, field in cls().fields.items():
+                if field.write_only:
+                    continue
+                if isinstance(field, serializers.SerializerMethodField):
+                    plan.append((name, 'method', field.method_name or f'get_{name}', None))
+                elif field.source == '*' or '.' in field.source:
+                    plan.append((name, 'field', field.source, None))
+                elif isinstance(field, serializers.FileField):
+                    plan.append((name, 'file', field.source, None))
+                elif isinstance(field, serializers.DateTimeField) and cls._is_plain_iso(field):
+                    plan.append((name, 'datetime', field.source, field.to_representation))
+                elif isinstance(field, CONVERTED_FIELDS):
+                    plan.append((name, 'value', field.source, field.to_representation))
+                elif isinstance(field, PLAIN_FIELDS) and not getattr(field, 'binary', False):
+                    plan.append((name, 'value', field.source, None))
+                else:
+                    plan.append((name, 'field', field.source, None))
+            cls._field_plan = plan
+        return plan
+
+    @staticmethod
+    def _is_plain_iso(field):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        return (
+            settings.USE_TZ
+            and isinstance(output_format, str)
+            and output_format.lower() == ISO_8601
+            and not hasattr(field, 'timezone')
+        )
+
+    def value(self, instance, name):
+        """
+        Field value of a model instance or ``.values()`` row; files as their name
+        """
+        if isinstance(instance, dict):
+            return instance.get(name)
+        value = getattr(instance, name)
+        return value.name if hasattr(value, 'name') and hasattr(value, 'storage') else value
+
+    def media_url(self, name):
+        """
+        Absolute URL of a file name in default storage
+        """
+        if not name:
+            return None
+        # Computed once per serializer, so once per list response
+        base = self.__dict__.get('_media_base_url')
+        if base is None:
+            if isinstance(default_storage, FileSystemStorage):
+                base = media_base_url(self.context.get('request'))
+            else:
+                # Remote storages build their own URLs
+                base = ''
+            self._media_base_url = base
+        if not base:
+            return absolute_media_url(self.context.get('request'), default_storage.url(name))
+        return base + _quoted_path(name)
+
+
+def _split_param(value):
+    return {name.strip() for name in value.split(',') if name.strip()} if value else set()
+
+
+class SparseFieldsMixin:
+    """
+    Sparse fieldsets: ``?fields=title,srcset`` renders only those fields and
+    ``?omit=created_at`` everything but those.
+
+    Unknown names are a 400. sparse_queryset() narrows the query to the
+    columns the selected fields read, with ``.only()``. Plain fields read
+    their ``source``; SerializerMethodFields must declare the model fields
+    they read in ``Meta.field_sources``, otherwise the full row is loaded:
+
+        class Meta:
+            field_sources = {'background_image_url': ['optimized_image', 'background_image']}
+
+    Put it before FieldPlanMixin in the bases so the field plan is filtered too.
+    """
+
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    @classmethod
+    def requested_fields(cls, request):
+        """
+        Names of the fields ``request`` asks for, in declaration order, or
+        None when it does not narrow them
+        """
+        params = getattr(request, 'query_params', None) or getattr(request, 'GET', {})
+        fields = _split_param(params.get(cls.fields_query_param))
+        omit = _split_param(params.get(cls.omit_query_param))
+        if not fields and not omit:
+            return None
+
+        available = cls.field_sources()
+        unknown = (fields | omit) - available.keys()
+        if unknown:
+            raise serializers.ValidationError({
+                'fields': f"Unknown field(s): {', '.join(sorted(unknown))}. Available: {', '.join(available)}",
+            })
+        return [name for name in available if (not fields or name in fields) and name not in omit]
+
+    @classmethod
+    def field_sources(cls):
+        """
+        Map each field name to the model fields it reads, or None if unknown
+        """
+        sources = cls.__dict__.get('_field_sources')
+        if sources is None:
+            declared = getattr(cls.Meta, 'field_sources', {})
+            model_fields = {field.name for field in cls.Meta.model._meta.concrete_fields}
+            sources = {}
+            for name, field in cls().fields.items():
+                if name in declared:
+                    sources[name] = list(declared[name])
+                elif field.source.split('.')[0] in model_fields:
+                    sources[name] = [field.source.split('.')[0]]
+                else:
+                    sources[name] = None
+            cls._field_sources = sources
+        return sources
+
+    @classmethod
+    def sparse_queryset(cls, queryset, request, required=()):
+        """
+        Defer the columns none of the requested fields read. ``required``
+        model fields are loaded either way, e.g. for conditional_model_view().
+        """
+        names = cls.requested_fields(request)
+        if names is None:
+            return queryset
+        sources = cls.field_sources()
+        columns = list(required)
+        for name in names:
+            if sources[name] is None:
+                return queryset
+            columns.extend(sources[name])
+        return queryset.only(*columns)
+
+    def _requested(self):
+        if '_requested_fields' not in self.__dict__:
+            request = self.context.get('request')
+            self._requested_fields = self.requested_fields(request) if request is not None else None
+        return self._requested_fields
+
+    def get_fields(self):
+        fields = super().get_fields()
+        names = self._requested()
+        if names is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in names}
+
+    def active_field_plan(self):
+        plan = super().active_field_plan()
+        names = self._requested()
+        if names is None:
+            return plan
+        plan_for = self.__dict__.get('_sparse_plan')
+        if plan_for is None:
+            plan_for = self._sparse_plan = [entry for entry in plan if entry[0] in names]
+        return plan_for
+
+
+class PageHeroSerializer(TimedSerializerMixin, SparseFieldsMixin, FieldPlanMixin, serializers.ModelSerializer):
     background_image_url = serializers.SerializerMethodField()
+    sources = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = PageHero
         fields = [
             'page_identifier', 'title', 'subtitle', 
-            'background_image_url', 'overlay_opacity', 
-            'is_active', 'created_at', 'updated_at'
+            'background_image_url', 'sources', 'srcset',
+            'image_width', 'image_height', 'dominant_color', 'placeholder',
+            'overlay_opacity', 'is_active', 'created_at', 'updated_at'
         ]
+        # Model fields read by the method fields, for ?fields= (SparseFieldsMixin)
+        field_sources = {
+            'background_image_url': ['optimized_image', 'background_image'],
+            'sources': ['renditions'],
+            'srcset': ['renditions'],
+        }
 
+    @extend_schema_field(OpenApiTypes.URI)
     def get_background_image_url(self, obj):
+        # Prefer the optimized copy once the worker has produced it
+        return self.media_url(self.value(obj, 'optimized_image') or self.value(obj, 'background_image'))
+
+    def _srcsets(self, obj):
+        """
+        Group renditions by MIME type into srcset strings, most efficient type first
+        """
+        # sources and srcset both need them; build them once per object
+        cached = self.__dict__.get('_srcsets_for')
+        if cached is not None and cached[0] is obj:
+            return cached[1]
+        srcsets = {}
+        for rendition in self.value(obj, 'renditions') or []:
+            srcsets.setdefault(rendition['type'], []).append(f"{self.media_url(rendition['name'])} {rendition['width']}w")
+        srcsets = {mime_type: ', '.join(candidates) for mime_type, candidates in srcsets.items()}
+        self._srcsets_for = (obj, srcsets)
+        return srcsets
+
+    @extend_schema_field(serializers.ListField(child=serializers.DictField(child=serializers.CharField())))
+    def get_sources(self, obj):
+        """
+        <picture> sources, e.g. [{"type": "image/avif", "srcset": "... 480w, ... 768w"}, ...]
+        """
+        return [
+            {'type': mime_type, 'srcset': srcset}
+            for mime_type, srcset in self._srcsets(obj).items()
+        ]
+
+    @extend_schema_field(OpenApiTypes.STR)
+    def get_srcset(self, obj):
+        """
+        JPEG srcset for clients that do not use <picture> sources
+        """
+        return self._srcsets(obj).get('image/jpeg', '')
+
+
+class SiteSettingsSerializer(TimedSerializerMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    logo_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SiteSettings
+        fields = [
+            'university_name', 'short_name', 'tagline',
+            'address', 'phone_numbers', 'email',
+            'facebook', 'twitter', 'linkedin', 'instagram', 'youtube',
+            'logo_url', 'copyright_text', 'charter_date', 'charter_by',
+            'maintenance_mode', 'analytics_code', 'updated_at'
+        ]
+        field_sources = {'logo_url': ['logo']}
+
+    @extend_schema_field(OpenApiTypes.URI)
+    def get_logo_url(self, obj):
         request = self.context.get('request')
-        if obj.background_image and hasattr(obj.background_image, 'url'):
+        if obj.logo and hasattr(obj.logo, 'url'):
             if request:
-                try:
-                    return request.build_absolute_uri(obj.background_image.url)
-                except Exception:
-                    # Fallback if request host is not properly configured
-                    from django.conf import settings
-                    return f"{settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'http://localhost:8000'}{obj.background_image.url}"
-            else:
-                # Fallback to MEDIA_URL if request is not available
-                from django.conf import settings
-                return f"http://localhost:8000{obj.background_image.url}"
-        return None
\ No newline at end of file
+                return request.build_absolute_uri(obj.logo.url)
+            return obj.logo.url
+        return None
+
+
+class SearchResultSerializer(TimedSerializerMixin, FieldPlanMixin, serializers.ModelSerializer):
+    type = serializers.SerializerMethodField()
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = SearchDocument
+        fields = ['type', 'object_id', 'title', 'description', 'url', 'publish_date', 'rank']
+
+    @extend_schema_field(OpenApiTypes.STR)
+    def get_type(self, obj):
+        """
+        Model of the result, e.g. "news.article"
+        """
+        content_type = ContentType.objects.get_for_id(self.value(obj, 'content_type_id'))
+        return f'{content_type.app_label}.{content_type.model}'
@@ -0,0 +1,62 @@
+"""
+Signal wiring for the core app
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token, user_snapshot_fields
+from .cache import register_cached_model
+from .instrumentation import install_query_recorder
+from .jobs import enqueue
+from .models import PageHero, SiteSettings
+from .publishing import publishable_models, schedule_next_publish
+
+
+register_cached_model(PageHero)
+register_cached_model(SiteSettings)
+
+connection_created.connect(install_query_recorder, dispatch_uid='core:instrument-queries')
+
+
+@receiver(post_delete, sender=Token, dispatch_uid='core:invalidate-deleted-token')
+def invalidate_deleted_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+@receiver(post_save, sender=get_user_model(), dispatch_uid='core:invalidate-user-tokens')
+def invalidate_user_tokens(sender, instance, update_fields=None, **kwargs):
+    # Dropping the user's cached tokens makes deactivation and other changes
+    # take effect immediately. Saves that touch no cached field, such as the
+    # last_login update on every login, keep them.
+    if update_fields is not None and not set(update_fields) & set(user_snapshot_fields()):
+        return
+    for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+        invalidate_token(key)
+
+
+@receiver(post_save, sender=PageHero, dispatch_uid='core:export-page-hero')
+@receiver(post_delete, sender=PageHero, dispatch_uid='core:export-deleted-page-hero')
+def export_page_hero(sender, instance, **kwargs):
+    if settings.API_EXPORT_ENABLED:
+        enqueue('core.export.export_page_hero', instance.page_identifier)
+
+
+@receiver(post_save, sender=SiteSettings, dispatch_uid='core:export-site-settings')
+def export_site_settings(sender, instance, **kwargs):
+    if settings.API_EXPORT_ENABLED:
+        enqueue('core.export.export_site_settings')
+
+
+def schedule_publishing(sender, **kwargs):
+    schedule_next_publish(sender)
+
+
+for model in publishable_models():
+    register_cached_model(model)
+    uid = f'core:schedule-publishing:{model._meta.label_lower}'
+    post_save.connect(schedule_publishing, sender=model, dispatch_uid=uid)
+    post_delete.connect(schedule_publishing, sender=model, dispatch_uid=uid)
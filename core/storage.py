@@ -0,0 +1,122 @@
+"""
+Static files storage with a build-time optimization pipeline
+"""
+import gzip
+import io
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from PIL import Image, ImageOps
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional; only .gz variants are written without it
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+
+class OptimizedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage that, after collectstatic has written the
+    content-hashed files:
+
+    - recompresses PNG (lossless) and JPEG (keeping the original quantization
+      tables) in place when that makes them smaller,
+    - writes a WebP sibling next to each image (``board.1a2b3c.png.webp``),
+    - writes ``.gz`` and, if Brotli is installed, ``.br`` variants of text
+      assets.
+
+    Images keep their ICC colour profile; other metadata is dropped, so EXIF
+    orientation is applied to the pixels. Only hashed files are touched, so
+    the sources in ``static/`` and the hashes in the manifest are unchanged.
+    Variants are only kept when they are smaller than the file they derive
+    from. Files that already have their variants are skipped, so re-running
+    collectstatic is cheap.
+    nginx serves the variants with ``gzip_static``/``brotli_static`` and a
+    ``try_files $uri$webp_suffix $uri`` rule, with immutable caching.
+    """
+
+    image_extensions = ('.png', '.jpg', '.jpeg')
+    compress_extensions = ('.css', '.js', '.svg', '.json', '.txt', '.map', '.html', '.xml')
+    webp_quality = 85
+    # Variants must be at least this much smaller to be worth keeping
+    min_saving_ratio = 0.95
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        names = sorted(set(self.hashed_files.values()))
+        with ThreadPoolExecutor(max_workers=os.cpu_count() or 2) as executor:
+            for name, error in zip(names, executor.map(self._optimize, names)):
+                if error:
+                    logger.warning('Could not optimize static file %s: %s', name, error)
+
+    def _optimize(self, name):
+        try:
+            path = self.path(name)
+            extension = os.path.splitext(name)[1].lower()
+            if extension in self.image_extensions:
+                self._optimize_image(path, extension)
+            elif extension in self.compress_extensions:
+                self._precompress(path)
+        except Exception as exc:
+            return exc
+        return None
+
+    def _keep_if_smaller(self, path, data, original_size):
+        if len(data) < original_size * self.min_saving_ratio:
+            with open(path, 'wb') as f:
+                f.write(data)
+            return True
+        return False
+
+    def _encode(self, img, format):
+        output = io.BytesIO()
+        # Without its colour profile the image would render with other colours
+        icc_profile = img.info.get('icc_profile')
+        if format == 'PNG':
+            img.save(output, 'PNG', optimize=True, icc_profile=icc_profile)
+        elif format == 'JPEG':
+            img.save(output, 'JPEG', quality='keep', optimize=True, progressive=True, icc_profile=icc_profile)
+        else:
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGBA' if img.mode in ('LA', 'PA', 'P') else 'RGB')
+            img.save(output, 'WEBP', quality=self.webp_quality, method=6, icc_profile=icc_profile)
+        return output.getvalue()
+
+    def _optimize_image(self, path, extension):
+        webp_path = path + '.webp'
+        if os.path.exists(webp_path):
+            return
+
+        original_size = os.path.getsize(path)
+        with Image.open(path) as img:
+            img.load()
+            # EXIF is not carried over, so apply its orientation to the pixels.
+            # In place, so the JPEG keeps its quantization tables for 'keep'.
+            ImageOps.exif_transpose(img, in_place=True)
+            recompressed = self._encode(img, 'PNG' if extension == '.png' else 'JPEG')
+            webp = self._encode(img, 'WEBP')
+
+        self._keep_if_smaller(path, recompressed, original_size)
+        # nginx falls back to the original when there is no sibling
+        self._keep_if_smaller(webp_path, webp, os.path.getsize(path))
+
+    def _precompress(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        variants = [('.gz', lambda: gzip.compress(data, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', lambda: brotli.compress(data, quality=11)))
+
+        for suffix, compress in variants:
+            variant_path = path + suffix
+            if not os.path.exists(variant_path):
+                self._keep_if_smaller(variant_path, compress(), len(data))
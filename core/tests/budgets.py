@@ -0,0 +1,105 @@
+"""
+Query and response-time budgets for API endpoints.
+
+Every named route in core/api_urls.py declares an EndpointBudget in
+core/tests/test_budgets.py; a route without one fails the suite. Budgets are
+checked on an uncached response (response caches empty, token already
+authenticated, process-local copies loaded) and on a cached one, so an
+endpoint that gains queries, for example an N+1 over a related model, fails
+CI. For list endpoints, make ``setup`` create several rows so per-row
+queries exceed the budget.
+"""
+import statistics
+import time
+
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.cache import _process_local_objects
+
+
+# Timed requests per scenario; the median is compared with the budget
+TIMED_REQUESTS = 5
+
+
+class EndpointBudget:
+    """
+    Budget of one endpoint: ``queries`` for an uncached response,
+    ``cached_queries`` once cached, and ``max_ms`` for the median response
+    time of either. ``setup`` creates the data the request needs.
+    """
+
+    def __init__(self, url_name, kwargs=None, query_string='', setup=None,
+                 queries=1, cached_queries=0, max_ms=100):
+        self.url_name = url_name
+        self.kwargs = kwargs or {}
+        self.query_string = query_string
+        self.setup = setup
+        self.queries = queries
+        self.cached_queries = cached_queries
+        self.max_ms = max_ms
+
+    def __str__(self):
+        return self.url_name
+
+    def url(self):
+        url = reverse(self.url_name, kwargs=self.kwargs)
+        return f'{url}?{self.query_string}' if self.query_string else url
+
+
+def clear_response_caches(process_local=True):
+    """
+    Empty all caches and, unless ``process_local`` is false, the process-local
+    copies of singletons such as SiteSettings
+    """
+    for cache in caches.all(initialized_only=True):
+        cache.clear()
+    if process_local:
+        for obj in _process_local_objects:
+            obj.clear()
+
+
+def _request(client, url):
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        response = client.get(url)
+        elapsed = (time.perf_counter() - start) * 1000
+    assert response.status_code == 200, f'GET {url} returned {response.status_code}'
+    return list(queries.captured_queries), elapsed
+
+
+def _check(label, budget, max_queries, results):
+    queries = max(results, key=lambda result: len(result[0]))[0]
+    assert len(queries) <= max_queries, (
+        f'{budget} ({label}) ran {len(queries)} queries, budget is {max_queries}:\n'
+        + '\n'.join(query['sql'] for query in queries)
+    )
+    median_ms = statistics.median(elapsed for _, elapsed in results)
+    assert median_ms <= budget.max_ms, (
+        f'{budget} ({label}) took {median_ms:.1f} ms (median), budget is {budget.max_ms} ms'
+    )
+
+
+def assert_within_budget(client, budget, before_request=None):
+    """
+    Request the endpoint uncached and cached and check both against ``budget``.
+    ``before_request`` runs after each cache clear, e.g. to re-authenticate.
+    """
+    url = budget.url()
+    # Warm up URL resolution and other one-off work outside the measurements
+    client.get(url)
+
+    uncached = []
+    for _ in range(TIMED_REQUESTS):
+        # Process-local copies are only revalidated every few seconds, so a
+        # worker keeps them between requests
+        clear_response_caches(process_local=False)
+        if before_request:
+            before_request()
+        uncached.append(_request(client, url))
+    _check('uncached', budget, budget.queries, uncached)
+
+    cached = [_request(client, url) for _ in range(TIMED_REQUESTS)]
+    _check('cached', budget, budget.cached_queries, cached)
@@ -0,0 +1,73 @@
+from unittest import mock
+
+import pytest
+from django.apps import apps
+from django.db import connection
+from django.test.utils import isolate_apps
+from rest_framework.test import APIClient
+
+from core.authentication import CachedTokenAuthentication
+
+from .budgets import clear_response_caches
+from .factories import TokenFactory
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    # Cached responses, tokens and singletons must not leak between tests
+    clear_response_caches()
+    yield
+    clear_response_caches()
+
+
+@pytest.fixture
+def token(db):
+    return TokenFactory()
+
+
+@pytest.fixture
+def authenticate(token):
+    """
+    Put the token in the token cache, as after the client's first request
+    """
+    def authenticate():
+        CachedTokenAuthentication().authenticate_credentials(token.key)
+    return authenticate
+
+
+@pytest.fixture
+def api_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+@pytest.fixture
+def temporary_model(transactional_db):
+    """
+    Create throwaway concrete models, e.g. of the abstract content bases.
+
+    They live in their own app registry, so flushes and other tests never
+    see them, but apps.get_model() resolves their labels while the test
+    runs. Their tables are dropped afterwards.
+    """
+    created = {}
+    get_model = apps.get_model
+
+    def create(name, bases, **fields):
+        meta = type('Meta', tuple(base.Meta for base in bases if hasattr(base, 'Meta')), {'app_label': 'core'})
+        model = type(name, bases, {'__module__': __name__, 'Meta': meta, **fields})
+        with connection.schema_editor() as editor:
+            editor.create_model(model)
+        created[model._meta.label_lower] = model
+        return model
+
+    def get_temporary_model(app_label, model_name=None, require_ready=True):
+        label = f'{app_label}.{model_name}' if model_name else app_label
+        return created.get(label.lower()) or get_model(app_label, model_name, require_ready)
+
+    with isolate_apps('core'), mock.patch.object(apps, 'get_model', get_temporary_model):
+        yield create
+    with connection.schema_editor() as editor:
+        for model in created.values():
+            editor.delete_model(model)
@@ -0,0 +1,80 @@
+"""
+factory_boy factories for the core models
+"""
+import factory
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from rest_framework.authtoken.models import Token
+
+from core.models import PageHero, SearchDocument, SiteSettings
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    username = factory.Sequence(lambda n: f'user{n}')
+    email = factory.LazyAttribute(lambda user: f'{user.username}@example.org')
+
+    class Meta:
+        model = get_user_model()
+        skip_postgeneration_save = True
+
+
+class TokenFactory(factory.django.DjangoModelFactory):
+    user = factory.SubFactory(UserFactory)
+
+    class Meta:
+        model = Token
+
+
+class SiteSettingsFactory(factory.django.DjangoModelFactory):
+    university_name = 'National Intelligence and Research University'
+    short_name = 'NIRU'
+    phone_numbers = factory.LazyFunction(lambda: ['+254 798 471845'])
+
+    class Meta:
+        model = SiteSettings
+
+    @classmethod
+    def _create(cls, model_class, *args, **kwargs):
+        # There is only one row; later factory calls update it
+        obj, _ = model_class.objects.update_or_create(pk=model_class.SINGLETON_PK, defaults=kwargs)
+        return obj
+
+
+class PageHeroFactory(factory.django.DjangoModelFactory):
+    page_identifier = factory.Iterator([page_id for page_id, _ in PageHero.PAGE_CHOICES])
+    title = factory.LazyAttribute(lambda hero: f'{hero.page_identifier.title()} title')
+    subtitle = factory.LazyAttribute(lambda hero: f'{hero.page_identifier.title()} subtitle')
+    # A name only; no file is written to MEDIA_ROOT
+    background_image = factory.LazyAttribute(lambda hero: f'heroes/{hero.page_identifier}-hero.jpg')
+    overlay_opacity = 50
+    is_active = True
+    image_width = 1920
+    image_height = 600
+    renditions = factory.LazyAttribute(lambda hero: [
+        {
+            'name': f'heroes/renditions/{hero.page_identifier}/hero-{width}w.{extension}',
+            'width': width,
+            'type': mime_type,
+        }
+        for mime_type, extension in [('image/avif', 'avif'), ('image/webp', 'webp'), ('image/jpeg', 'jpg')]
+        for width in (480, 768, 1280, 1920)
+    ])
+
+    class Meta:
+        model = PageHero
+        django_get_or_create = ('page_identifier',)
+
+
+class SearchDocumentFactory(factory.django.DjangoModelFactory):
+    # Documents need no indexed instance to be searchable; PageHero is a
+    # stand-in content type
+    content_type = factory.LazyFunction(lambda: ContentType.objects.get_for_model(PageHero))
+    object_id = factory.Sequence(str)
+    title = factory.Sequence(lambda n: f'Research programme {n}')
+    keywords = 'research, postgraduate'
+    description = 'Postgraduate research at NIRU'
+    body = 'Applications for the research programme are open.'
+    url = factory.LazyAttribute(lambda document: f'/programmes/{document.object_id}/')
+
+    class Meta:
+        model = SearchDocument
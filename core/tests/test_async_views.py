@@ -0,0 +1,193 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient, Client
+from django.urls import include, path
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAdminUser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from core import async_views, views
+from core.api_urls import api_patterns
+from core.async_views import AsyncAPIResponse, async_api_view
+from core.authentication import CachedTokenAuthentication, token_cache_key
+from core.cache import get_api_cache
+from core.throttling import UserCounterRateThrottle
+
+from .factories import PageHeroFactory, SiteSettingsFactory
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def admin_only(request):
+    return Response({'ok': True})
+
+
+@async_api_view
+@permission_classes([IsAdminUser])
+async def async_admin_only(request):
+    return AsyncAPIResponse({'ok': True})
+
+
+# Serves the ASGI-native views, as with ASYNC_API_VIEWS=True, and the DRF
+# views they must behave like
+urlpatterns = [
+    path('api/v1/', include(api_patterns(async_views))),
+    path('api/v1/admin-only/', async_admin_only),
+    path('drf/v1/', include(api_patterns(views))),
+    path('drf/v1/admin-only/', admin_only),
+]
+
+pytestmark = [pytest.mark.django_db, pytest.mark.urls(__name__)]
+
+HERO_URL = '/api/v1/page-hero/home/'
+
+
+@pytest.fixture
+def hero(db):
+    return PageHeroFactory(page_identifier='home', title='Home')
+
+
+@pytest.fixture
+def get(token):
+    """
+    GET through Django's ASGI request handling
+    """
+    @async_to_sync
+    async def get(url, key=token.key, method='get', **headers):
+        if key:
+            headers['Authorization'] = f'Token {key}'
+        return await getattr(AsyncClient(), method)(url, headers=headers)
+    return get
+
+
+def test_page_hero_detail(get, hero):
+    response = get(HERO_URL)
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/json'
+    assert response.json()['title'] == 'Home'
+
+
+def test_site_settings_detail(get):
+    SiteSettingsFactory(short_name='NIRU')
+    assert get('/api/v1/site-settings/').json()['short_name'] == 'NIRU'
+
+
+def test_missing_hero_returns_404(get):
+    assert get('/api/v1/page-hero/about/').status_code == 404
+
+
+def test_only_get_and_head_are_allowed(get, hero):
+    response = get(HERO_URL, method='post')
+    assert response.status_code == 405
+    assert response['Allow'] == 'GET, HEAD'
+
+
+@pytest.fixture
+def get_both(get):
+    """
+    GET a path from the async views and from the DRF views
+    """
+    def get_both(path, key):
+        headers = {'Authorization': f'Token {key}'} if key else {}
+        return get(f'/api/v1/{path}', key=key), Client().get(f'/drf/v1/{path}', headers=headers)
+    return get_both
+
+
+def assert_same_response(response, drf_response, *headers):
+    assert response.status_code == drf_response.status_code
+    assert response.json() == drf_response.json()
+    for header in headers:
+        assert response.get(header) == drf_response.get(header)
+
+
+# 'two parts' is a malformed header, rejected by the authentication class
+@pytest.mark.parametrize('key', [None, 'unknown', 'two parts'])
+def test_rejects_missing_and_unknown_tokens_like_drf(get_both, hero, key):
+    response, drf_response = get_both('page-hero/home/', key)
+    assert response.status_code == 401
+    assert response['WWW-Authenticate'] == 'Token'
+    assert_same_response(response, drf_response, 'WWW-Authenticate')
+
+
+def test_rejects_inactive_users_like_drf(get_both, hero, token):
+    token.user.is_active = False
+    token.user.save()
+    response, drf_response = get_both('page-hero/home/', token.key)
+    assert response.status_code == 401
+    assert_same_response(response, drf_response, 'WWW-Authenticate')
+
+
+def test_view_permission_classes_are_applied_like_drf(get_both, token):
+    response, drf_response = get_both('admin-only/', token.key)
+    assert response.status_code == 403
+    assert_same_response(response, drf_response)
+
+    token.user.is_staff = True
+    token.user.save()
+    response, drf_response = get_both('admin-only/', token.key)
+    assert response.json() == {'ok': True}
+    assert_same_response(response, drf_response)
+
+
+def test_throttled_requests_get_429_like_drf(get_both, hero, token, monkeypatch):
+    monkeypatch.setattr(UserCounterRateThrottle, 'THROTTLE_RATES', {'user': '1/min'})
+    assert get_both('page-hero/home/', token.key)[0].status_code == 200
+
+    response, drf_response = get_both('page-hero/home/', token.key)
+    assert response.status_code == 429
+    assert int(response['Retry-After']) > 0
+    assert_same_response(response, drf_response, 'Retry-After')
+
+
+def test_unknown_sparse_fields_return_400(get, hero):
+    assert get(HERO_URL + '?fields=unknown').status_code == 400
+
+
+def test_cached_response_needs_no_queries(get, hero, django_assert_num_queries):
+    first = get(HERO_URL)
+    with django_assert_num_queries(0):
+        second = get(HERO_URL)
+    assert second.content == first.content
+
+
+def test_saving_a_hero_invalidates_its_cached_response(get, hero):
+    get(HERO_URL)
+    hero.title = 'After'
+    hero.save()
+    assert get(HERO_URL).json()['title'] == 'After'
+
+
+def test_matching_etag_returns_304(get, hero):
+    etag = get(HERO_URL)['ETag']
+    response = get(HERO_URL, If_None_Match=etag)
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+
+
+def token_request(key):
+    return Request(APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Token {key}'))
+
+
+def test_aauthenticate_caches_the_snapshot(token, django_assert_num_queries):
+    aauthenticate = async_to_sync(CachedTokenAuthentication().aauthenticate)
+    with django_assert_num_queries(1):
+        user, auth = aauthenticate(token_request(token.key))
+    assert (user.pk, auth.key) == (token.user.pk, token.key)
+    assert get_api_cache().get(token_cache_key(token.key))['is_active'] is True
+
+    with django_assert_num_queries(0):
+        user, auth = aauthenticate(token_request(token.key))
+    assert user.pk == token.user.pk
+
+
+def test_aauthenticate_unknown_key(db):
+    with pytest.raises(AuthenticationFailed):
+        async_to_sync(CachedTokenAuthentication().aauthenticate)(token_request('unknown'))
+
+
+def test_aauthenticate_without_token_header(db):
+    request = Request(APIRequestFactory().get('/'))
+    assert async_to_sync(CachedTokenAuthentication().aauthenticate)(request) is None
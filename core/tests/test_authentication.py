@@ -0,0 +1,70 @@
+import pytest
+from django.contrib.auth.models import update_last_login
+from django.urls import reverse
+
+from core.authentication import CachedTokenAuthentication, token_cache_key
+from core.cache import get_api_cache, get_site_settings
+
+from .factories import SiteSettingsFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def url():
+    SiteSettingsFactory()
+    # Load the process-local copy, as a running worker has
+    get_site_settings()
+    return reverse('site-settings-detail')
+
+
+def test_second_request_skips_the_token_lookup(api_client, url, django_assert_num_queries):
+    # Token and user, in one query
+    with django_assert_num_queries(1):
+        assert api_client.get(url).status_code == 200
+    with django_assert_num_queries(0):
+        assert api_client.get(url).status_code == 200
+
+
+def test_cache_holds_a_snapshot_without_credentials(token):
+    user, _ = CachedTokenAuthentication().authenticate_credentials(token.key)
+    snapshot = get_api_cache().get(token_cache_key(token.key))
+
+    assert snapshot == {
+        'id': user.pk, 'username': user.username, 'is_active': True, 'is_staff': False, 'is_superuser': False,
+    }
+    assert token.key not in str(snapshot)
+
+
+def test_restored_user_loads_other_fields_on_access(token, django_assert_num_queries):
+    token.user.set_password('correct horse')
+    token.user.save()
+    authentication = CachedTokenAuthentication()
+    authentication.authenticate_credentials(token.key)
+
+    with django_assert_num_queries(0):
+        user, cached_token = authentication.authenticate_credentials(token.key)
+    assert (user.pk, user.is_authenticated, cached_token.key, cached_token.user) == (token.user.pk, True, token.key, user)
+    assert user.email == token.user.email
+
+    # Saving a restored user never blanks the fields that were not cached
+    user.first_name = 'Amina'
+    user.save()
+    token.user.refresh_from_db()
+    assert token.user.check_password('correct horse')
+    assert token.user.first_name == 'Amina'
+
+
+def test_deactivation_takes_effect_at_once(api_client, url, token):
+    assert api_client.get(url).status_code == 200
+    token.user.is_active = False
+    token.user.save()
+    assert api_client.get(url).status_code == 401
+
+
+def test_login_keeps_cached_tokens(token, django_assert_num_queries):
+    CachedTokenAuthentication().authenticate_credentials(token.key)
+    with django_assert_num_queries(1):
+        update_last_login(None, token.user)
+    assert get_api_cache().get(token_cache_key(token.key)) is not None
@@ -0,0 +1,47 @@
+import pytest
+from django.urls import get_resolver
+
+from .budgets import EndpointBudget, assert_within_budget
+from .factories import PageHeroFactory, SearchDocumentFactory, SiteSettingsFactory
+
+
+BUDGETS = [
+    # The hero itself; the conditional GET validators come from that row
+    EndpointBudget(
+        'page-hero-detail',
+        kwargs={'page_identifier': 'home'},
+        setup=lambda: PageHeroFactory(page_identifier='home'),
+        queries=1,
+        max_ms=100,
+    ),
+    # Served from the process-local SiteSettings copy
+    EndpointBudget(
+        'site-settings-detail',
+        setup=SiteSettingsFactory,
+        queries=0,
+        max_ms=100,
+    ),
+    # One ranked full-text query, whatever the number of matches, and the
+    # next publish date that bounds how long the response is cached
+    EndpointBudget(
+        'search',
+        query_string='q=research',
+        setup=lambda: SearchDocumentFactory.create_batch(30),
+        queries=2,
+        max_ms=100,
+    ),
+]
+
+
+def test_every_api_endpoint_has_a_budget():
+    routes = {pattern.name for pattern in get_resolver('core.api_urls').url_patterns if pattern.name}
+    missing = routes - {budget.url_name for budget in BUDGETS}
+    assert not missing, f'Declare an EndpointBudget for: {", ".join(sorted(missing))}'
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('budget', BUDGETS, ids=str)
+def test_endpoint_budget(budget, api_client, authenticate):
+    if budget.setup:
+        budget.setup()
+    assert_within_budget(api_client, budget, before_request=authenticate)
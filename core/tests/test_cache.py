@@ -0,0 +1,73 @@
+import pytest
+from django.db import transaction
+from django.urls import reverse
+
+from core.cache import get_site_settings
+from core.models import PageHero, SiteSettings
+
+from .factories import PageHeroFactory, SiteSettingsFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def hero_url(page_identifier='home'):
+    return reverse('page-hero-detail', kwargs={'page_identifier': page_identifier})
+
+
+def test_saving_a_hero_invalidates_its_cached_response(api_client):
+    hero = PageHeroFactory(page_identifier='home', title='Before')
+    assert api_client.get(hero_url()).json()['title'] == 'Before'
+
+    hero.title = 'After'
+    hero.save()
+    assert api_client.get(hero_url()).json()['title'] == 'After'
+
+
+def test_matching_etag_returns_304_without_queries(api_client, django_assert_num_queries):
+    PageHeroFactory(page_identifier='home')
+    etag = api_client.get(hero_url())['ETag']
+
+    with django_assert_num_queries(0):
+        response = api_client.get(hero_url(), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+
+def test_missing_hero_returns_404(api_client):
+    assert api_client.get(hero_url('about')).status_code == 404
+
+
+def test_maintenance_mode_blocks_api_but_not_site_settings(api_client):
+    PageHeroFactory(page_identifier='home')
+    SiteSettingsFactory(maintenance_mode=True)
+
+    response = api_client.get(hero_url())
+    assert response.status_code == 503
+    assert response['Retry-After']
+    assert api_client.get(reverse('site-settings-detail')).status_code == 200
+
+
+@pytest.mark.django_db(transaction=True)
+def test_read_before_commit_does_not_outlive_the_commit(api_client):
+    hero = PageHeroFactory(page_identifier='home', title='Before')
+    with transaction.atomic():
+        hero.title = 'After'
+        hero.save()
+        # Another connection still sees the committed row and caches it
+        # under the version bumped by the save
+        PageHero.objects.filter(pk=hero.pk).update(title='Before')
+        assert api_client.get(hero_url()).json()['title'] == 'Before'
+        PageHero.objects.filter(pk=hero.pk).update(title='After')
+    assert api_client.get(hero_url()).json()['title'] == 'After'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_site_settings_read_before_commit_does_not_outlive_the_commit():
+    site_settings = SiteSettingsFactory(maintenance_mode=False)
+    with transaction.atomic():
+        site_settings.maintenance_mode = True
+        site_settings.save()
+        SiteSettings.objects.filter(pk=site_settings.pk).update(maintenance_mode=False)
+        assert get_site_settings().maintenance_mode is False
+        SiteSettings.objects.filter(pk=site_settings.pk).update(maintenance_mode=True)
+    assert get_site_settings().maintenance_mode is True
@@ -0,0 +1,29 @@
+from django.db import models
+from django.test.utils import isolate_apps
+
+from core.checks import missing_base_indexes
+from core.models import PublishableModel, TimeStampedModel
+
+
+@isolate_apps('core')
+def test_model_on_both_bases_needs_combined_indexes():
+    class Post(TimeStampedModel, PublishableModel):
+        class Meta(TimeStampedModel.Meta, PublishableModel.Meta):
+            pass
+
+    [(base, missing)] = missing_base_indexes(Post)
+    assert base is PublishableModel
+    assert missing == ['core_post_pid', 'core_post_ipd']
+
+
+@isolate_apps('core')
+def test_combined_indexes_pass():
+    class Post(TimeStampedModel, PublishableModel):
+        class Meta(TimeStampedModel.Meta, PublishableModel.Meta):
+            indexes = TimeStampedModel.Meta.indexes + PublishableModel.Meta.indexes
+
+    class Note(TimeStampedModel):
+        body = models.TextField()
+
+    assert list(missing_base_indexes(Post)) == []
+    assert list(missing_base_indexes(Note)) == []
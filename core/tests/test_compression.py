@@ -0,0 +1,114 @@
+import gzip
+
+import brotli
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+
+from core import middleware
+from core.middleware import CompressionMiddleware
+
+from .factories import PageHeroFactory
+
+
+PAYLOAD = b'{"results":[' + b','.join([b'{"title":"Research and innovation"}'] * 100) + b']}'
+
+
+def compress(accept_encoding, response):
+    request = RequestFactory().get('/api/v1/', HTTP_ACCEPT_ENCODING=accept_encoding)
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+def json_response(content=PAYLOAD, **headers):
+    return HttpResponse(content, content_type='application/json', headers=headers)
+
+
+@pytest.mark.parametrize('accept_encoding, expected', [
+    ('gzip, deflate, br', 'br'),
+    ('gzip', 'gzip'),
+    ('br;q=0.5, gzip', 'gzip'),
+    ('*', 'br'),
+    ('identity', None),
+    ('gzip;q=0, br;q=0', None),
+    ('', None),
+])
+def test_negotiate(accept_encoding, expected):
+    assert CompressionMiddleware.negotiate(accept_encoding) == expected
+
+
+def test_brotli_round_trip():
+    response = compress('gzip, br', json_response())
+    assert response['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.content) == PAYLOAD
+    assert int(response['Content-Length']) == len(response.content) < len(PAYLOAD)
+    assert 'Accept-Encoding' in response['Vary']
+
+
+def test_gzip_round_trip():
+    response = compress('gzip', json_response())
+    assert response['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.content) == PAYLOAD
+
+
+def test_strong_etag_is_weakened():
+    response = compress('br', json_response(ETag='"abc"'))
+    assert response['ETag'] == 'W/"abc"'
+
+
+@pytest.mark.parametrize('response', [
+    json_response(b'{"title":"Home"}'),
+    HttpResponse(PAYLOAD, content_type='image/png'),
+    HttpResponse(b'<html>' + PAYLOAD, content_type='text/html; charset=utf-8'),
+    json_response(**{'Content-Encoding': 'gzip'}),
+    HttpResponse(status=304),
+], ids=['small', 'binary', 'html', 'encoded', 'not-modified'])
+def test_left_alone(response):
+    content = response.content
+    compressed = compress('gzip, br', response)
+    assert compressed.content == content
+    assert compressed.get('Content-Encoding') in (None, 'gzip')
+
+
+def test_streaming_response_left_alone():
+    response = compress('br', StreamingHttpResponse([PAYLOAD], content_type='application/json'))
+    assert not response.has_header('Content-Encoding')
+
+
+@pytest.fixture
+def encode_cache():
+    middleware.encode.cache_clear()
+    yield
+    middleware.encode.cache_clear()
+
+
+def test_repeated_bodies_are_compressed_once(monkeypatch, encode_cache):
+    calls = []
+    monkeypatch.setattr(middleware.brotli, 'compress', lambda content, **kwargs: calls.append(content) or b'br')
+
+    for _ in range(3):
+        assert compress('br', json_response()).content == b'br'
+    compress('br', json_response(PAYLOAD + b' '))
+    assert len(calls) == 2
+
+
+def test_only_the_api_chain_compresses(settings):
+    name = 'core.middleware.CompressionMiddleware'
+    assert settings.API_MIDDLEWARE.count(name) == 1
+    assert name not in settings.MIDDLEWARE
+
+
+@pytest.mark.django_db
+def test_api_response_is_compressed_and_revalidates(api_client, settings):
+    # The test client runs MIDDLEWARE; give it the chain /api/ paths get
+    settings.MIDDLEWARE = settings.API_MIDDLEWARE
+    settings.API_COMPRESSION_MIN_SIZE = 100
+    PageHeroFactory(page_identifier='home')
+    url = reverse('page-hero-detail', kwargs={'page_identifier': 'home'})
+
+    response = api_client.get(url, HTTP_ACCEPT_ENCODING='br')
+    assert response['Content-Encoding'] == 'br'
+    assert response['ETag'].startswith('W/"')
+    assert brotli.decompress(response.content).startswith(b'{"page_identifier":"home"')
+
+    assert api_client.get(url, HTTP_ACCEPT_ENCODING='br', HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
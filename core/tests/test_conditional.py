@@ -0,0 +1,77 @@
+import pytest
+from django.utils.http import http_date
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from core.conditional import conditional_model_view
+from core.models import PageHero
+from core.serializers import PageHeroSerializer
+
+from .factories import PageHeroFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([])
+@conditional_model_view(PageHero)
+def hero_view(request, page_identifier):
+    # No response cache above, so every request reaches the decorator
+    queryset = PageHeroSerializer.sparse_queryset(PageHero.objects, request, required=['updated_at'])
+    page_hero = queryset.filter(page_identifier=page_identifier).first()
+    if page_hero is None:
+        return Response({'error': 'not found'}, status=404)
+    return Response(PageHeroSerializer(page_hero, context={'request': request}).data)
+
+
+def get(path='/home/', **headers):
+    return hero_view(APIRequestFactory().get(path, **headers), page_identifier='home')
+
+
+def test_miss_costs_only_the_view_query(django_assert_num_queries):
+    hero = PageHeroFactory(page_identifier='home')
+    with django_assert_num_queries(1):
+        response = get()
+    assert response['ETag']
+    assert response['Last-Modified'] == http_date(int(hero.updated_at.timestamp()))
+
+
+@pytest.mark.parametrize('header', ['ETag', 'Last-Modified'])
+def test_revalidation_is_answered_from_cache(django_assert_num_queries, header):
+    PageHeroFactory(page_identifier='home')
+    validator = get()[header]
+    request_header = 'HTTP_IF_NONE_MATCH' if header == 'ETag' else 'HTTP_IF_MODIFIED_SINCE'
+
+    with django_assert_num_queries(0):
+        response = get(**{request_header: validator})
+    assert response.status_code == 304
+    assert response['ETag']
+
+
+def test_saving_drops_the_cached_validators():
+    hero = PageHeroFactory(page_identifier='home', title='Before')
+    etag = get()['ETag']
+
+    hero.title = 'After'
+    hero.save()
+    response = get(HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data['title'] == 'After'
+    assert response['ETag'] != etag
+
+
+def test_sparse_responses_keep_last_modified(django_assert_num_queries):
+    PageHeroFactory(page_identifier='home')
+    with django_assert_num_queries(1):
+        response = get('/home/?fields=title')
+    assert response.data.keys() == {'title'}
+    assert response['Last-Modified']
+
+
+def test_errors_get_no_validators():
+    response = get()
+    assert response.status_code == 404
+    assert not response.has_header('ETag')
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from core.export import Exporter, export_page_hero, page_hero_path
+
+from .factories import PageHeroFactory, SiteSettingsFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def export_root(settings, tmp_path):
+    settings.API_EXPORT_ROOT = str(tmp_path)
+    settings.API_EXPORT_BASE_URL = 'https://api.example.org'
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'api.example.org']
+    return tmp_path
+
+
+def export(changed_only=True):
+    with Exporter() as exporter:
+        exporter.export_all(changed_only=changed_only)
+    return exporter.written, exporter.unchanged, exporter.removed
+
+
+def test_export_matches_api_response(export_root, api_client):
+    PageHeroFactory(page_identifier='home')
+    SiteSettingsFactory()
+    export()
+
+    exported = json.loads((export_root / page_hero_path('home')).read_text())
+    response = api_client.get('/api/v1/page-hero/home/', HTTP_HOST='api.example.org', secure=True)
+    assert exported == response.json()
+    assert 'v1/site-settings.json' in json.loads((export_root / 'manifest.json').read_text())['files']
+
+
+def test_export_is_incremental(export_root):
+    home = PageHeroFactory(page_identifier='home')
+    PageHeroFactory(page_identifier='about')
+    assert export() == (3, 0, 0)
+    assert export() == (0, 3, 0)
+
+    home.title = 'Changed'
+    home.save()
+    assert export() == (1, 2, 0)
+
+
+def test_each_hero_is_loaded_once(export_root, django_assert_num_queries):
+    PageHeroFactory(page_identifier='home')
+    with Exporter() as exporter, django_assert_num_queries(1):
+        exporter.export_page_hero('home')
+    assert exporter.written == 1
+
+
+def test_deactivated_hero_is_removed(export_root):
+    hero = PageHeroFactory(page_identifier='home')
+    export()
+
+    hero.is_active = False
+    hero.save()
+    export_page_hero('home')
+    assert not (export_root / page_hero_path('home')).exists()
+
+
+def test_saves_queue_exports_when_enabled(settings, export_root, django_capture_on_commit_callbacks):
+    settings.API_EXPORT_ENABLED = True
+    settings.BACKGROUND_JOBS_EAGER = True
+    with django_capture_on_commit_callbacks(execute=True):
+        PageHeroFactory(page_identifier='home', title='Queued')
+
+    exported = json.loads((export_root / page_hero_path('home')).read_text())
+    assert exported['title'] == 'Queued'
@@ -0,0 +1,105 @@
+import asyncio
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.test import Client
+
+from core.handlers import ASGIMiddlewareRouter, WSGIMiddlewareRouter
+
+from .factories import SiteSettingsFactory, UserFactory
+
+
+CHAIN = 'core.tests.test_handlers.chain_middleware'
+
+
+def chain_middleware(get_response):
+    """
+    Marks responses that went through API_MIDDLEWARE
+    """
+    def middleware(request):
+        response = get_response(request)
+        response['X-Chain'] = 'api'
+        return response
+    return middleware
+
+
+@pytest.fixture
+def api_chain(settings):
+    settings.API_MIDDLEWARE = [CHAIN]
+
+
+def wsgi_request(application, path, **environ):
+    environ['PATH_INFO'] = path
+    setup_testing_defaults(environ)
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started.update(status=status, headers=dict(headers))
+
+    b''.join(application(environ, start_response))
+    return started
+
+
+def wsgi_get(application, path):
+    return wsgi_request(application, path)['headers']
+
+
+@async_to_sync
+async def asgi_get(application, path):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+        'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+        'headers': [(b'host', b'localhost')], 'server': ('localhost', 80), 'client': ('127.0.0.1', 1234),
+    }
+    requests = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+    messages = []
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        # Block like a client that stays connected
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await application(scope, receive, send)
+    return {name.decode(): value.decode() for name, value in messages[0]['headers']}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('get, router', [(wsgi_get, WSGIMiddlewareRouter), (asgi_get, ASGIMiddlewareRouter)])
+def test_api_paths_use_api_middleware(api_chain, get, router):
+    application = router()
+    assert get(application, '/api/v1/unknown/')['X-Chain'] == 'api'
+    assert 'X-Chain' not in get(application, '/unknown/')
+
+
+def test_settings_middleware_untouched(api_chain):
+    full_chain = list(settings.MIDDLEWARE)
+    WSGIMiddlewareRouter()
+    assert settings.MIDDLEWARE == full_chain
+    assert CHAIN not in settings.MIDDLEWARE
+
+
+def test_failed_load_leaves_settings_alone(settings):
+    full_chain = list(settings.MIDDLEWARE)
+    settings.API_MIDDLEWARE = ['core.tests.test_handlers.missing_middleware']
+    with pytest.raises(ImportError):
+        WSGIMiddlewareRouter()
+    assert settings.MIDDLEWARE == full_chain
+
+
+@pytest.mark.django_db
+def test_maintenance_mode_blocks_staff_on_api_paths_only():
+    SiteSettingsFactory(maintenance_mode=True)
+    client = Client()
+    client.force_login(UserFactory(is_staff=True))
+    cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+    application = WSGIMiddlewareRouter()
+
+    # The full chain resolves the session user; API_MIDDLEWARE does not
+    assert wsgi_request(application, '/unknown/', HTTP_COOKIE=cookie)['status'].startswith('404')
+    assert wsgi_request(application, '/api/v1/page-hero/home/', HTTP_COOKIE=cookie)['status'].startswith('503')
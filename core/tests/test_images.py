@@ -0,0 +1,205 @@
+import io
+from io import StringIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+from rest_framework.test import APIRequestFactory
+
+from core import images
+from core.images import process_page_hero_image, processing_fingerprint, rendition_formats
+from core.jobs import run_pending
+from core.models import BackgroundJob, PageHero
+from core.serializers import PageHeroSerializer
+
+
+pytestmark = pytest.mark.django_db
+
+PROCESS_TASK = 'core.images.process_page_hero_image'
+
+
+def jpeg(size=(2400, 800), color=(26, 42, 78)):
+    output = io.BytesIO()
+    Image.new('RGB', size, color).save(output, 'JPEG', quality=95)
+    return output.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def rendition_widths(monkeypatch):
+    # Small renditions keep AVIF encoding fast
+    monkeypatch.setattr(images, 'HERO_RENDITION_WIDTHS', (240, 480))
+    return images.HERO_RENDITION_WIDTHS
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def make_hero(media_root):
+    def make_hero(size=(2400, 800), page_identifier='home'):
+        return PageHero.objects.create(
+            page_identifier=page_identifier,
+            background_image=SimpleUploadedFile('hero.jpg', jpeg(size), content_type='image/jpeg'),
+        )
+    return make_hero
+
+
+def processed(hero):
+    process_page_hero_image(hero.pk)
+    return PageHero.objects.get(pk=hero.pk)
+
+
+def test_saving_a_new_image_queues_processing(make_hero):
+    hero = make_hero()
+    assert hero.image_status == PageHero.IMAGE_PENDING
+    assert list(BackgroundJob.objects.values_list('task', 'args')) == [(PROCESS_TASK, [hero.pk])]
+
+    # Once processed, saves that keep the image queue nothing
+    hero = processed(hero)
+    hero.title = 'Welcome'
+    hero.save()
+    assert BackgroundJob.objects.count() == 1
+
+
+def test_processing_writes_an_optimized_copy_and_keeps_the_upload(make_hero):
+    hero = make_hero()
+    original = hero.background_image.read()
+
+    hero = processed(hero)
+    assert hero.image_status == PageHero.IMAGE_DONE
+    assert hero.image_processed_at is not None
+    assert hero.image_fingerprint == processing_fingerprint()
+    with default_storage.open(hero.optimized_image.name) as f, Image.open(f) as img:
+        assert img.format == 'JPEG'
+        assert img.size == (1800, 600)
+    with default_storage.open(hero.background_image.name) as f:
+        assert f.read() == original
+
+
+def test_unchanged_hero_is_not_reprocessed(make_hero, monkeypatch):
+    hero = processed(make_hero())
+
+    def generate(hero):
+        raise AssertionError('Unchanged image was processed again')
+
+    monkeypatch.setattr(images, 'generate_optimized_image', generate)
+    hero = processed(hero)
+    assert hero.image_status == PageHero.IMAGE_DONE
+
+
+def test_new_processing_parameters_reprocess(make_hero, monkeypatch):
+    hero = processed(make_hero())
+    processed_at = hero.image_processed_at
+
+    monkeypatch.setattr(images, 'IMAGE_PROCESSING_VERSION', images.IMAGE_PROCESSING_VERSION + 1)
+    assert processing_fingerprint() != hero.image_fingerprint
+    hero = processed(hero)
+    assert hero.image_fingerprint == processing_fingerprint()
+    assert hero.image_processed_at > processed_at
+
+
+def test_process_images_queues_outdated_heroes(make_hero):
+    current = processed(make_hero(page_identifier='home'))
+    outdated = make_hero(page_identifier='about')
+    BackgroundJob.objects.all().delete()
+
+    out = StringIO()
+    call_command('process_images', stdout=out)
+    assert 'Queued image processing for 1 hero(es)' in out.getvalue()
+    assert list(BackgroundJob.objects.values_list('args', flat=True)) == [[outdated.pk]]
+
+    BackgroundJob.objects.all().delete()
+    call_command('process_images', '--force', stdout=out)
+    assert sorted(BackgroundJob.objects.values_list('args', flat=True)) == sorted([[current.pk], [outdated.pk]])
+    # Forced jobs regenerate instead of skipping
+    assert PageHero.objects.get(pk=current.pk).image_hash == ''
+
+
+def test_renditions_cover_each_width_and_format(make_hero, rendition_widths):
+    hero = processed(make_hero())
+    formats = rendition_formats()
+
+    assert len(hero.renditions) == len(rendition_widths) * len(formats)
+    for rendition in hero.renditions:
+        with default_storage.open(rendition['name']) as f, Image.open(f) as img:
+            assert img.size == (rendition['width'], rendition['height'])
+            assert Image.MIME[img.format] == rendition['type']
+    assert {(r['width'], r['height']) for r in hero.renditions} == {(240, 80), (480, 160)}
+    assert [r['type'] for r in hero.renditions[:len(formats)]] == [mime_type for _, mime_type, _, _ in formats]
+
+
+def test_renditions_are_never_upscaled(make_hero):
+    hero = processed(make_hero(size=(300, 100)))
+    assert {r['width'] for r in hero.renditions} == {240}
+
+    small = processed(make_hero(size=(200, 100), page_identifier='about'))
+    assert {r['width'] for r in small.renditions} == {200}
+
+
+def test_replaced_image_drops_stale_renditions(make_hero):
+    hero = processed(make_hero())
+    old_names = {r['name'] for r in hero.renditions}
+    old_optimized = hero.optimized_image.name
+
+    hero.background_image = SimpleUploadedFile('campus.jpg', jpeg((300, 100)), content_type='image/jpeg')
+    hero.save()
+    hero = processed(hero)
+
+    assert all(not default_storage.exists(name) for name in old_names - {r['name'] for r in hero.renditions})
+    assert all(default_storage.exists(r['name']) for r in hero.renditions)
+    assert hero.optimized_image.name != old_optimized
+    assert not default_storage.exists(old_optimized)
+    assert default_storage.exists(hero.optimized_image.name)
+
+
+def test_srcset_and_sources_come_from_renditions(make_hero):
+    hero = processed(make_hero())
+    data = PageHeroSerializer(hero, context={'request': APIRequestFactory().get('/')}).data
+
+    jpegs = [r for r in hero.renditions if r['type'] == 'image/jpeg']
+    assert data['srcset'] == ', '.join(f"http://testserver/media/{r['name']} {r['width']}w" for r in jpegs)
+    assert [source['type'] for source in data['sources']] == [mime_type for _, mime_type, _, _ in rendition_formats()]
+    webp = next(source for source in data['sources'] if source['type'] == 'image/webp')
+    assert webp['srcset'].count('w, ') == 1
+    assert webp['srcset'].endswith('.webp 480w')
+
+
+def test_layout_metadata(make_hero):
+    hero = processed(make_hero())
+    assert (hero.image_width, hero.image_height) == (1800, 600)
+    red, green, blue = (int(hero.dominant_color[i:i + 2], 16) for i in (1, 3, 5))
+    assert abs(red - 26) <= 3 and abs(green - 42) <= 3 and abs(blue - 78) <= 3
+    assert hero.placeholder.startswith('data:image/jpeg;base64,')
+
+
+def test_failed_processing_stays_pending_until_retries_run_out(make_hero, monkeypatch, settings):
+    settings.BACKGROUND_JOBS_MAX_ATTEMPTS = 2
+
+    def generate(hero):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(images, 'generate_optimized_image', generate)
+    hero = make_hero()
+
+    run_pending()
+    hero.refresh_from_db()
+    assert (hero.image_status, hero.image_error) == (PageHero.IMAGE_PENDING, 'disk full')
+
+    BackgroundJob.objects.update(run_after=hero.created_at)
+    run_pending()
+    hero.refresh_from_db()
+    assert hero.image_status == PageHero.IMAGE_FAILED
+    assert BackgroundJob.objects.get().status == BackgroundJob.STATUS_FAILED
+
+
+def test_missing_file_fails_at_once(make_hero):
+    hero = make_hero()
+    default_storage.delete(hero.background_image.name)
+    hero = processed(hero)
+    assert hero.image_status == PageHero.IMAGE_FAILED
+    assert 'not found' in hero.image_error
@@ -0,0 +1,66 @@
+import logging
+import re
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .factories import PageHeroFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def hero_url():
+    PageHeroFactory(page_identifier='home')
+    return reverse('page-hero-detail', kwargs={'page_identifier': 'home'})
+
+
+def test_server_timing_reports_queries_and_duration(api_client, hero_url, settings):
+    settings.REQUEST_SERVER_TIMING = True
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(hero_url)
+
+    timing = response['Server-Timing']
+    db = re.search(r'db;dur=([0-9.]+);desc="([0-9]+) queries"', timing)
+    assert int(db[2]) == len(queries) > 0
+    assert float(db[1]) > 0
+    assert re.search(r'serializer;dur=[0-9.]+', timing)
+    assert re.search(r'total;dur=([0-9.]+)', timing)
+
+
+def test_server_timing_counts_cache_hits(api_client, hero_url, settings):
+    settings.REQUEST_SERVER_TIMING = True
+    api_client.get(hero_url)
+    timing = api_client.get(hero_url)['Server-Timing']
+    assert 'db;dur=0.00;desc="0 queries"' in timing
+    assert 'miss=0' in timing
+
+
+def test_no_server_timing_when_disabled(api_client, hero_url, settings):
+    settings.REQUEST_SERVER_TIMING = False
+    assert 'Server-Timing' not in api_client.get(hero_url)
+
+
+def test_slow_requests_are_logged_with_their_sql(api_client, hero_url, settings, caplog):
+    settings.REQUEST_SLOW_THRESHOLD_MS = 0
+    with caplog.at_level(logging.DEBUG, logger='core.requests'):
+        api_client.get(hero_url)
+
+    [record] = [record for record in caplog.records if record.name == 'core.requests']
+    assert record.levelno == logging.WARNING
+    assert record.getMessage().startswith(f'Slow request: GET {hero_url} 200')
+    assert record.queries == len(record.sql) > 0
+    assert any('core_pagehero' in sql for sql in record.sql)
+
+
+def test_fast_requests_are_logged_at_debug(api_client, hero_url, settings, caplog):
+    settings.REQUEST_SLOW_THRESHOLD_MS = 60_000
+    with caplog.at_level(logging.DEBUG, logger='core.requests'):
+        api_client.get(hero_url)
+
+    [record] = [record for record in caplog.records if record.name == 'core.requests']
+    assert record.levelno == logging.DEBUG
+    assert not hasattr(record, 'sql')
@@ -0,0 +1,160 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from core import jobs
+from core.jobs import _claim, claim_next_job, enqueue, requeue_stale_jobs, run_pending
+from core.models import BackgroundJob
+
+
+calls = []
+
+
+def record(*args, **kwargs):
+    calls.append((args, kwargs))
+
+
+def fail():
+    raise RuntimeError('boom')
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+@pytest.mark.django_db
+def test_claim_takes_the_oldest_runnable_job():
+    later = enqueue('core.tests.test_jobs.record', 'later', delay=60)
+    second = enqueue('core.tests.test_jobs.record', 'second')
+    first = enqueue('core.tests.test_jobs.record', 'first')
+    BackgroundJob.objects.filter(pk=first.pk).update(run_after=timezone.now() - timedelta(seconds=5))
+
+    job = claim_next_job()
+    assert job.pk == first.pk
+    assert (job.status, job.attempts) == (BackgroundJob.STATUS_RUNNING, 1)
+    assert job.locked_at is not None
+
+    assert claim_next_job().pk == second.pk
+    # Not due yet
+    assert claim_next_job() is None
+    assert BackgroundJob.objects.get(pk=later.pk).status == BackgroundJob.STATUS_PENDING
+
+
+@pytest.mark.django_db
+def test_a_job_is_claimed_once():
+    job = enqueue('core.tests.test_jobs.record')
+    assert _claim(job.pk, timezone.now()) is not None
+    assert _claim(job.pk, timezone.now()) is None
+
+
+@pytest.mark.django_db
+def test_worker_skips_a_job_another_worker_claimed(monkeypatch):
+    first = enqueue('core.tests.test_jobs.record')
+    second = enqueue('core.tests.test_jobs.record')
+    raced = []
+
+    def racing_claim(pk, now):
+        # Another worker claims the same job between listing and claiming
+        if not raced:
+            raced.append(_claim(pk, now))
+        return _claim(pk, now)
+
+    monkeypatch.setattr(jobs, '_claim', racing_claim)
+    assert claim_next_job().pk == second.pk
+    assert raced[0].pk == first.pk
+
+
+@pytest.mark.django_db
+def test_run_pending_runs_jobs_with_their_arguments():
+    enqueue('core.tests.test_jobs.record', 1, 'two', key='value')
+    assert run_pending() == 1
+    assert calls == [((1, 'two'), {'key': 'value'})]
+    assert BackgroundJob.objects.get().status == BackgroundJob.STATUS_DONE
+
+
+@pytest.mark.django_db
+def test_failed_job_is_retried_with_backoff_until_attempts_run_out(settings):
+    settings.BACKGROUND_JOBS_RETRY_DELAY = 30
+    job = enqueue('core.tests.test_jobs.fail', max_attempts=2)
+
+    before = timezone.now()
+    run_pending()
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (BackgroundJob.STATUS_PENDING, 1)
+    assert job.run_after >= before + timedelta(seconds=30)
+    assert 'RuntimeError: boom' in job.last_error
+
+    # The retry waits for its backoff
+    assert run_pending() == 0
+
+    BackgroundJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+    assert run_pending() == 1
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (BackgroundJob.STATUS_FAILED, 2)
+    assert run_pending() == 0
+
+
+@pytest.mark.django_db
+def test_stale_running_jobs_are_requeued(settings):
+    job = enqueue('core.tests.test_jobs.record')
+    _claim(job.pk, timezone.now() - timedelta(seconds=settings.BACKGROUND_JOBS_LOCK_TIMEOUT + 1))
+
+    assert requeue_stale_jobs() == 1
+    assert run_pending() == 1
+    job.refresh_from_db()
+    assert (job.status, job.attempts) == (BackgroundJob.STATUS_DONE, 2)
+
+
+@pytest.mark.django_db
+def test_eager_jobs_run_after_commit(settings, django_capture_on_commit_callbacks):
+    settings.BACKGROUND_JOBS_EAGER = True
+    with django_capture_on_commit_callbacks(execute=True):
+        enqueue('core.tests.test_jobs.record', 'eager')
+        assert calls == []
+    assert calls == [(('eager',), {})]
+
+
+@pytest.mark.skipif(
+    connection.vendor == 'sqlite',
+    reason="SQLite's shared in-memory test database fails concurrent writes instead of waiting",
+)
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_workers_run_each_job_once():
+    jobs = [enqueue('core.tests.test_jobs.record', i) for i in range(20)]
+    start = threading.Barrier(4)
+    errors = []
+
+    def worker():
+        try:
+            start.wait()
+            run_pending()
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert sorted(args[0] for args, _ in calls) == list(range(20))
+    assert set(BackgroundJob.objects.filter(pk__in=[job.pk for job in jobs]).values_list('attempts', flat=True)) == {1}
+
+
+@pytest.mark.django_db
+def test_run_jobs_once_command():
+    enqueue('core.tests.test_jobs.record', 'a')
+    enqueue('core.tests.test_jobs.record', 'b')
+    out = StringIO()
+    call_command('run_jobs', '--once', stdout=out)
+    assert 'Ran 2 job(s)' in out.getvalue()
+    assert len(calls) == 2
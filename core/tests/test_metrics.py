@@ -0,0 +1,31 @@
+import pytest
+from django.urls import reverse
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def metrics_token(settings):
+    settings.METRICS_AUTH_TOKEN = 'scrape-secret'
+    return settings.METRICS_AUTH_TOKEN
+
+
+def test_disabled_without_a_token(client, settings):
+    settings.METRICS_AUTH_TOKEN = ''
+    assert client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer ').status_code == 404
+
+
+@pytest.mark.parametrize('authorization', [None, 'Bearer wrong', 'scrape-secret', 'Token scrape-secret'])
+def test_rejects_other_credentials(client, metrics_token, authorization):
+    headers = {'HTTP_AUTHORIZATION': authorization} if authorization else {}
+    response = client.get(reverse('metrics'), **headers)
+    assert response.status_code == 401
+    assert b'niru_' not in response.content
+
+
+def test_serves_metrics_with_the_token(client, metrics_token):
+    response = client.get(reverse('metrics'), HTTP_AUTHORIZATION=f'Bearer {metrics_token}')
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain')
+    assert b'niru_request_duration_seconds' in response.content
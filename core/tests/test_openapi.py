@@ -0,0 +1,56 @@
+import json
+
+import pytest
+from django.contrib.staticfiles import finders
+from django.urls import reverse
+
+from core.openapi import SCHEMA_NAME, OpenAPISchemaFinder, build_schema
+
+
+@pytest.fixture
+def schema_root(settings, tmp_path):
+    settings.OPENAPI_SCHEMA_ROOT = tmp_path
+    return tmp_path
+
+
+def test_build_schema_documents_the_api(schema_root):
+    path, changed = build_schema()
+    assert changed
+    assert path == schema_root / SCHEMA_NAME
+
+    schema = json.loads(path.read_bytes())
+    assert set(schema['paths']) == {'/api/v1/page-hero/{page_identifier}/', '/api/v1/site-settings/', '/api/v1/search/'}
+    hero = schema['paths']['/api/v1/page-hero/{page_identifier}/']['get']
+    assert {'fields', 'omit'} <= {parameter['name'] for parameter in hero['parameters']}
+    assert hero['responses']['200']['content']['application/json']['schema'] == {'$ref': '#/components/schemas/PageHero'}
+
+
+def test_unchanged_schema_is_not_rewritten(schema_root):
+    path, _ = build_schema()
+    mtime = path.stat().st_mtime_ns
+    assert build_schema() == (path, False)
+    assert path.stat().st_mtime_ns == mtime
+
+
+def test_finder_builds_the_schema_for_collectstatic(schema_root):
+    finder = OpenAPISchemaFinder()
+    [(name, storage)] = finder.list(ignore_patterns=[])
+    assert name == SCHEMA_NAME
+    assert storage.exists(SCHEMA_NAME)
+    assert finder.find(SCHEMA_NAME) == storage.path(SCHEMA_NAME)
+    assert finder.find('css/site.css') == []
+
+
+def test_finder_is_configured(schema_root):
+    assert finders.find(SCHEMA_NAME) == str(schema_root / SCHEMA_NAME)
+
+
+@pytest.mark.django_db
+def test_swagger_ui_points_at_the_static_schema(client, monkeypatch):
+    def generate_schema():
+        raise AssertionError('The schema must not be generated per request')
+
+    monkeypatch.setattr('core.openapi.generate_schema', generate_schema)
+    response = client.get(reverse('api-docs'))
+    assert response.status_code == 200
+    assert b'/static/openapi/schema.json' in response.content
@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import generics, serializers
+from rest_framework.test import APIRequestFactory
+
+from core.models import PageHero
+from core.pagination import KeysetPagination
+
+from .factories import PageHeroFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+class HeroSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PageHero
+        fields = ['id', 'page_identifier']
+
+
+class HeroList(generics.ListAPIView):
+    queryset = PageHero.objects.all()
+    serializer_class = HeroSerializer
+    pagination_class = KeysetPagination
+    authentication_classes = []
+    permission_classes = []
+    throttle_classes = []
+    keyset_field = None
+
+
+@pytest.fixture
+def heroes():
+    heroes = [PageHeroFactory(page_identifier=page_id) for page_id, _ in PageHero.PAGE_CHOICES]
+    now = timezone.now()
+    for i, hero in enumerate(heroes):
+        # Pairs of equal timestamps exercise the id tie-breaker; every third
+        # row has no processed date to exercise NULL ordering
+        PageHero.objects.filter(pk=hero.pk).update(
+            created_at=now - timedelta(minutes=i // 2),
+            image_processed_at=None if i % 3 == 0 else now - timedelta(hours=i // 2),
+        )
+    return heroes
+
+
+def get(url='/heroes/', view=HeroList, **kwargs):
+    return view.as_view(**kwargs)(APIRequestFactory().get(url)).data
+
+
+def walk(link, direction, **kwargs):
+    ids = []
+    while link:
+        page = get(link, **kwargs)
+        ids.append([row['id'] for row in page['results']])
+        link = page[direction]
+    return ids
+
+
+def expected_order(field):
+    rows = PageHero.objects.values_list(field, 'pk')
+    # NULLs sort above every value
+    return [pk for value, pk in sorted(rows, key=lambda r: (r[0] is None, r[0] or 0, r[1]), reverse=True)]
+
+
+@pytest.mark.parametrize('field', ['created_at', 'image_processed_at'])
+def test_pages_cover_every_row_once_in_order(heroes, field):
+    pages = walk('/heroes/?page_size=3', 'next', keyset_field=field)
+
+    assert [len(page) for page in pages] == [3, 3, 3, 2]
+    assert sum(pages, []) == expected_order(field)
+
+
+@pytest.mark.parametrize('field', ['created_at', 'image_processed_at'])
+def test_previous_links_walk_back_to_the_first_page(heroes, field):
+    last = walk('/heroes/?page_size=4', 'next', keyset_field=field)
+    page = get('/heroes/?page_size=4', keyset_field=field)
+    while page['next']:
+        page = get(page['next'], keyset_field=field)
+
+    back = walk(page['previous'], 'previous', keyset_field=field)
+
+    assert back == last[:-1][::-1]
+
+
+def test_no_count_query_unless_requested(heroes):
+    with CaptureQueriesContext(connection) as queries:
+        page = get('/heroes/')
+
+    assert 'count' not in page
+    assert len(queries) == 1
+    assert 'COUNT' not in queries[0]['sql'].upper()
+    assert 'OFFSET' not in queries[0]['sql'].upper()
+
+
+def test_approximate_count(heroes):
+    page = get('/heroes/?count=approximate&page_size=2')
+    assert page['count'] == len(heroes)
+    assert page['count_is_estimate'] is False
+
+    KeysetPagination.approximate_count_limit, limit = 5, KeysetPagination.approximate_count_limit
+    try:
+        page = get('/heroes/?count=approximate')
+    finally:
+        KeysetPagination.approximate_count_limit = limit
+    assert page['count'] == 5
+    assert page['count_is_estimate'] is True
+
+
+def test_invalid_cursor_is_404(heroes):
+    request = APIRequestFactory().get('/heroes/?cursor=not-a-cursor')
+    assert HeroList.as_view()(request).status_code == 404
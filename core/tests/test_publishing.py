@@ -0,0 +1,110 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import connection, models
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, throttle_classes
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from core.cache import (
+    cache_api_response, get_api_cache, get_model_versions, next_publish_date, register_cached_model,
+)
+from core.models import BackgroundJob, PublishableModel
+from core.publishing import GO_LIVE_TASK, go_live, schedule_next_publish
+
+
+@pytest.fixture
+def Article(temporary_model):
+    Article = temporary_model('Article', (PublishableModel,), title=models.CharField(max_length=100))
+    register_cached_model(Article)
+    return Article
+
+
+@pytest.fixture
+def articles(Article):
+    return Article.objects
+
+
+@pytest.fixture
+def get_titles(Article):
+    @api_view(['GET'])
+    @authentication_classes([])
+    @permission_classes([])
+    @throttle_classes([])
+    @cache_api_response(Article)
+    def article_list(request):
+        return Response([article.title for article in Article.objects.published().order_by('pk')])
+
+    return lambda: article_list(APIRequestFactory().get('/articles/')).data
+
+
+def test_published_and_scheduled(articles):
+    now = timezone.now()
+    articles.create(title='undated')
+    articles.create(title='past', publish_date=now - timedelta(days=1))
+    articles.create(title='future', publish_date=now + timedelta(days=1))
+    articles.create(title='draft', is_published=False, publish_date=now - timedelta(days=1))
+
+    assert sorted(articles.published().values_list('title', flat=True)) == ['past', 'undated']
+    assert list(articles.scheduled().values_list('title', flat=True)) == ['future']
+    assert articles.next_publish_date() == now + timedelta(days=1)
+    assert articles.next_publish_date(now + timedelta(days=2)) is None
+
+
+def test_cached_response_expires_when_scheduled_row_goes_live(Article, articles, get_titles, monkeypatch):
+    now = timezone.now()
+    monkeypatch.setattr('core.cache.timezone.now', lambda: now)
+    articles.create(title='live')
+    scheduled = articles.create(title='scheduled', publish_date=now + timedelta(seconds=30))
+
+    cache = get_api_cache()
+    timeouts = {}
+    cache_set = cache.set
+
+    def record_timeout(key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        timeouts[key] = timeout
+        cache_set(key, value, timeout, version)
+
+    monkeypatch.setattr(cache, 'set', record_timeout)
+
+    assert get_titles() == ['live']
+    with CaptureQueriesContext(connection) as queries:
+        assert get_titles() == ['live']
+    assert len(queries) == 0
+    assert next_publish_date([Article]) == scheduled.publish_date
+    # The response and the cached next publish date both expire as the row goes live
+    assert len(timeouts) == 2
+    assert set(timeouts.values()) == {30}
+
+    # Past that moment: the entries have expired and the database sees the row as live
+    for key in timeouts:
+        cache.delete(key)
+    articles.filter(pk=scheduled.pk).update(publish_date=now - timedelta(seconds=1))
+
+    assert get_titles() == ['live', 'scheduled']
+    assert next_publish_date([Article]) is None
+
+
+def test_schedule_next_publish_queues_one_job(Article, articles):
+    publish_date = timezone.now() + timedelta(hours=1)
+    articles.create(title='scheduled', publish_date=publish_date)
+    articles.create(title='later', publish_date=publish_date + timedelta(hours=1))
+
+    assert schedule_next_publish(Article) == publish_date
+    assert schedule_next_publish(Article) == publish_date
+
+    job = BackgroundJob.objects.get(task=GO_LIVE_TASK)
+    assert job.args == ['core.Article', publish_date.isoformat()]
+    assert abs(job.run_after - publish_date) < timedelta(seconds=5)
+
+
+def test_go_live_bumps_version_only_once_due(Article):
+    [version] = get_model_versions([Article])
+    go_live('core.Article', (timezone.now() + timedelta(hours=1)).isoformat())
+    assert get_model_versions([Article]) == [version]
+
+    go_live('core.Article', timezone.now().isoformat())
+    assert get_model_versions([Article]) != [version]
@@ -0,0 +1,75 @@
+import io
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core import renderers
+from core.renderers import ORJSONParser, ORJSONRenderer
+from core.serializers import PageHeroSerializer
+
+from .factories import PageHeroFactory
+
+
+DATA = {
+    'text': 'Chuo Kikuu — ñ',
+    'number': 1.5,
+    'flags': [True, False, None],
+    'decimal': Decimal('12.50'),
+    'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'lazy': gettext_lazy('Home'),
+    'duration': timedelta(seconds=90),
+    'nested': {'ids': (1, 2, 3)},
+}
+
+
+def test_output_matches_drf_renderer():
+    assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+
+@pytest.mark.django_db
+def test_serializer_output_matches_drf_renderer():
+    context = {'request': Request(APIRequestFactory().get('/'))}
+    data = PageHeroSerializer(PageHeroFactory(), context=context).data
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+def test_stdlib_fallbacks():
+    big = {'value': 2 ** 70}
+    assert ORJSONRenderer().render(big) == b'{"value":1180591620717411303424}'
+    indented = ORJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+    assert indented == JSONRenderer().render({'a': 1}, 'application/json; indent=4')
+    assert ORJSONRenderer().render(None) == b''
+
+
+def test_dumps_sorts_keys():
+    assert renderers.dumps({'b': 1, 'a': 2}, sort_keys=True) == b'{"a":2,"b":1}'
+
+
+@pytest.mark.parametrize('content', [b'{"a": [1, 2.5, "\\u00f1"]}', '{"a": "ñ"}'.encode('utf-8')])
+def test_parser_matches_drf_parser(content):
+    assert ORJSONParser().parse(io.BytesIO(content)) == JSONParser().parse(io.BytesIO(content))
+
+
+def test_parser_decodes_other_charsets():
+    content = '{"a": "ñ"}'.encode('latin-1')
+    assert ORJSONParser().parse(io.BytesIO(content), parser_context={'encoding': 'latin-1'}) == {'a': 'ñ'}
+
+
+@pytest.mark.parametrize('content', [b'', b'{"a":', b'{"a": NaN}'])
+def test_parser_rejects_invalid_json(content):
+    with pytest.raises(ParseError):
+        ORJSONParser().parse(io.BytesIO(content))
+
+
+def test_without_orjson_the_drf_classes_are_used(monkeypatch):
+    monkeypatch.setattr(renderers, 'orjson', None)
+    assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+    assert ORJSONParser().parse(io.BytesIO(b'{"a": 1}')) == {'a': 1}
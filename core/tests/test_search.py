@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import PublishableModel, SearchDocument, SEOModel
+from core.search import _search_models, rebuild_index, register_search_model, search
+
+
+@pytest.fixture
+def Article(temporary_model):
+    Article = temporary_model(
+        'Article', (SEOModel, PublishableModel),
+        headline=models.CharField(max_length=200),
+        content=models.TextField(blank=True),
+    )
+    register_search_model(Article, body_fields=['content'], title_field='headline',
+                          url=lambda article: f'/news/{article.pk}/')
+    yield Article
+    _search_models.pop(Article)
+
+
+def titles(query, **kwargs):
+    return [document.title for document in search(query, **kwargs)]
+
+
+def test_saves_and_deletes_keep_the_index_in_sync(Article):
+    article = Article.objects.create(headline='Library opening hours', content='<p>Open on <b>Sundays</b></p>')
+    document = SearchDocument.objects.get()
+    assert (document.title, document.body, document.url) == ('Library opening hours', 'Open on Sundays', f'/news/{article.pk}/')
+    assert titles('sunday') == ['Library opening hours']
+
+    article.content = 'Closed for renovation'
+    article.save()
+    assert titles('sunday') == []
+    assert titles('renovations') == ['Library opening hours']
+
+    article.delete()
+    assert titles('renovation') == []
+    assert not SearchDocument.objects.exists()
+
+
+def test_results_are_ranked_by_field_weight(Article):
+    Article.objects.create(headline='Campus news', content='A new cyber security lab opens')
+    Article.objects.create(headline='Cyber security programme', meta_title='Cyber Security MSc')
+    Article.objects.create(headline='Research update', meta_keywords='cyber, security')
+
+    assert titles('cyber security') == ['Cyber Security MSc', 'Research update', 'Campus news']
+
+
+def test_only_published_content_is_found(Article):
+    now = timezone.now()
+    Article.objects.create(headline='Graduation live')
+    Article.objects.create(headline='Graduation draft', is_published=False)
+    Article.objects.create(headline='Graduation scheduled', publish_date=now + timedelta(days=1))
+    Article.objects.create(headline='Graduation past', publish_date=now - timedelta(days=1))
+
+    assert sorted(titles('graduation')) == ['Graduation live', 'Graduation past']
+
+
+def test_rebuild_index_drops_orphans(Article):
+    Article.objects.create(headline='Admissions open')
+    Article.objects.bulk_create([Article(headline=f'Admissions notice {i}') for i in range(3)])
+    Article.objects.filter(headline='Admissions open').delete()
+    SearchDocument.objects.create(
+        content_type=ContentType.objects.get_for_model(Article), object_id='999', title='Admissions orphan',
+    )
+
+    assert rebuild_index([Article], batch_size=2) == 3
+    assert sorted(titles('admissions')) == [f'Admissions notice {i}' for i in range(3)]
+
+
+def test_search_endpoint(Article, api_client):
+    for i in range(25):
+        Article.objects.create(headline=f'Scholarship {i}', meta_description='Funding for students')
+    url = reverse('search')
+
+    first = api_client.get(url, {'q': 'scholarship', 'type': 'core.article'}).json()
+    second = api_client.get(first['next']).json()
+
+    assert len(first['results']) == 20
+    assert len(second['results']) == 5
+    assert second['next'] is None
+    assert first['results'][0]['type'] == 'core.article'
+    assert first['results'][0]['description'] == 'Funding for students'
+    assert api_client.get(url, {'q': 'scholarship', 'type': 'core.nothing'}).status_code == 400
+    assert api_client.get(url).json()['results'] == []
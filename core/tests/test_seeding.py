@@ -0,0 +1,34 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.authtoken.models import Token
+
+from core.seeding import generate_users, placeholder_image
+
+
+@pytest.mark.django_db
+def test_generate_users_creates_users_with_tokens_in_batches():
+    batches = []
+    assert generate_users(25, batch_size=10, progress=lambda done, total: batches.append(done)) == 25
+    assert batches == [10, 20, 25]
+    assert Token.objects.count() == 25
+
+    # Repeated runs continue the numbering
+    generate_users(5, batch_size=10)
+    assert get_user_model().objects.filter(username='loadtest-29').exists()
+
+
+@pytest.mark.django_db
+def test_generate_users_numbers_after_the_highest_suffix():
+    User = get_user_model()
+    generate_users(3)
+    User.objects.filter(username='loadtest-1').delete()
+    User.objects.create(username='loadtest-admin')
+
+    generate_users(2)
+    assert sorted(User.objects.filter(username__regex=r'[0-9]$').values_list('username', flat=True)) == [
+        'loadtest-0', 'loadtest-2', 'loadtest-3', 'loadtest-4',
+    ]
+
+
+def test_placeholder_image_is_a_jpeg():
+    assert placeholder_image('Home', seed=1, size=(64, 20))[:2] == b'\xff\xd8'
@@ -0,0 +1,81 @@
+import pytest
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+
+from core.models import PageHero, SearchDocument
+from core.serializers import FieldPlanMixin, PageHeroSerializer
+
+from .factories import PageHeroFactory, SearchDocumentFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def context():
+    return {'request': APIRequestFactory().get('/')}
+
+
+def test_field_plan_matches_drf_representation(context):
+    hero = PageHeroFactory(page_identifier='home', optimized_image='heroes/optimized/1/home hero.jpg')
+    serializer = PageHeroSerializer(hero, context=context)
+
+    assert serializer.data == serializers.ModelSerializer.to_representation(serializer, hero)
+    assert serializer.data['background_image_url'] == 'http://testserver/media/heroes/optimized/1/home%20hero.jpg'
+
+
+class ContentTypeSerializer(serializers.Serializer):
+    app_label = serializers.CharField()
+    model = serializers.CharField()
+
+
+class LinkSerializer(serializers.Serializer):
+    url = serializers.CharField()
+    object_id = serializers.CharField()
+
+
+class DocumentSerializer(FieldPlanMixin, serializers.ModelSerializer):
+    model_name = serializers.CharField(source='content_type.model')
+    content_type_detail = ContentTypeSerializer(source='content_type')
+    content_type_name = serializers.StringRelatedField(source='content_type')
+    link = LinkSerializer(source='*')
+
+    class Meta:
+        model = SearchDocument
+        fields = [
+            'id', 'title', 'content_type', 'model_name', 'content_type_detail', 'content_type_name',
+            'link', 'is_published', 'publish_date',
+        ]
+
+
+def test_related_and_dotted_fields_match_drf_representation(context):
+    document = SearchDocumentFactory(publish_date=None)
+    serializer = DocumentSerializer(document, context=context)
+
+    assert serializer.data == serializers.ModelSerializer.to_representation(serializer, document)
+    assert serializer.data['content_type'] == document.content_type_id
+    assert serializer.data['model_name'] == 'pagehero'
+    assert serializer.data['link'] == {'url': document.url, 'object_id': document.object_id}
+    kinds = {name: kind for name, kind, _, _ in DocumentSerializer.field_plan()}
+    assert kinds == {
+        'id': 'value', 'title': 'value', 'is_published': 'value', 'publish_date': 'datetime',
+        'content_type': 'field', 'model_name': 'field', 'content_type_detail': 'field',
+        'content_type_name': 'field', 'link': 'field',
+    }
+
+
+def test_values_rows_serialize_like_instances(context):
+    PageHeroFactory.create_batch(3)
+    instances = PageHeroSerializer(PageHero.objects.order_by('pk'), many=True, context=context).data
+    rows = PageHeroSerializer(PageHero.objects.order_by('pk').values(), many=True, context=context).data
+
+    assert rows == instances
+
+
+def test_media_base_url_setting(context, settings):
+    settings.MEDIA_BASE_URL = 'https://cdn.example.org/media/'
+    hero = PageHeroFactory(page_identifier='home')
+
+    data = PageHeroSerializer(hero, context=context).data
+    assert data['background_image_url'] == 'https://cdn.example.org/media/heroes/home-hero.jpg'
+    assert data['srcset'].startswith('https://cdn.example.org/media/heroes/renditions/home/hero-480w.jpg 480w')
@@ -0,0 +1,40 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import IntegrityError, transaction
+
+from core.models import SiteSettings
+
+from .factories import SiteSettingsFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_load_creates_the_singleton_row_once():
+    first = SiteSettings.load()
+    assert first.pk == SiteSettings.SINGLETON_PK
+    assert SiteSettings.load().pk == first.pk
+    assert async_to_sync(SiteSettings.aload)().pk == first.pk
+    assert SiteSettings.objects.count() == 1
+
+
+def test_second_create_fails_instead_of_overwriting():
+    SiteSettings.objects.create(short_name='NIRU', maintenance_mode=True)
+    with pytest.raises(IntegrityError), transaction.atomic():
+        SiteSettings.objects.create(short_name='NIRU2')
+
+    assert SiteSettings.load().short_name == 'NIRU'
+    assert SiteSettings.load().maintenance_mode is True
+
+
+def test_database_rejects_other_primary_keys():
+    with pytest.raises(IntegrityError), transaction.atomic():
+        SiteSettings.objects.create(pk=2)
+
+
+def test_factory_updates_the_row():
+    SiteSettingsFactory(maintenance_mode=True)
+    SiteSettingsFactory(tagline='Updated')
+
+    assert SiteSettings.objects.count() == 1
+    assert SiteSettings.load().tagline == 'Updated'
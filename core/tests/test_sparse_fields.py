@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .factories import PageHeroFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def hero_url(page_identifier='home'):
+    return reverse('page-hero-detail', kwargs={'page_identifier': page_identifier})
+
+
+def test_fields_limits_the_payload(api_client):
+    PageHeroFactory(page_identifier='home', title='Welcome')
+    response = api_client.get(hero_url(), {'fields': 'title,background_image_url'})
+    assert response.status_code == 200
+    assert set(response.json()) == {'title', 'background_image_url'}
+    assert response.json()['title'] == 'Welcome'
+
+
+def test_omit_removes_fields(api_client):
+    PageHeroFactory(page_identifier='home')
+    full = api_client.get(hero_url()).json()
+    data = api_client.get(hero_url(), {'omit': 'sources,srcset'}).json()
+    assert set(data) == set(full) - {'sources', 'srcset'}
+
+
+def test_unknown_field_is_a_bad_request(api_client):
+    PageHeroFactory(page_identifier='home')
+    response = api_client.get(hero_url(), {'fields': 'title,password'})
+    assert response.status_code == 400
+    assert 'password' in str(response.json())
+
+
+def test_fields_narrows_the_select(api_client):
+    PageHeroFactory(page_identifier='home')
+    with CaptureQueriesContext(connection) as queries:
+        api_client.get(hero_url(), {'fields': 'title'})
+    hero_query = queries.captured_queries[-1]['sql']
+    assert '"title"' in hero_query
+    assert '"subtitle"' not in hero_query
+    assert '"renditions"' not in hero_query
+
+
+def test_each_field_set_gets_its_own_etag(api_client):
+    PageHeroFactory(page_identifier='home')
+    titles = api_client.get(hero_url(), {'fields': 'title'})
+    full = api_client.get(hero_url())
+    assert titles['ETag'] != full['ETag']
+    assert api_client.get(hero_url(), {'fields': 'title'}, HTTP_IF_NONE_MATCH=titles['ETag']).status_code == 304
@@ -0,0 +1,90 @@
+import gzip
+import json
+
+import brotli
+import pytest
+from django.core.management import call_command
+from PIL import Image, ImageCms
+
+
+ORIENTATION = 0x0112
+
+SRGB_PROFILE = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB')).tobytes()
+
+
+@pytest.fixture
+def collectstatic(settings, tmp_path):
+    source = tmp_path / 'static'
+    (source / 'css').mkdir(parents=True)
+    (source / 'images').mkdir()
+
+    # Uncompressed PNG and JPEG without Huffman optimization leave room to recompress
+    Image.linear_gradient('L').convert('RGB').resize((256, 256)).save(source / 'images' / 'board.png', compress_level=0)
+    Image.linear_gradient('L').convert('RGB').resize((256, 256)).save(source / 'images' / 'photo.jpg', quality=90)
+    # Camera-style JPEG: colour profile and rotated by its EXIF orientation
+    exif = Image.Exif()
+    exif[ORIENTATION] = 6
+    Image.linear_gradient('L').convert('RGB').resize((256, 128)).save(
+        source / 'images' / 'camera.jpg', quality=90, exif=exif, icc_profile=SRGB_PROFILE,
+    )
+    (source / 'css' / 'site.css').write_text('.hero { color: #1a2a4e; }\n' * 200)
+    (source / 'css' / 'tiny.css').write_text('a{}')
+
+    settings.STATICFILES_DIRS = [source]
+    settings.STATIC_ROOT = tmp_path / 'collected'
+    settings.STATICFILES_FINDERS = ['django.contrib.staticfiles.finders.FileSystemFinder']
+    settings.STORAGES = {
+        **settings.STORAGES,
+        'staticfiles': {'BACKEND': 'core.storage.OptimizedManifestStaticFilesStorage'},
+    }
+    call_command('collectstatic', interactive=False, verbosity=0)
+
+    root = settings.STATIC_ROOT
+    manifest = json.loads((root / 'staticfiles.json').read_text())['paths']
+    return source, root, manifest
+
+
+def test_hashed_images_are_recompressed_with_webp_siblings(collectstatic):
+    source, root, manifest = collectstatic
+
+    for name in ('images/board.png', 'images/photo.jpg'):
+        hashed = root / manifest[name]
+        # Only the hashed copy is touched
+        assert (root / name).stat().st_size == (source / name).stat().st_size
+        assert hashed.stat().st_size <= (source / name).stat().st_size
+        with Image.open(hashed) as img, Image.open(source / name) as original:
+            assert img.size == original.size
+        with Image.open(f'{hashed}.webp') as webp:
+            assert webp.format == 'WEBP'
+
+    assert (root / manifest['images/board.png']).stat().st_size < (source / 'images' / 'board.png').stat().st_size
+    with Image.open(root / manifest['images/photo.jpg']) as img:
+        assert img.info.get('progressive')
+
+
+def test_images_keep_colour_profile_and_orientation(collectstatic):
+    _, root, manifest = collectstatic
+    hashed = root / manifest['images/camera.jpg']
+
+    for path in (hashed, f'{hashed}.webp'):
+        with Image.open(path) as img:
+            assert img.info.get('icc_profile') == SRGB_PROFILE
+            # Rotated pixels, without an orientation tag left to rotate them again
+            assert img.size == (128, 256)
+            assert img.getexif().get(ORIENTATION, 1) == 1
+    with Image.open(hashed) as img:
+        assert img.info.get('progressive')
+
+
+def test_text_assets_get_gzip_and_brotli_variants(collectstatic):
+    _, root, manifest = collectstatic
+    hashed = root / manifest['css/site.css']
+    content = hashed.read_bytes()
+
+    assert gzip.decompress((root / f"{manifest['css/site.css']}.gz").read_bytes()) == content
+    assert brotli.decompress((root / f"{manifest['css/site.css']}.br").read_bytes()) == content
+    assert not (root / 'css' / 'site.css.gz').exists()
+
+    # Variants that save nothing are not kept
+    tiny = root / manifest['css/tiny.css']
+    assert not tiny.with_name(tiny.name + '.gz').exists()
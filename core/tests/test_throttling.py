@@ -0,0 +1,103 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from core.throttling import AnonCounterRateThrottle
+
+
+class FakeClock:
+    def __init__(self, now=6000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=['locmem', 'file'])
+def throttle_cache(request, settings, tmp_path):
+    backends = {
+        'locmem': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'throttle-tests'},
+        'file': {'BACKEND': 'core.cache_backends.AtomicFileBasedCache', 'LOCATION': str(tmp_path)},
+    }
+    with override_settings(CACHES={**settings.CACHES, 'throttle': backends[request.param]}, THROTTLE_CACHE_ALIAS='throttle'):
+        caches['throttle'].clear()
+        yield caches['throttle']
+
+
+def make_throttle(clock, rate='3/min'):
+    throttle = AnonCounterRateThrottle()
+    throttle.rate = rate
+    throttle.num_requests, throttle.duration = throttle.parse_rate(rate)
+    throttle.timer = clock
+    return throttle
+
+
+def allow(clock, rate='3/min'):
+    throttle = make_throttle(clock, rate)
+    request = APIRequestFactory().get('/', REMOTE_ADDR='10.0.0.1')
+    request.user = AnonymousUser()
+    return throttle.allow_request(request, None), throttle
+
+
+def test_limit_applies_within_a_window(throttle_cache):
+    clock = FakeClock()
+    assert [allow(clock)[0] for _ in range(4)] == [True, True, True, False]
+
+
+def test_previous_window_decays(throttle_cache):
+    clock = FakeClock()
+    for _ in range(3):
+        allow(clock)
+
+    # A quarter into the next window the previous 3 requests still weigh 2.25
+    clock.now += 75
+    allowed, throttle = allow(clock)
+    assert not allowed
+    assert throttle.wait() == pytest.approx(5)
+
+    # A third into it they weigh 2, leaving room for one request
+    clock.now += 5
+    assert allow(clock)[0]
+    assert not allow(clock)[0]
+
+
+def test_rejected_requests_are_not_counted(throttle_cache):
+    clock = FakeClock()
+    for _ in range(10):
+        allow(clock)
+    assert throttle_cache.get('throttle_anon_10.0.0.1:100') == 3
+
+
+def test_request_rejected_after_a_race_is_taken_back_out(throttle_cache, monkeypatch):
+    clock = FakeClock()
+    add = type(throttle_cache).add
+
+    def add_after_other_requests(cache, *args, **kwargs):
+        # Three other workers fill the window between the read and the incr()
+        monkeypatch.setattr(type(throttle_cache), 'add', add)
+        for _ in range(3):
+            assert allow(clock)[0]
+        return add(cache, *args, **kwargs)
+
+    monkeypatch.setattr(type(throttle_cache), 'add', add_after_other_requests)
+    allowed, throttle = allow(clock)
+    assert not allowed
+    assert throttle.current == 3
+    assert throttle_cache.get('throttle_anon_10.0.0.1:100') == 3
+
+
+def test_file_cache_culls_expired_entries_before_live_counters(tmp_path):
+    backend = {'BACKEND': 'core.cache_backends.AtomicFileBasedCache', 'LOCATION': str(tmp_path),
+               'OPTIONS': {'MAX_ENTRIES': 5}}
+    with override_settings(CACHES={'counters': backend}):
+        cache = caches['counters']
+        cache.set('counter', 1, None)
+        for n in range(4):
+            cache.set(f'expired-{n}', n, 0)
+        # The cache is full: the expired entries make room for new ones
+        for n in range(4):
+            cache.set(f'live-{n}', n)
+        assert cache.get('counter') == 1
+        assert cache.get_many([f'live-{n}' for n in range(4)]) == {f'live-{n}': n for n in range(4)}
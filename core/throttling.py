@@ -0,0 +1,91 @@
+"""
+DRF throttles backed by shared, atomically incremented window counters.
+
+DRF's SimpleRateThrottle keeps a list with one timestamp per request for
+every client and rewrites it on each request, so concurrent workers can lose
+updates and memory grows with the rate. These throttles keep two integers
+per client, the request counts of the current and the previous fixed window,
+and estimate a sliding window from them:
+
+    estimate = previous * (1 - elapsed fraction of current window) + current
+
+Counters live in the THROTTLE_CACHE_ALIAS cache and are updated with
+cache.incr()/decr(), which are atomic on Redis, locmem and
+AtomicFileBasedCache, so every worker sharing that cache enforces the same
+limit. A locmem cache is per process; staging and production settings
+refuse it.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+
+
+class SlidingWindowCounterMixin:
+    """
+    Replace SimpleRateThrottle's timestamp history with window counters.
+    Rates, scopes and cache keys are those of the throttle class it is mixed into.
+    """
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, offset = divmod(self.now, self.duration)
+        current_key = f'{self.key}:{int(window)}'
+        previous_key = f'{self.key}:{int(window) - 1}'
+        self.weight = 1 - offset / self.duration
+        self.offset = offset
+
+        counts = self.cache.get_many([current_key, previous_key])
+        self.previous = counts.get(previous_key, 0)
+        self.current = counts.get(current_key, 0)
+        if self.estimate() + 1 > self.num_requests:
+            return self.throttle_failure()
+
+        # Counters outlive their window by one window, for the next estimate
+        self.cache.add(current_key, 0, 2 * self.duration)
+        try:
+            self.current = self.cache.incr(current_key)
+        except ValueError:
+            # Expired between add() and incr()
+            self.cache.set(current_key, 1, 2 * self.duration)
+            self.current = 1
+        # Concurrent requests may have filled the window since get_many().
+        # Take this request back out, so rejected requests are never counted.
+        if self.estimate() > self.num_requests:
+            try:
+                self.current = self.cache.decr(current_key)
+            except ValueError:
+                # Expired since incr()
+                self.current = 0
+            return self.throttle_failure()
+        return True
+
+    def estimate(self):
+        return self.previous * self.weight + self.current
+
+    def wait(self):
+        remaining = self.duration - self.offset
+        if self.current >= self.num_requests or not self.previous:
+            return remaining
+        # The previous window's share decays linearly; find when it has
+        # decayed enough for one more request within the current window
+        decay = self.previous * self.weight - (self.num_requests - 1 - self.current)
+        return min(remaining, max(0.0, decay / self.previous * self.duration))
+
+
+class AnonCounterRateThrottle(SlidingWindowCounterMixin, AnonRateThrottle):
+    pass
+
+
+class UserCounterRateThrottle(SlidingWindowCounterMixin, UserRateThrottle):
+    pass
@@ -1,9 +1,17 @@
-from rest_framework import generics, status
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, inline_serializer
+from rest_framework import generics, serializers, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.decorators import api_view
+from django.apps import apps
 from django.shortcuts import get_object_or_404
-from .models import PageHero
-from .serializers import PageHeroSerializer
+from .cache import cache_api_response, get_site_settings
+from .conditional import conditional_model_view
+from .models import PageHero, SearchDocument
+from .pagination import RankedPagination
+from .search import search as search_documents, search_models
+from .serializers import PageHeroSerializer, SearchResultSerializer, SiteSettingsSerializer
 
 
 class PageHeroDetailView(generics.RetrieveAPIView):
@@ -16,17 +24,94 @@ class PageHeroDetailView(generics.RetrieveAPIView):
         return get_object_or_404(PageHero, page_identifier=page_identifier)
 
 
+SPARSE_FIELDS_PARAMETERS = [
+    OpenApiParameter('fields', OpenApiTypes.STR, description='Comma-separated fields to return'),
+    OpenApiParameter('omit', OpenApiTypes.STR, description='Comma-separated fields to leave out'),
+]
+ERROR_RESPONSE = inline_serializer('Error', {'error': serializers.CharField()})
+
+
+@extend_schema(parameters=SPARSE_FIELDS_PARAMETERS, responses={200: PageHeroSerializer, 404: ERROR_RESPONSE})
 @api_view(['GET'])
+@cache_api_response(PageHero)
+@conditional_model_view(PageHero)
 def page_hero_detail(request, page_identifier):
     """
-    Retrieve a specific page hero by page_identifier
+    Retrieve a specific page hero by page_identifier.
+
+    Supports conditional requests: clients sending If-None-Match or
+    If-Modified-Since get a 304 when the hero has not changed. Responses are
+    cached until a PageHero is saved or deleted. ``?fields=`` and ``?omit=``
+    select the fields returned.
     """
     try:
-        page_hero = PageHero.objects.get(page_identifier=page_identifier, is_active=True)
+        # ?fields=/?omit= also narrow the columns loaded; conditional_model_view reads updated_at
+        queryset = PageHeroSerializer.sparse_queryset(PageHero.objects, request, required=['updated_at'])
+        page_hero = queryset.get(
+            page_identifier=page_identifier, is_active=True,
+        )
         serializer = PageHeroSerializer(page_hero, context={'request': request})
         return Response(serializer.data)
     except PageHero.DoesNotExist:
         return Response(
             {'error': f'Page hero for {page_identifier} not found'}, 
             status=status.HTTP_404_NOT_FOUND
-        )
\ No newline at end of file
+        )
+
+
+@extend_schema(parameters=SPARSE_FIELDS_PARAMETERS, responses=SiteSettingsSerializer)
+@api_view(['GET'])
+def site_settings_detail(request):
+    """
+    Retrieve the global site settings.
+
+    Served from the process-local SiteSettings cache, so it does not query
+    the database unless the settings have changed.
+    """
+    serializer = SiteSettingsSerializer(get_site_settings(), context={'request': request})
+    return Response(serializer.data)
+
+
+def _search_types(value):
+    models = []
+    for label in filter(None, value.split(',')):
+        try:
+            model = apps.get_model(label)
+        except (LookupError, ValueError):
+            model = None
+        if model not in search_models():
+            raise ValidationError({'type': f'Unknown search type: {label}'})
+        models.append(model)
+    return models
+
+
+@extend_schema(
+    parameters=[
+        OpenApiParameter('q', OpenApiTypes.STR, description='Search text'),
+        OpenApiParameter('type', OpenApiTypes.STR, description='Comma-separated models to search, e.g. news.article'),
+        OpenApiParameter('page', OpenApiTypes.INT, description=f'Page number, up to {RankedPagination.max_page}'),
+        OpenApiParameter('page_size', OpenApiTypes.INT, description='Number of results per page'),
+    ],
+    responses=inline_serializer('PaginatedSearchResultList', {
+        'next': serializers.URLField(allow_null=True),
+        'previous': serializers.URLField(allow_null=True),
+        'results': SearchResultSerializer(many=True),
+    }),
+)
+@api_view(['GET'])
+@cache_api_response(SearchDocument)
+def search(request):
+    """
+    Full-text search across published content, best matches first.
+
+    ``q`` is the search text; ``type`` optionally limits results to a
+    comma-separated list of models (e.g. ``type=news.article``). Results are
+    paginated with ``page``/``page_size`` and cached until the index changes.
+    """
+    query = request.query_params.get('q', '').strip()
+    models = _search_types(request.query_params.get('type', ''))
+    paginator = RankedPagination()
+    documents = search_documents(query, models) if query else SearchDocument.objects.none()
+    page = paginator.paginate_queryset(documents, request)
+    serializer = SearchResultSerializer(page, many=True, context={'request': request})
+    return paginator.get_paginated_response(serializer.data)
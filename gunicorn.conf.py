@@ -0,0 +1,35 @@
+"""
+Gunicorn configuration:
+
+    PROMETHEUS_MULTIPROC_DIR=/run/niru/metrics gunicorn -c gunicorn.conf.py config.wsgi:application
+"""
+import os
+import shutil
+
+from decouple import config
+
+
+# prometheus_client picks multiprocess mode from the process environment when
+# it is first imported, and python-decouple does not export .env values. Copy
+# the setting over before anything imports it; the workers inherit it.
+if config('PROMETHEUS_MULTIPROC_DIR', default=''):
+    os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', config('PROMETHEUS_MULTIPROC_DIR'))
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('GUNICORN_WORKERS', '4'))
+threads = int(os.environ.get('GUNICORN_THREADS', '1'))
+
+
+def on_starting(server):
+    # Samples left over from a previous run would be added to the new ones
+    path = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)